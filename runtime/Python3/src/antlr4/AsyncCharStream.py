@@ -0,0 +1,46 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# An {@link UnbufferedCharStream} fed from an {@link asyncio.StreamReader}.
+#
+# <p>The stream is read by a lexer that runs in the thread of an
+# {@link AsyncParser}. Each time the buffer runs out, that thread has the
+# event loop await {@code reader.read(bufferSize)} and waits for the result,
+# so the parse keeps up with the data as it arrives and other tasks run
+# while it waits. Bytes are decoded with {@code encoding}.</p>
+#
+# <pre>
+# lexer = MyLexer(AsyncCharStream(reader))
+# lexer._factory = CommonTokenFactory(copyText=True)
+# tree = await AsyncParser(MyParser(CommonTokenStream(lexer))).parse("file")
+# </pre>
+#
+from antlr4.AsyncParser import currentAsyncParser
+from antlr4.UnbufferedCharStream import UnbufferedCharStream
+from antlr4.error.Errors import IllegalStateException
+
+
+# A file-like object whose {@code read} awaits a stream reader.
+class StreamReaderInput(object):
+    __slots__ = ('reader', 'name')
+
+    def __init__(self, reader, name:str="<stream>"):
+        self.reader = reader
+        self.name = name
+
+    def read(self, size:int):
+        asyncParser = currentAsyncParser()
+        if asyncParser is None:
+            raise IllegalStateException("an AsyncCharStream can only be read by a parse of an AsyncParser")
+        return asyncParser.call(self.reader.read(size))
+
+
+class AsyncCharStream(UnbufferedCharStream):
+    __slots__ = ()
+
+    def __init__(self, reader, bufferSize:int=4096, encoding:str='utf-8', errors:str='strict', name:str="<stream>"):
+        super().__init__(StreamReaderInput(reader, name), bufferSize, encoding, errors)
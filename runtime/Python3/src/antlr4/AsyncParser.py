@@ -0,0 +1,201 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# Parses from a coroutine in slices, letting the other tasks of the event
+# loop run between them.
+#
+# <p>The parser is synchronous and can't suspend in the middle of a rule, so
+# each parse runs in a thread of its own. {@link #parse} hands the thread a
+# slice and awaits its end; the thread ends the slice at the checkpoint of
+# the {@link YieldingBudget} installed on the parser for the duration of the
+# parse, that is after {@code interval} tokens, predictions or closure
+# operations, whichever comes first, and waits there until {@link #parse} is
+# resumed by the loop and hands over the next one. The parser therefore runs
+# at most about one slice per turn of the loop, and the other tasks only
+# share the interpreter lock with it for that slice. Lexing happens in the
+# slices too, as the parser asks for tokens. Smaller slices shorten the wait
+# of the other tasks and cost some throughput, for the hand-overs. The loop
+# thread never waits for the parser thread, so any number of parses can run
+# at the same time.</p>
+#
+# <p>A slice also ends when the lexer needs more text from an
+# {@link AsyncCharStream}: the read is awaited by {@link #parse}, with the
+# other tasks running, and the parser goes on once the data is there.</p>
+#
+# <p>Cancelling the task that awaits {@link #parse} cancels the budget and any
+# read the parser waits for; the parser stops at its next event, and
+# {@link asyncio.CancelledError} is raised once it has. Limits given to the
+# constructor are those of {@link ParseBudget}.</p>
+#
+# <pre>
+# async def handle(reader, writer):
+#     lexer = MyLexer(AsyncCharStream(reader))
+#     lexer._factory = CommonTokenFactory(copyText=True)
+#     parser = MyParser(CommonTokenStream(lexer))
+#     tree = await AsyncParser(parser, timeout=5.0).parse("compilationUnit")
+# </pre>
+#
+import asyncio
+import threading
+from concurrent.futures import CancelledError
+from antlr4.ParseBudget import ParseBudget
+from antlr4.error.Errors import IllegalStateException
+
+
+# the AsyncParser whose parse runs in the current thread, if any
+_current = threading.local()
+
+
+def currentAsyncParser():
+    return getattr(_current, "parser", None)
+
+
+# A budget that ends the slice of the parser thread at each check.
+class YieldingBudget(ParseBudget):
+    __slots__ = 'asyncParser'
+
+    def __init__(self, asyncParser, **kwargs):
+        self.asyncParser = asyncParser
+        super().__init__(**kwargs)
+
+    def checkpoint(self):
+        self.asyncParser.pause()
+
+
+# Resolve {@code future} unless it was cancelled; runs in the loop.
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class AsyncParser(object):
+    __slots__ = ('parser', 'budget', 'loop', 'toParser', 'sliceEnd', 'finished', 'request', 'result',
+                 'outcome', 'running', 'done', 'cancelled')
+
+    # @param interval the number of tokens, predictions or closure operations
+    # in a slice
+    def __init__(self, parser, interval:int=20, **limits):
+        self.parser = parser
+        self.budget = YieldingBudget(self, checkInterval=interval, **limits)
+        self.loop = None
+        # released to start a slice of the parser thread
+        self.toParser = None
+        # resolved in the loop when a slice ends, and when the parse is over
+        self.sliceEnd = None
+        self.finished = None
+        # the coroutine the parser thread waits for, and its (value, exception)
+        self.request = None
+        self.result = None
+        # the (value, exception) of the parse
+        self.outcome = None
+        self.running = False
+        self.done = False
+        self.cancelled = False
+
+    # Parse with rule {@code ruleName}.
+    async def parse(self, ruleName:str):
+        if ruleName not in self.parser.ruleNames:
+            raise ValueError("no rule " + ruleName + " in " + str(self.parser.grammarFileName))
+        if self.running:
+            raise IllegalStateException("already parsing")
+        self.running = True
+        self.done = False
+        self.cancelled = False
+        self.loop = loop = asyncio.get_running_loop()
+        self.toParser = threading.Semaphore(0)
+        self.sliceEnd = loop.create_future()
+        self.finished = loop.create_future()
+        thread = threading.Thread(target=self.run, args=(getattr(self.parser, ruleName),),
+                                  name="AsyncParser-" + ruleName, daemon=True)
+        try:
+            thread.start()
+            try:
+                while True:
+                    await self.sliceEnd
+                    if self.done:
+                        break
+                    request = self.request
+                    if request is not None:
+                        self.request = None
+                        try:
+                            self.result = (await request, None)
+                        except Exception as e:
+                            self.result = (None, e)
+                    self.step()
+            except asyncio.CancelledError:
+                self.cancel()
+                # the parser must have stopped before it is used again
+                await self.finished
+                if self.request is not None:
+                    self.request.close()
+                    self.request = None
+                raise
+            value, error = self.outcome
+            self.outcome = None
+            if error is not None:
+                raise error
+            return value
+        finally:
+            self.running = False
+
+    # Let the parser thread run until its next checkpoint or read, or until
+    # it is done.
+    def step(self):
+        self.sliceEnd = self.loop.create_future()
+        self.toParser.release()
+
+    # Runs in the parser thread.
+    def run(self, rule):
+        parser = self.parser
+        saved = parser.getParseBudget()
+        _current.parser = self
+        parser.setParseBudget(self.budget)
+        try:
+            self.outcome = (rule(), None)
+        except BaseException as e:
+            self.outcome = (None, e)
+        finally:
+            # put back the budget the parser had, without starting it over
+            parser._parseBudget = saved
+            parser._interp.parseBudget = saved
+            _current.parser = None
+            self.done = True
+            self.loop.call_soon_threadsafe(self.finish)
+
+    def finish(self):
+        _wake(self.sliceEnd)
+        _wake(self.finished)
+
+    # End the slice of the parser thread; once cancelled, the parser runs on
+    # to its next event without waiting.
+    def pause(self):
+        if self.cancelled:
+            return
+        self.loop.call_soon_threadsafe(_wake, self.sliceEnd)
+        self.toParser.acquire()
+
+    # Have {@link #parse} await {@code coro} and return its result; called
+    # from the parser thread.
+    def call(self, coro):
+        if self.cancelled:
+            coro.close()
+            raise CancelledError()
+        self.request = coro
+        self.pause()
+        value, error = self.result
+        self.result = None
+        if error is not None:
+            raise error
+        return value
+
+    def cancel(self):
+        self.budget.cancel()
+        # for a read the parser waits for
+        self.result = (None, CancelledError())
+        self.cancelled = True
+        # let go of a parser thread that waits for its next slice
+        self.toParser.release()
@@ -0,0 +1,215 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# Parses many files in a pool of worker processes.
+#
+# <p>Each worker creates one lexer and one parser when it starts and reuses
+# them, and their DFA, for every file it is given. What is returned for a
+# file is decided by {@code handler}, which is called in the worker with the
+# file name, the parser and the parse tree. It must return something that
+# can be pickled; the default returns the tree in LISP form. A handler that
+# walks the tree with a listener can return whatever the listener
+# collected.</p>
+#
+# <pre>
+# def countCalls(fileName, parser, tree):
+#     listener = CallCounter()
+#     ParseTreeWalker.DEFAULT.walk(listener, tree)
+#     return listener.count
+#
+# with BatchParser(MyLexer, MyParser, "compilationUnit", countCalls) as batch:
+#     for result in batch.parse(fileNames):
+#         if result.exception is not None or result.errors:
+#             ...
+#         total += result.value
+# </pre>
+#
+# <p>Files are sent to the workers in chunks of {@code chunkSize}; use larger
+# chunks for many small files, and 1 for few large ones. At most
+# {@code maxPending} chunks are queued at a time, so a long or lazy list of
+# file names is consumed as the workers make progress.</p>
+#
+# <p>Workers start out with the DFA the lexer and parser classes have in the
+# parent process when the platform forks, and can load a {@link DFASnapshot}
+# of a warmed DFA when they start.</p>
+#
+# <p>The lexer, parser and handler are sent to the workers by reference, so
+# they must be defined at the top level of a module.</p>
+#
+import os
+import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from antlr4.CommonTokenStream import CommonTokenStream
+from antlr4.FileStream import FileStream
+from antlr4.error.ErrorListener import ErrorListener
+
+
+# The outcome of parsing one file.
+class BatchResult(object):
+    __slots__ = ('index', 'fileName', 'value', 'errors', 'exception')
+
+    def __init__(self, index:int, fileName:str):
+        # position of the file in the input of {@link BatchParser#parse}
+        self.index = index
+        self.fileName = fileName
+        # what the handler returned
+        self.value = None
+        # syntax errors, as {@code "line:column message"}
+        self.errors = []
+        # the formatted traceback, if the file could not be read or the
+        # handler failed
+        self.exception = None
+
+    def __str__(self):
+        return self.fileName + ": " + (self.exception.splitlines()[-1] if self.exception is not None
+                                       else str(len(self.errors)) + " errors")
+
+
+class BatchErrorListener(ErrorListener):
+
+    def __init__(self):
+        self.errors = None
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.errors.append(str(line) + ":" + str(column) + " " + msg)
+
+
+def toStringTree(fileName:str, parser, tree):
+    return tree.toStringTree(recog=parser)
+
+
+class BatchWorker(object):
+    __slots__ = ('lexer', 'parser', 'startRule', 'handler', 'encoding', 'twoStage', 'listener')
+
+    def __init__(self, lexerClass, parserClass, startRule:str, handler, encoding:str, twoStage:bool,
+                 lexerSnapshot:str=None, parserSnapshot:str=None):
+        if lexerSnapshot is not None or parserSnapshot is not None:
+            from antlr4.dfa.DFASnapshot import DFASnapshot
+            if lexerSnapshot is not None:
+                DFASnapshot(lexerClass).load(lexerSnapshot)
+            if parserSnapshot is not None:
+                DFASnapshot(parserClass).load(parserSnapshot)
+        self.listener = BatchErrorListener()
+        self.lexer = lexerClass(None)
+        self.lexer.removeErrorListeners()
+        self.lexer.addErrorListener(self.listener)
+        self.parser = parserClass(CommonTokenStream(self.lexer))
+        self.parser.removeErrorListeners()
+        self.parser.addErrorListener(self.listener)
+        self.startRule = startRule
+        self.handler = handler
+        self.encoding = encoding
+        self.twoStage = twoStage
+
+    def parse(self, index:int, fileName:str):
+        result = BatchResult(index, fileName)
+        self.listener.errors = result.errors
+        try:
+            self.lexer.inputStream = FileStream(fileName, self.encoding)
+            self.parser.setTokenStream(CommonTokenStream(self.lexer))
+            if self.twoStage:
+                tree = self.parser.parseWithFallback(self.startRule)
+            else:
+                tree = getattr(self.parser, self.startRule)()
+            result.value = self.handler(fileName, self.parser, tree)
+        except Exception:
+            result.exception = traceback.format_exc()
+        finally:
+            # don't keep the last file alive
+            self.lexer.inputStream = None
+            self.parser.setTokenStream(None)
+        return result
+
+
+# the worker of the current process
+_worker = None
+
+
+def _initWorker(*args):
+    global _worker
+    _worker = BatchWorker(*args)
+
+
+def _parseChunk(chunk:list):
+    return [ _worker.parse(index, fileName) for index, fileName in chunk ]
+
+
+class BatchParser(object):
+    __slots__ = ('executor', 'chunkSize', 'maxPending')
+
+    # @param lexerClass, parserClass the generated recognizers
+    # @param startRule the name of the parser rule to start with
+    # @param handler {@code handler(fileName, parser, tree)} computes the
+    # {@link BatchResult#value} of a file
+    # @param workers the number of processes, one per CPU by default
+    # @param chunkSize the number of files sent to a worker at a time
+    # @param maxPending the number of chunks queued at a time, twice the
+    # number of workers by default
+    # @param twoStage parse with {@link Parser#parseWithFallback}
+    # @param lexerSnapshot, parserSnapshot {@link DFASnapshot} files the workers
+    # load when they start
+    # @param mpContext the multiprocessing context for the pool
+    def __init__(self, lexerClass, parserClass, startRule:str, handler=toStringTree, workers:int=None,
+                 chunkSize:int=1, maxPending:int=None, encoding:str='utf-8', twoStage:bool=False,
+                 lexerSnapshot:str=None, parserSnapshot:str=None, mpContext=None):
+        if chunkSize < 1:
+            raise ValueError("chunkSize must be at least 1")
+        if startRule not in parserClass.ruleNames:
+            raise ValueError("no such rule: " + startRule)
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=mpContext, initializer=_initWorker,
+                                            initargs=(lexerClass, parserClass, startRule, handler, encoding, twoStage,
+                                                      lexerSnapshot, parserSnapshot))
+        self.chunkSize = chunkSize
+        self.maxPending = maxPending if maxPending is not None else 2 * (workers or os.cpu_count() or 1)
+
+    # Parse {@code fileNames}, yielding a {@link BatchResult} for each file,
+    # in input order if {@code ordered}, or as soon as they are done
+    # otherwise.
+    def parse(self, fileNames, ordered:bool=True):
+        pending = deque() if ordered else set()
+        chunks = self.chunks(fileNames)
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < self.maxPending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                future = self.executor.submit(_parseChunk, chunk)
+                if ordered:
+                    pending.append(future)
+                else:
+                    pending.add(future)
+            if len(pending) == 0:
+                return
+            if ordered:
+                yield from pending.popleft().result()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from future.result()
+
+    def chunks(self, fileNames):
+        chunk = []
+        for index, fileName in enumerate(fileNames):
+            chunk.append((index, fileName))
+            if len(chunk) == self.chunkSize:
+                yield chunk
+                chunk = []
+        if len(chunk) > 0:
+            yield chunk
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
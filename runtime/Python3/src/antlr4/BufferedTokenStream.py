@@ -190,6 +190,21 @@ class BufferedTokenStream(TokenStream):
         self.sync(0)
         self.index = self.adjustSeekIndex(0)
 
+    # Replace tokens {@code start} up to {@code stop}, not included, by
+    # {@code tokens}, and renumber the tokens from {@code start} on. The
+    # stream is rewound to the first token.
+    def splice(self, start:int, stop:int, tokens:list):
+        if start < 0 or stop < start or stop > len(self.tokens):
+            raise ValueError("invalid range " + str(start) + ".." + str(stop))
+        self.tokens[start:stop] = tokens
+        # the tokens after the new ones only move if the count changed
+        end = len(self.tokens) if len(tokens) != stop - start else start + len(tokens)
+        for i in range(start, end):
+            self.tokens[i].tokenIndex = i
+        if len(self.tokens) > 0:
+            self.fetchedEOF = self.tokens[-1].type == Token.EOF
+        self.index = -1
+
     # Reset this token stream by setting its token source.#/
     def setTokenSource(self, tokenSource:Lexer):
         self.tokenSource = tokenSource
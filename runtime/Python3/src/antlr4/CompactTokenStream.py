@@ -0,0 +1,218 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#/
+
+#
+# A {@link CommonTokenStream} that does not keep the tokens it fetches.
+#
+# <p>Only the type, channel, start, stop, line and column of each token are
+# kept, in parallel {@code array('i')} columns; see {@link CompactTokenList}.
+# {@link #get}, {@link #LT} and {@link #tokens} hand out {@link CommonToken}
+# views built from these columns, while {@link #LA} and the channel scans
+# work on the columns directly. On large inputs this takes a small fraction
+# of the memory of {@link CommonTokenStream}, and the garbage collector has
+# no token objects to traverse.</p>
+#
+# <p>A view is a new {@link CommonToken} every time it is materialized, so two
+# views of the same token are equal in all fields but not necessarily the same
+# object; compare {@link Token#tokenIndex} instead. Changes made to a view are
+# not written back to the stream.</p>
+#/
+from array import array
+from io import StringIO
+from antlr4.CommonTokenStream import CommonTokenStream
+from antlr4.Lexer import Lexer
+from antlr4.Token import Token, CommonToken
+
+
+class CompactTokenList(object):
+    __slots__ = ('types', 'channels', 'starts', 'stops', 'lines', 'columns',
+                 'source', 'sources', 'texts', 'views')
+
+    # number of materialized views remembered, so that repeated lookahead
+    # over the same tokens doesn't create a view each time
+    MAX_VIEWS = 64
+
+    def __init__(self):
+        self.types = array('i')
+        self.channels = array('i')
+        self.starts = array('i')
+        self.stops = array('i')
+        self.lines = array('i')
+        self.columns = array('i')
+        # The {@link Token#source} pair shared by the tokens; the rare token
+        # with a different source is kept in {@link #sources}.
+        self.source = None
+        self.sources = dict()
+        # token index -> text, for tokens whose text was set explicitly
+        self.texts = dict()
+        self.views = dict()
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, index:int):
+        if type(index) is not int or index < 0:
+            if isinstance(index, slice):
+                return [ self[i] for i in range(*index.indices(len(self.types))) ]
+            index = range(0, len(self.types))[index]
+        t = self.views.get(index, None)
+        if t is None:
+            t = self.materialize(index)
+            if len(self.views) >= self.MAX_VIEWS:
+                self.views.clear()
+            self.views[index] = t
+        return t
+
+    def __iter__(self):
+        for i in range(0, len(self.types)):
+            yield self.materialize(i)
+
+    def append(self, token:Token):
+        index = len(self.types)
+        self.types.append(token.type)
+        self.channels.append(token.channel)
+        self.starts.append(token.start)
+        self.stops.append(token.stop)
+        self.lines.append(token.line if token.line is not None else 0)
+        self.columns.append(token.column if token.column is not None else -1)
+        if token.source is not self.source:
+            if index == 0:
+                self.source = token.source
+            else:
+                self.sources[index] = token.source
+        if token._text is not None:
+            self.texts[index] = token._text
+
+    # Build a {@link CommonToken} view of the token at {@code index}.
+    def materialize(self, index:int):
+        # fill in the slots directly; CommonToken's constructor would read the
+        # line and column from the lexer
+        t = CommonToken.__new__(CommonToken)
+        t.source = self.sources.get(index, self.source) or CommonToken.EMPTY_SOURCE
+        t.type = self.types[index]
+        t.channel = self.channels[index]
+        t.start = self.starts[index]
+        t.stop = self.stops[index]
+        t.tokenIndex = index
+        t.line = self.lines[index]
+        t.column = self.columns[index]
+        t._text = self.texts.get(index, None)
+        return t
+
+    def getText(self, index:int):
+        text = self.texts.get(index, None)
+        if text is not None:
+            return text
+        return self.materialize(index).text
+
+
+class CompactTokenStream(CommonTokenStream):
+    __slots__ = ()
+
+    def __init__(self, lexer:Lexer, channel:int=Token.DEFAULT_CHANNEL):
+        super().__init__(lexer, channel)
+        self.tokens = CompactTokenList()
+
+    def setTokenSource(self, tokenSource:Lexer):
+        super().setTokenSource(tokenSource)
+        self.tokens = CompactTokenList()
+
+    def fetch(self, n:int):
+        if self.fetchedEOF:
+            return 0
+        tokens = self.tokens
+        for i in range(0, n):
+            t = self.tokenSource.nextToken()
+            tokens.append(t)
+            if t.type==Token.EOF:
+                self.fetchedEOF = True
+                return i + 1
+        return n
+
+    def getTokens(self, start:int, stop:int, types:set=None):
+        if start<0 or stop<0:
+            return None
+        self.lazyInit()
+        subset = []
+        tokenTypes = self.tokens.types
+        if stop >= len(tokenTypes):
+            stop = len(tokenTypes)-1
+        for i in range(start, stop):
+            type = tokenTypes[i]
+            if type==Token.EOF:
+                break
+            if types is None or type in types:
+                subset.append(self.tokens.materialize(i))
+        return subset
+
+    def LA(self, k:int):
+        if k == 1 and self.index >= 0:
+            # the current token is always fetched and on channel
+            return self.tokens.types[self.index]
+        return self.LT(k).type
+
+    def nextTokenOnChannel(self, i:int, channel:int):
+        self.sync(i)
+        types = self.tokens.types
+        channels = self.tokens.channels
+        if i>=len(types):
+            return len(types) - 1
+        while channels[i]!=channel:
+            if types[i]==Token.EOF:
+                return i
+            i += 1
+            self.sync(i)
+        return i
+
+    def previousTokenOnChannel(self, i:int, channel:int):
+        channels = self.tokens.channels
+        while i>=0 and channels[i]!=channel:
+            i -= 1
+        return i
+
+    def filterForChannel(self, left:int, right:int, channel:int):
+        channels = self.tokens.channels
+        hidden = []
+        for i in range(left, right+1):
+            c = channels[i]
+            if (c!=Lexer.DEFAULT_TOKEN_CHANNEL) if channel==-1 else (c==channel):
+                hidden.append(self.tokens.materialize(i))
+        if len(hidden)==0:
+            return None
+        return hidden
+
+    def getNumberOfOnChannelTokens(self):
+        n = 0
+        self.fill()
+        types = self.tokens.types
+        channels = self.tokens.channels
+        for i in range(0, len(types)):
+            if channels[i]==self.channel:
+                n += 1
+            if types[i]==Token.EOF:
+                break
+        return n
+
+    def getText(self, start:int=None, stop:int=None):
+        self.lazyInit()
+        self.fill()
+        types = self.tokens.types
+        if isinstance(start, Token):
+            start = start.tokenIndex
+        elif start is None:
+            start = 0
+        if isinstance(stop, Token):
+            stop = stop.tokenIndex
+        elif stop is None or stop >= len(types):
+            stop = len(types) - 1
+        if start < 0 or stop < 0 or stop < start:
+            return ""
+        with StringIO() as buf:
+            for i in range(start, stop+1):
+                if types[i]==Token.EOF:
+                    break
+                buf.write(self.tokens.getText(i))
+            return buf.getvalue()
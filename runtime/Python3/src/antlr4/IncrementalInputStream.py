@@ -0,0 +1,34 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# An {@link InputStream} that can be changed in place and records how far
+# a lexer looks ahead, for {@link Relexer}.
+#
+from antlr4.InputStream import InputStream
+
+
+class IncrementalInputStream(InputStream):
+    __slots__ = 'lookahead'
+
+    def __init__(self, data:str):
+        super().__init__(data)
+        # the furthest index the stream was at before it was moved back
+        self.lookahead = -1
+
+    # The lexer seeks back to the end of a token after looking past it.
+    def seek(self, _index:int):
+        if self._index > self.lookahead:
+            self.lookahead = self._index
+        super().seek(_index)
+
+    # Replace the characters from {@code start} up to {@code stop}, not
+    # included, by {@code text}.
+    def replace(self, start:int, stop:int, text:str):
+        self.strdata = self.strdata[:start] + text + self.strdata[stop:]
+        self.data[start:stop] = [ord(c) for c in text]
+        self._size = len(self.data)
+        self._index = min(self._index, self._size)
@@ -0,0 +1,206 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# Parses a text again after edits, reusing the subtrees of the previous
+# parse that the edits did not affect.
+#
+# <p>The rule methods of the parser are wrapped. When a rule is called at a
+# token where the previous parse returned a context for the same rule, from
+# the same invoking state and with the same arguments, and the tokens from
+# its start up to the furthest token the parser looked at for it are
+# unchanged, the old context is attached to the tree and the parser skips
+# past it. Only the rules on the path to an edit, and their direct
+# children, are parsed again. The text is relexed from the edit on by
+# {@link IncrementalTokenStream}.</p>
+#
+# <p>Contexts are not reused if they had syntax errors. If a prediction
+# inside a context fell back to full context, which depends on the rules
+# that called it, it is only reused under the same invoking states. Parse
+# listeners get no events for reused subtrees, so contexts are not reused
+# while listeners are registered. Actions and predicates of the grammar do
+# not run for reused subtrees.</p>
+#
+# <pre>
+# incremental = IncrementalParser(MyLexer, MyParser, "compilationUnit", text)
+# tree = incremental.parse()
+# incremental.edit(120, 125, "count")
+# tree = incremental.parse()
+# </pre>
+#
+from antlr4.IncrementalInputStream import IncrementalInputStream
+from antlr4.IncrementalTokenStream import IncrementalTokenStream
+from antlr4.ParserRuleContext import ParserRuleContext
+from antlr4.error.ErrorListener import ErrorListener
+
+
+# Counts the predictions that fell back to full context.
+class FullContextCounter(ErrorListener):
+
+    def __init__(self):
+        self.count = 0
+
+    def reportAttemptingFullContext(self, recognizer, dfa, startIndex, stopIndex, conflictingAlts, configs):
+        self.count += 1
+
+
+# A context returned by a rule call of the last parse.
+class ReusableContext(object):
+    __slots__ = ('ctx', 'look', 'stack')
+
+    def __init__(self, ctx:ParserRuleContext, look, stack:tuple):
+        self.ctx = ctx
+        # the furthest token the parser looked at for the rule
+        self.look = look
+        # the invoking states of the callers, if the context depends on them
+        self.stack = stack
+
+
+class IncrementalParser(object):
+    __slots__ = ('input', 'lexer', 'tokens', 'parser', 'startRule', 'tree', 'contexts', 'reused', 'fullContext',
+                 'reuseCount')
+
+    def __init__(self, lexerClass, parserClass, startRule:str, text:str=""):
+        if startRule not in parserClass.ruleNames:
+            raise ValueError("no such rule: " + startRule)
+        self.input = IncrementalInputStream(text)
+        self.lexer = lexerClass(self.input)
+        self.tokens = IncrementalTokenStream(self.lexer)
+        self.parser = parserClass(self.tokens)
+        self.startRule = startRule
+        # the tree of the last parse
+        self.tree = None
+        # start token -> (rule index, invoking state, arguments) -> ReusableContext
+        self.contexts = dict()
+        # the old contexts the last parse reused
+        self.reused = set()
+        self.fullContext = FullContextCounter()
+        # the number of contexts the last parse reused
+        self.reuseCount = 0
+        for ruleIndex, name in enumerate(parserClass.ruleNames):
+            setattr(self.parser, name, self.wrap(ruleIndex, getattr(parserClass, name)))
+
+    def getText(self):
+        return self.input.strdata
+
+    # Replace the characters from {@code start} up to {@code stop}, not
+    # included, by {@code text}. Several edits can be made before the next
+    # {@link #parse}.
+    def edit(self, start:int, stop:int, text:str):
+        self.tokens.edit(start, stop, text)
+
+    # Parse the current text with the start rule, reusing what is left of
+    # the last tree.
+    def parse(self):
+        parser = self.parser
+        if self.fullContext not in parser._listeners:
+            parser.addErrorListener(self.fullContext)
+        old = self.tree
+        self.reused = set()
+        self.reuseCount = 0
+        parser.reset()
+        self.tokens.lookahead = -1
+        try:
+            tree = getattr(parser, self.startRule)()
+        except:
+            self.tree = None
+            self.contexts = dict()
+            raise
+        if old is not None:
+            self.prune(old)
+        self.tokens.clearDamage()
+        self.reused = set()
+        self.tree = tree
+        return tree
+
+    def wrap(self, ruleIndex:int, method):
+        parser = self.parser
+        tokens = self.tokens
+
+        def rule(*args):
+            start = tokens.LT(1)
+            key = (ruleIndex, parser.state, args)
+            try:
+                contexts = self.contexts.get(start, None)
+                reusable = contexts.get(key, None) if contexts is not None else None
+            except TypeError:
+                # arguments that can't be keys
+                return method(parser, *args)
+            if reusable is not None and self.isReusable(reusable, start):
+                return self.reuse(reusable)
+            lookahead = tokens.lookahead
+            tokens.lookahead = -1
+            errors = parser._syntaxErrors
+            fullContext = self.fullContext.count
+            try:
+                ctx = method(parser, *args)
+            finally:
+                look = tokens.lookahead
+                if lookahead > look:
+                    tokens.lookahead = lookahead
+            if parser._syntaxErrors == errors and ctx.exception is None and ctx.stop is not None \
+                    and ctx.stop.tokenIndex >= start.tokenIndex and look >= 0:
+                stack = self.invokingStates(parser._ctx) if self.fullContext.count != fullContext else None
+                if contexts is None:
+                    contexts = self.contexts.setdefault(start, dict())
+                contexts[key] = ReusableContext(ctx, tokens.get(look), stack)
+            return ctx
+
+        return rule
+
+    def invokingStates(self, ctx:ParserRuleContext):
+        states = []
+        while ctx is not None:
+            states.append(ctx.invokingState)
+            ctx = ctx.parentCtx
+        return tuple(states)
+
+    def isReusable(self, reusable:ReusableContext, start):
+        parser = self.parser
+        if parser._parseListeners or parser._errHandler.inErrorRecoveryMode(parser):
+            return False
+        if reusable.ctx.start is not start or not self.tokens.isIntact(start, reusable.look):
+            return False
+        return reusable.stack is None or reusable.stack == self.invokingStates(parser._ctx)
+
+    # Attach an old context to the tree, as if the rule had just matched it.
+    def reuse(self, reusable:ReusableContext):
+        parser = self.parser
+        ctx = reusable.ctx
+        parent = parser._ctx
+        ctx.parentCtx = parent
+        if parser.buildParseTrees and parent is not None:
+            parent.addChild(ctx)
+        self.tokens.seek(ctx.stop.tokenIndex + 1)
+        if reusable.look.tokenIndex > self.tokens.lookahead:
+            self.tokens.lookahead = reusable.look.tokenIndex
+        if reusable.stack is not None:
+            # the callers depend on their invoking states too
+            self.fullContext.count += 1
+        self.reused.add(ctx)
+        self.reuseCount += 1
+        return ctx
+
+    # Forget the contexts of the old tree that the new one doesn't contain.
+    # Reused subtrees are skipped, so this visits about as many nodes as
+    # were parsed again.
+    def prune(self, old:ParserRuleContext):
+        stack = [ old ]
+        while len(stack) > 0:
+            ctx = stack.pop()
+            if ctx in self.reused:
+                continue
+            contexts = self.contexts.get(ctx.start, None)
+            if contexts is not None:
+                for key, reusable in list(contexts.items()):
+                    if reusable.ctx is ctx:
+                        del contexts[key]
+                if len(contexts) == 0:
+                    del self.contexts[ctx.start]
+            if ctx.children is not None:
+                for child in ctx.children:
+                    if isinstance(child, ParserRuleContext):
+                        stack.append(child)
@@ -0,0 +1,63 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# A token stream over text that can be edited, used by
+# {@link IncrementalParser}.
+#
+# <p>Tokens come from a {@link Relexer}, which {@link #edit} uses to lex the
+# text again from the edit on. The stream also records the furthest token
+# the parser looked at, and which tokens edits replaced since the last call
+# to {@link #clearDamage}.</p>
+#
+from antlr4.CommonTokenStream import CommonTokenStream
+from antlr4.Lexer import Lexer
+from antlr4.Relexer import Relexer
+from antlr4.Token import Token
+
+
+class IncrementalTokenStream(CommonTokenStream):
+    __slots__ = ('lookahead', 'damage')
+
+    def __init__(self, lexer:Lexer, channel:int=Token.DEFAULT_CHANNEL):
+        super().__init__(Relexer(lexer), channel)
+        # the furthest token index looked at by the parser, see #LT
+        self.lookahead = -1
+        # the range of tokens changed by edits, as [first, stop), or None
+        self.damage = None
+
+    def LT(self, k:int):
+        t = super().LT(k)
+        if t is not None and t.tokenIndex > self.lookahead:
+            self.lookahead = t.tokenIndex
+        return t
+
+    # Replace the characters from {@code start} up to {@code stop}, not
+    # included, by {@code text}, and relex what the change affects.
+    #
+    # @return see {@link Relexer#edit}
+    def edit(self, start:int, stop:int, text:str):
+        first, end, added = self.tokenSource.edit(self, start, stop, text)
+        damage = (first, end)
+        if self.damage is not None:
+            lo, hi = self.damage
+            if hi >= end - added:
+                hi += added
+            damage = (min(lo, first), max(hi, end))
+        self.damage = damage
+        return first, end, added
+
+    # Whether tokens {@code start} to {@code stop} are the same objects,
+    # and in the same order, as before the edits since the last call to
+    # {@link #clearDamage}.
+    def isIntact(self, start:Token, stop:Token):
+        i, j = start.tokenIndex, stop.tokenIndex
+        if i < 0 or j >= len(self.tokens) or self.tokens[i] is not start or self.tokens[j] is not stop:
+            return False
+        return self.damage is None or j < self.damage[0] or i >= self.damage[1]
+
+    def clearDamage(self):
+        self.damage = None
@@ -27,11 +27,42 @@ class TokenSource(object):
     pass
 
 
+# The state of a {@link Lexer} between two tokens: the character index it
+# lexes the next token at, the line and column there, the mode, the mode
+# stack, and whether it has seen EOF. {@link Lexer#restore} makes a lexer on
+# the same text continue from it, so lexing can start in the middle of a
+# text, or different parts of a text can be lexed by different lexers.
+class LexerState(object):
+    __slots__ = ('index', 'line', 'column', 'mode', 'modeStack', 'hitEOF')
+
+    def __init__(self, index:int, line:int, column:int, mode:int, modeStack:tuple=(), hitEOF:bool=False):
+        self.index = index
+        self.line = line
+        self.column = column
+        self.mode = mode
+        self.modeStack = tuple(modeStack)
+        self.hitEOF = hitEOF
+
+    def __eq__(self, other):
+        if not isinstance(other, LexerState):
+            return False
+        return self.index == other.index and self.line == other.line and self.column == other.column \
+               and self.mode == other.mode and self.modeStack == other.modeStack and self.hitEOF == other.hitEOF
+
+    def __hash__(self):
+        return hash((self.index, self.line, self.column, self.mode, self.modeStack, self.hitEOF))
+
+    def __str__(self):
+        return "@" + str(self.index) + " " + str(self.line) + ":" + str(self.column) + " mode " + str(self.mode) + \
+               (" stack " + str(list(self.modeStack)) if len(self.modeStack) > 0 else "") + (" EOF" if self.hitEOF else "")
+
+
 class Lexer(Recognizer, TokenSource):
     __slots__ = (
         '_input', '_output', '_factory', '_tokenFactorySourcePair', '_token',
         '_tokenStartCharIndex', '_tokenStartLine', '_tokenStartColumn',
-        '_hitEOF', '_channel', '_type', '_modeStack', '_mode', '_text'
+        '_hitEOF', '_channel', '_type', '_modeStack', '_mode', '_text',
+        '_checkpoints', '_checkpointInterval', '_nextCheckpointLine'
     )
 
     DEFAULT_MODE = 0
@@ -90,6 +121,12 @@ class Lexer(Recognizer, TokenSource):
         #/
         self._text = None
 
+        # The states recorded every _checkpointInterval lines, see
+        #  setCheckpointInterval; None if not recording.
+        self._checkpoints = None
+        self._checkpointInterval = 0
+        self._nextCheckpointLine = 1
+
 
     def reset(self):
         # wack Lexer state variables
@@ -108,6 +145,9 @@ class Lexer(Recognizer, TokenSource):
         self._modeStack = []
 
         self._interp.reset()
+        if self._checkpoints is not None:
+            self._checkpoints = []
+            self._nextCheckpointLine = 1
 
     # Return a token from self source; i.e., match a token on the char
     #  stream.
@@ -123,6 +163,8 @@ class Lexer(Recognizer, TokenSource):
                 if self._hitEOF:
                     self.emitEOF()
                     return self._token
+                if self._checkpoints is not None and self._interp.line >= self._nextCheckpointLine:
+                    self.addCheckpoint(self.snapshot())
                 self._token = None
                 self._channel = Token.DEFAULT_CHANNEL
                 self._tokenStartCharIndex = self._input.index
@@ -157,6 +199,92 @@ class Lexer(Recognizer, TokenSource):
             # unbuffered char stream will keep buffering
             self._input.release(tokenStartMarker)
 
+    # The state of the lexer before the next token. Only meaningful between
+    #  calls to nextToken, not from within lexer actions.
+    def snapshot(self):
+        return LexerState(self._input.index, self._interp.line, self._interp.column, self._mode,
+                          self._modeStack, self._hitEOF)
+
+    # Continue lexing from {@code state}, taken by snapshot on the same
+    #  text. The input stream must be able to seek to the index of the state,
+    #  which an unbuffered stream can't do backwards. Lexers whose actions or
+    #  predicates depend on other fields must restore those themselves.
+    def restore(self, state:LexerState):
+        self._input.seek(state.index)
+        self._token = None
+        self._type = Token.INVALID_TYPE
+        self._channel = Token.DEFAULT_CHANNEL
+        self._tokenStartCharIndex = -1
+        self._tokenStartColumn = -1
+        self._tokenStartLine = -1
+        self._text = None
+
+        self._hitEOF = state.hitEOF
+        self._mode = state.mode
+        self._modeStack = list(state.modeStack)
+
+        self._interp.reset()
+        self._interp.line = state.line
+        self._interp.column = state.column
+
+    # Record the state of the lexer before the first token at or after
+    #  every {@code lines} lines, starting at the beginning of the text;
+    #  0 stops recording and forgets the checkpoints. Restoring a checkpoint
+    #  with restore starts lexing at that line without lexing what comes
+    #  before it.
+    def setCheckpointInterval(self, lines:int):
+        if lines < 0:
+            raise ValueError("invalid checkpoint interval " + str(lines))
+        self._checkpointInterval = lines
+        if lines == 0:
+            self._checkpoints = None
+        elif self._checkpoints is None:
+            self._checkpoints = []
+        self._updateNextCheckpointLine()
+
+    def getCheckpointInterval(self):
+        return self._checkpointInterval
+
+    # The recorded states, by increasing index, or None if not recording.
+    def getCheckpoints(self):
+        return self._checkpoints
+
+    # The last checkpoint at or before line {@code line}, or None.
+    def getCheckpoint(self, line:int):
+        if self._checkpoints is None:
+            return None
+        lo, hi = 0, len(self._checkpoints)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._checkpoints[mid].line <= line:
+                lo = mid + 1
+            else:
+                hi = mid
+        return self._checkpoints[lo-1] if lo > 0 else None
+
+    # Add {@code state} to the checkpoints if it is after the last one.
+    def addCheckpoint(self, state:LexerState):
+        if self._checkpoints is None:
+            return
+        if len(self._checkpoints) == 0 or self._checkpoints[-1].index < state.index:
+            self._checkpoints.append(state)
+            self._updateNextCheckpointLine()
+
+    # Forget the checkpoints after character {@code index}, when the text
+    #  after it changed. Lexing past the last checkpoint records them again.
+    def discardCheckpoints(self, index:int):
+        if self._checkpoints is None:
+            return
+        while len(self._checkpoints) > 0 and self._checkpoints[-1].index > index:
+            self._checkpoints.pop()
+        self._updateNextCheckpointLine()
+
+    def _updateNextCheckpointLine(self):
+        if self._checkpoints is None or len(self._checkpoints) == 0:
+            self._nextCheckpointLine = 1
+        else:
+            self._nextCheckpointLine = self._checkpoints[-1].line + self._checkpointInterval
+
     # Instruct the lexer to skip creating a token for current lexer rule
     #  and look for another token.  nextToken() knows to keep looking when
     #  a lexer rule finishes with token set to SKIP_TOKEN.  Recall that
@@ -274,6 +402,30 @@ class Lexer(Recognizer, TokenSource):
     def text(self, txt:str):
         self._text = txt
 
+    # Install or remove a {@link ProfilingLexerATNSimulator}. The DFA cache
+    # and the position in the input are kept.
+    def setProfile(self, profile:bool):
+        from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+        from antlr4.atn.ProfilingLexerATNSimulator import ProfilingLexerATNSimulator
+        interp = self._interp
+        if profile:
+            if not isinstance(interp, ProfilingLexerATNSimulator):
+                self._interp = ProfilingLexerATNSimulator(self)
+        elif isinstance(interp, ProfilingLexerATNSimulator):
+            self._interp = LexerATNSimulator(self, interp.atn, interp.decisionToDFA, interp.sharedContextCache)
+            self._interp.copyState(interp)
+            self._interp.fastPath = interp.fastPath
+        self._interp.dfaBudget = interp.dfaBudget
+
+    # @return the profiling information gathered since {@link #setProfile}
+    # was turned on, or {@code None} if the lexer is not profiling.
+    def getProfileInfo(self):
+        from antlr4.atn.LexerProfileInfo import LexerProfileInfo
+        from antlr4.atn.ProfilingLexerATNSimulator import ProfilingLexerATNSimulator
+        if isinstance(self._interp, ProfilingLexerATNSimulator):
+            return LexerProfileInfo(self._interp)
+        return None
+
     # Return a list of all Token objects in input char stream.
     #  Forces load of all tokens. Does not include EOF token.
     #/
@@ -0,0 +1,141 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# An {@link InputStream} over a memory-mapped file.
+#
+# <p>{@link FileStream} decodes the whole file into a string and then into a
+# list with one Python int per character. This stream keeps the code points
+# in the most compact form available instead:</p>
+#
+# <ul>
+# <li>ASCII and latin-1 files, and UTF-8 files that turn out to be pure ASCII,
+# are read straight from the mapped file; nothing is copied.</li>
+# <li>UTF-32 files in native byte order are also read straight from the
+# mapped file, as a {@code memoryview} of code points.</li>
+# <li>Anything else is decoded in chunks into an {@code array('H')}, or an
+# {@code array('I')} if the file has characters outside the BMP, after
+# which the file is unmapped.</li>
+# </ul>
+#
+# <p>Token text is decoded from the file on demand, so the stream must stay
+# open while tokens are in use. Call {@link #close}, or use the stream as a
+# context manager, to release the mapping; use a
+# {@link CommonTokenFactory} with {@code copyText=True} if token text is
+# needed after that.</p>
+#
+import codecs
+import mmap
+import sys
+from array import array
+from antlr4.InputStream import InputStream
+
+
+class MappedFileStream(InputStream):
+    __slots__ = ('fileName', 'encoding', 'textCodec', '_map')
+
+    # size of the chunks decoded or checked at a time
+    CHUNK_SIZE = 1 << 20
+
+    NATIVE_UTF16 = 'utf-16-le' if sys.byteorder == 'little' else 'utf-16-be'
+    NATIVE_UTF32 = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+    def __init__(self, fileName:str, encoding:str='ascii', errors:str='strict'):
+        self.name = fileName
+        self.fileName = fileName
+        self.encoding = codecs.lookup(encoding).name
+        self.strdata = None
+        self.data = None
+        self._index = 0
+        self._map = None
+        with open(fileName, 'rb') as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty files can't be mapped
+                self._map = None
+        view = memoryview(self._map if self._map is not None else b"")
+        try:
+            self._load(view, errors)
+        except:
+            view.release()
+            self.close()
+            raise
+        view.release()
+        if not isinstance(self.data, memoryview):
+            # everything was copied; the mapping is no longer needed
+            self.close()
+        self._size = len(self.data)
+
+    def _load(self, view:memoryview, errors:str):
+        encoding = self.encoding
+        if encoding == 'iso8859-1' or (encoding in ('ascii', 'utf-8') and self._isASCII(view)):
+            self.data = view[:]
+            self.textCodec = 'latin-1'
+        elif encoding == self.NATIVE_UTF32 and errors == 'strict' and len(view) % 4 == 0:
+            self._check(view)
+            self.data = view.cast('I')
+            self.textCodec = self.NATIVE_UTF32
+        else:
+            self.data = self._decode(view, errors)
+            self.textCodec = self.NATIVE_UTF16 if self.data.typecode == 'H' else self.NATIVE_UTF32
+
+    def _isASCII(self, view:memoryview):
+        for i in range(0, len(view), self.CHUNK_SIZE):
+            if not view[i:i+self.CHUNK_SIZE].tobytes().isascii():
+                return False
+        return True
+
+    # Run the data through the decoder so malformed input is reported just
+    # like by {@link FileStream}.
+    def _check(self, view:memoryview):
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        for i in range(0, len(view), self.CHUNK_SIZE):
+            decoder.decode(view[i:i+self.CHUNK_SIZE].tobytes(), False)
+        decoder.decode(b"", True)
+
+    def _decode(self, view:memoryview, errors:str):
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors)
+        data = array('H')
+        for i in range(0, len(view) + 1, self.CHUNK_SIZE):
+            text = decoder.decode(view[i:i+self.CHUNK_SIZE].tobytes(), i + self.CHUNK_SIZE > len(view))
+            if data.typecode == 'H' and len(text) > 0 and max(text) > '\uffff':
+                data = array('I', data)
+            if data.typecode == 'H':
+                data.frombytes(text.encode(self.NATIVE_UTF16))
+            else:
+                data.frombytes(text.encode(self.NATIVE_UTF32))
+        return data
+
+    def reset(self):
+        self._index = 0
+
+    def getText(self, start:int, stop:int):
+        if stop >= self._size:
+            stop = self._size-1
+        if start >= self._size:
+            return ""
+        else:
+            return self.data[start:stop+1].tobytes().decode(self.textCodec)
+
+    # Release the mapped file. The stream can't be used afterwards.
+    def close(self):
+        if isinstance(self.data, memoryview):
+            self.data.release()
+            self.data = b""
+            self._size = 0
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __str__(self):
+        return self.getText(0, self._size-1)
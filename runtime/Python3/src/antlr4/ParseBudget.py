@@ -0,0 +1,145 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# Limits the work a {@link Parser} may do on one input.
+#
+# <p>Installed with {@link Parser#setParseBudget}, the budget counts the
+# tokens the parser consumes ({@link Parser#consume}), the predictions it
+# makes ({@link ParserATNSimulator#adaptivePredict}) and the closure
+# operations of the prediction ({@link ParserATNSimulator#closure_}), and
+# bounds how many tokens one prediction may look ahead. Going over a limit,
+# passing the deadline or a call to {@link #cancel} makes the parser raise a
+# {@link ParseBudgetExceededException} from the rule being parsed. That
+# exception is not a {@link RecognitionException}, so error recovery does not
+# catch it, and not a {@link ParseCancellationException}, so it is not taken
+# for the failure of the first stage of {@link Parser#parseWithFallback}.</p>
+#
+# <p>Counting costs an increment and a comparison per event. The limits and
+# the clock are only looked at every {@link #checkInterval} events of a kind,
+# or when a limit is reached, in {@link #check}. {@link #checkpoint} is called
+# there too; override it to do something periodically while the parser
+# runs, or to stop it for other reasons by raising.</p>
+#
+# <pre>
+# parser.setParseBudget(ParseBudget(timeout=2.0, maxTokens=1000000))
+# try:
+#     tree = parser.compilationUnit()
+# except ParseBudgetExceededException as e:
+#     print(e.reason)
+# </pre>
+#
+# <p>{@link #cancel} may be called from another thread; the parser stops at
+# its next token, prediction or closure operation.</p>
+#
+from time import monotonic
+from antlr4.error.Errors import ParseBudgetExceededException
+
+
+class ParseBudget(object):
+    __slots__ = ('timeout', 'maxTokens', 'maxClosureOperations', 'maxLookahead', 'checkInterval', 'deadline',
+                 'tokens', 'predictions', 'closureOperations', 'checks', 'cancelled',
+                 'tokenLimit', 'predictionLimit', 'closureLimit')
+
+    # reasons of {@link ParseBudgetExceededException}
+    CANCELLED = "cancelled"
+    DEADLINE = "deadline"
+    TOKENS = "maxTokens"
+    CLOSURE_OPERATIONS = "maxClosureOperations"
+    LOOKAHEAD = "maxLookahead"
+
+    # @param timeout the seconds the parse may take from {@link #start}
+    # @param maxTokens the number of tokens the parser may consume
+    # @param maxClosureOperations the number of closure operations of all
+    # predictions together
+    # @param maxLookahead the number of tokens one prediction may look ahead
+    # beyond the first
+    # @param checkInterval the number of events of a kind between checks of
+    # the clock
+    def __init__(self, timeout:float=None, maxTokens:int=None, maxClosureOperations:int=None,
+                 maxLookahead:int=None, checkInterval:int=1000):
+        for name, value in (("timeout", timeout), ("maxTokens", maxTokens),
+                            ("maxClosureOperations", maxClosureOperations), ("maxLookahead", maxLookahead)):
+            if value is not None and value < 0:
+                raise ValueError(name + " must not be negative")
+        if checkInterval <= 0:
+            raise ValueError("checkInterval must be positive")
+        self.timeout = timeout
+        self.maxTokens = maxTokens
+        self.maxClosureOperations = maxClosureOperations
+        self.maxLookahead = maxLookahead
+        self.checkInterval = checkInterval
+        self.start()
+
+    # Start counting from zero, with the deadline {@link #timeout} from now.
+    # Called by {@link Parser#setParseBudget}.
+    def start(self):
+        self.deadline = monotonic() + self.timeout if self.timeout is not None else None
+        self.tokens = 0
+        self.predictions = 0
+        self.closureOperations = 0
+        # the number of times the limits were checked
+        self.checks = 0
+        self.cancelled = False
+        self.schedule()
+
+    # Make the parser stop at its next event.
+    def cancel(self):
+        self.cancelled = True
+        self.tokenLimit = 0
+        self.predictionLimit = 0
+        self.closureLimit = 0
+
+    # The seconds left before the deadline, or {@code None} if there is none.
+    def remaining(self):
+        return self.deadline - monotonic() if self.deadline is not None else None
+
+    # Raise {@link ParseBudgetExceededException} if the budget is used up, or
+    # call {@link #checkpoint} and schedule the next check. The counters of
+    # the parser call this when they reach their limit attribute.
+    def check(self):
+        if self.cancelled:
+            raise ParseBudgetExceededException(self, self.CANCELLED)
+        if self.maxTokens is not None and self.tokens > self.maxTokens:
+            raise ParseBudgetExceededException(self, self.TOKENS)
+        if self.maxClosureOperations is not None and self.closureOperations > self.maxClosureOperations:
+            raise ParseBudgetExceededException(self, self.CLOSURE_OPERATIONS)
+        if self.deadline is not None and monotonic() >= self.deadline:
+            raise ParseBudgetExceededException(self, self.DEADLINE)
+        self.checks += 1
+        self.checkpoint()
+        self.schedule()
+
+    # Called by a prediction each time it looks one token further ahead.
+    def checkLookahead(self, depth:int):
+        if self.maxLookahead is not None and depth > self.maxLookahead:
+            raise ParseBudgetExceededException(self, self.LOOKAHEAD)
+
+    # Called every {@link #checkInterval} events while the budget is not
+    # exceeded; does nothing by default.
+    def checkpoint(self):
+        pass
+
+    # Set the counter values at which {@link #check} is called next: after
+    # {@link #checkInterval} more events, or right after a limit.
+    def schedule(self):
+        if self.cancelled:
+            self.cancel()
+            return
+        interval = self.checkInterval
+        self.tokenLimit = self.tokens + interval
+        if self.maxTokens is not None and self.tokenLimit > self.maxTokens + 1:
+            self.tokenLimit = self.maxTokens + 1
+        self.predictionLimit = self.predictions + interval
+        self.closureLimit = self.closureOperations + interval
+        if self.maxClosureOperations is not None and self.closureLimit > self.maxClosureOperations + 1:
+            self.closureLimit = self.maxClosureOperations + 1
+
+    def __str__(self):
+        return "ParseBudget(tokens=" + str(self.tokens) + \
+               ", predictions=" + str(self.predictions) + \
+               ", closureOperations=" + str(self.closureOperations) + \
+               ", checks=" + str(self.checks) + ")"
@@ -9,7 +9,7 @@ else:
     from typing.io import TextIO
 from antlr4.BufferedTokenStream import TokenStream
 from antlr4.CommonTokenFactory import TokenFactory
-from antlr4.error.ErrorStrategy import DefaultErrorStrategy
+from antlr4.error.ErrorStrategy import DefaultErrorStrategy, BailErrorStrategy
 from antlr4.InputStream import InputStream
 from antlr4.Recognizer import Recognizer
 from antlr4.RuleContext import RuleContext
@@ -18,7 +18,8 @@ from antlr4.Token import Token
 from antlr4.Lexer import Lexer
 from antlr4.atn.ATNDeserializer import ATNDeserializer
 from antlr4.atn.ATNDeserializationOptions import ATNDeserializationOptions
-from antlr4.error.Errors import UnsupportedOperationException, RecognitionException
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.Errors import UnsupportedOperationException, RecognitionException, ParseCancellationException
 from antlr4.tree.ParseTreePatternMatcher import ParseTreePatternMatcher
 from antlr4.tree.Tree import ParseTreeListener, TerminalNode, ErrorNode
 
@@ -47,7 +48,8 @@ class TraceListener(ParseTreeListener):
 class Parser (Recognizer):
     __slots__ = (
         '_input', '_output', '_errHandler', '_precedenceStack', '_ctx',
-        'buildParseTrees', '_tracer', '_parseListeners', '_syntaxErrors'
+        'buildParseTrees', '_tracer', '_parseListeners', '_syntaxErrors', 'parseStage', '_flatTree',
+        '_parseBudget'
 
     )
     # self field maps from the serialized ATN string to the deserialized {@link ATN} with
@@ -85,6 +87,13 @@ class Parser (Recognizer):
         # The number of syntax errors reported during parsing. self value is
         # incremented each time {@link #notifyErrorListeners} is called.
         self._syntaxErrors = 0
+        # The prediction mode that produced the tree returned by the last call
+        # to {@link #parseWithFallback}.
+        self.parseStage = None
+        # The {@link FlatTreeBuilder} set by {@link #setBuildFlatTree}.
+        self._flatTree = None
+        # The {@link ParseBudget} set by {@link #setParseBudget}.
+        self._parseBudget = None
         self.setInputStream(input)
 
     # reset the parser's state#
@@ -97,6 +106,8 @@ class Parser (Recognizer):
         self.setTrace(False)
         self._precedenceStack = list()
         self._precedenceStack.append(0)
+        if self._flatTree is not None:
+            self._flatTree.clear()
         if self._interp is not None:
             self._interp.reset()
 
@@ -128,6 +139,8 @@ class Parser (Recognizer):
                 # we must have conjured up a new token during single token insertion
                 # if it's not the current symbol
                 self._ctx.addErrorNode(t)
+            elif self._flatTree is not None and t.tokenIndex==-1:
+                self._flatTree.visitTerminal(t, True)
         return t
 
     # Match current input symbol as a wildcard. If the symbol type matches
@@ -157,6 +170,8 @@ class Parser (Recognizer):
                 # we must have conjured up a new token during single token insertion
                 # if it's not the current symbol
                 self._ctx.addErrorNode(t)
+            elif self._flatTree is not None and t.tokenIndex==-1:
+                self._flatTree.visitTerminal(t, True)
 
         return t
 
@@ -206,7 +221,7 @@ class Parser (Recognizer):
     # @param listener the listener to remove
     #
     def removeParseListener(self, listener:ParseTreeListener):
-        if self._parseListeners is not None:
+        if self._parseListeners is not None and listener in self._parseListeners:
             self._parseListeners.remove(listener)
             if len(self._parseListeners)==0:
                     self._parseListeners = None
@@ -343,9 +358,16 @@ class Parser (Recognizer):
     # listeners.
     #
     def consume(self):
+        budget = self._parseBudget
+        if budget is not None:
+            budget.tokens += 1
+            if budget.tokens >= budget.tokenLimit:
+                budget.check()
         o = self.getCurrentToken()
         if o.type != Token.EOF:
             self.getInputStream().consume()
+        if self._flatTree is not None:
+            self._flatTree.visitTerminal(o, self._errHandler.inErrorRecoveryMode(self))
         hasListener = self._parseListeners is not None and len(self._parseListeners)>0
         if self.buildParseTrees or hasListener:
             if self._errHandler.inErrorRecoveryMode(self):
@@ -374,11 +396,15 @@ class Parser (Recognizer):
         self._ctx.start = self._input.LT(1)
         if self.buildParseTrees:
             self.addContextToParseTree()
+        if self._flatTree is not None:
+            self._flatTree.enterRule()
         if self._parseListeners  is not None:
             self.triggerEnterRuleEvent()
 
     def exitRule(self):
         self._ctx.stop = self._input.LT(-1)
+        if self._flatTree is not None:
+            self._flatTree.exitRule(self._ctx)
         # trigger event on _ctx, before it reverts to parent
         if self._parseListeners is not None:
             self.triggerExitRuleEvent()
@@ -411,6 +437,8 @@ class Parser (Recognizer):
         self._precedenceStack.append(precedence)
         self._ctx = localctx
         self._ctx.start = self._input.LT(1)
+        if self._flatTree is not None:
+            self._flatTree.enterRule()
         if self._parseListeners is not None:
             self.triggerEnterRuleEvent() # simulates rule entry for left-recursive rules
 
@@ -422,6 +450,8 @@ class Parser (Recognizer):
         previous.parentCtx = localctx
         previous.invokingState = state
         previous.stop = self._input.LT(-1)
+        if self._flatTree is not None:
+            self._flatTree.closeRule(previous)
 
         self._ctx = localctx
         self._ctx.start = previous.start
@@ -435,6 +465,8 @@ class Parser (Recognizer):
         self._precedenceStack.pop()
         self._ctx.stop = self._input.LT(-1)
         retCtx = self._ctx # save current ctx (return value)
+        if self._flatTree is not None:
+            self._flatTree.exitRule(retCtx)
         # unroll so _ctx is as it was before call to recursive method
         if self._parseListeners is not None:
             while self._ctx is not parentCtx:
@@ -578,3 +610,113 @@ class Parser (Recognizer):
                 self.removeParseListener(self._tracer)
             self._tracer = TraceListener(self)
             self.addParseListener(self._tracer)
+
+    # Install or remove a {@link ProfilingATNSimulator}. The DFA cache and the
+    # prediction mode are kept.
+    def setProfile(self, profile:bool):
+        from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+        from antlr4.atn.ProfilingATNSimulator import ProfilingATNSimulator
+        interp = self._interp
+        saveMode = interp.predictionMode
+        if profile:
+            if not isinstance(interp, ProfilingATNSimulator):
+                self._interp = ProfilingATNSimulator(self)
+        elif isinstance(interp, ProfilingATNSimulator):
+            self._interp = ParserATNSimulator(self, self.atn, interp.decisionToDFA, interp.sharedContextCache)
+        self._interp.predictionMode = saveMode
+        self._interp.dfaBudget = interp.dfaBudget
+        self._interp.parseBudget = interp.parseBudget
+
+    # @return the profiling information gathered since {@link #setProfile}
+    # was turned on, or {@code None} if the parser is not profiling.
+    def getParseInfo(self):
+        from antlr4.atn.ParseInfo import ParseInfo
+        from antlr4.atn.ProfilingATNSimulator import ProfilingATNSimulator
+        if isinstance(self._interp, ProfilingATNSimulator):
+            return ParseInfo(self._interp)
+        return None
+
+    # Limit the tokens, predictions and time of the parse, or remove the
+    # limits if {@code budget} is {@code None}. The budget starts counting
+    # now; a parser that goes over it raises
+    # {@link ParseBudgetExceededException}.
+    #
+    # @see ParseBudget
+    def setParseBudget(self, budget):
+        self._parseBudget = budget
+        self._interp.parseBudget = budget
+        if budget is not None:
+            budget.start()
+
+    def getParseBudget(self):
+        return self._parseBudget
+
+    # Record parse trees in a {@link FlatTree} instead of building them from
+    # contexts; turning this on turns off {@link #buildParseTrees}, and
+    # turning it off turns it back on.
+    #
+    # <p>Rules still return their context, without children. The tree of the
+    # last start rule is returned by {@link #getFlatTree}.</p>
+    def setBuildFlatTree(self, flat:bool):
+        if flat:
+            from antlr4.tree.FlatTree import FlatTreeBuilder
+            self._flatTree = FlatTreeBuilder(self)
+            self.buildParseTrees = False
+        else:
+            self._flatTree = None
+            self.buildParseTrees = True
+
+    # @return the {@link FlatTree} of the last start rule, or {@code None}
+    # if flat trees are not being built.
+    def getFlatTree(self):
+        return self._flatTree.tree if self._flatTree is not None else None
+
+    # Parse the input with start rule {@code ruleName} in two stages.
+    #
+    # <p>The first stage uses {@link PredictionMode#SLL} and the
+    # {@link BailErrorStrategy}, with error listeners muted. It is much faster
+    # than full LL prediction and succeeds for almost all inputs. If it fails,
+    # which happens for syntax errors and for the rare input that needs full
+    # context, the token stream is rewound to where the parse started and the
+    # input is parsed again with {@link PredictionMode#LL} and the error
+    # strategy and listeners that were configured. Either way, the prediction
+    # mode and error strategy are restored afterwards.</p>
+    #
+    # <p>Parse listeners see the events of both stages when the second stage
+    # runs. Tokens are fetched once, so lexer errors are only reported
+    # once.</p>
+    #
+    # @return the parse tree; {@link #parseStage} tells which stage produced it
+    def parseWithFallback(self, ruleName:str):
+        if ruleName not in self.ruleNames:
+            raise Exception("no rule " + ruleName + " in " + str(self.grammarFileName))
+        rule = getattr(self, ruleName)
+        interp = self._interp
+        mode = interp.predictionMode
+        errHandler = self._errHandler
+        listeners = self._listeners
+        trace = self._tracer is not None
+        start = self._input.index if self._input.index >= 0 else 0
+        try:
+            interp.predictionMode = PredictionMode.SLL
+            self._errHandler = BailErrorStrategy()
+            self._listeners = []
+            try:
+                tree = rule()
+                self.parseStage = PredictionMode.SLL
+                return tree
+            except ParseCancellationException:
+                pass
+            self._listeners = listeners
+            self._errHandler = errHandler
+            interp.predictionMode = PredictionMode.LL if mode == PredictionMode.SLL else mode
+            self.reset()
+            self._input.seek(start)
+            self.setTrace(trace)
+            tree = rule()
+            self.parseStage = PredictionMode.LL
+            return tree
+        finally:
+            interp.predictionMode = mode
+            self._errHandler = errHandler
+            self._listeners = listeners
@@ -3,6 +3,7 @@
 # Use of this file is governed by the BSD 3-clause license that
 # can be found in the LICENSE.txt file in the project root.
 #/
+import threading
 from antlr4.RuleContext import RuleContext
 from antlr4.atn.ATN import ATN
 from antlr4.error.Errors import IllegalStateException
@@ -84,6 +85,7 @@ class PredictionContextCache(object):
 
     def __init__(self):
         self.cache = dict()
+        self.lock = threading.Lock()
 
     #  Add a context to the cache and return it. If the context already exists,
     #  return that one instead and do not add a new context to the cache.
@@ -95,12 +97,18 @@ class PredictionContextCache(object):
         existing = self.cache.get(ctx, None)
         if existing is not None:
             return existing
-        self.cache[ctx] = ctx
-        return ctx
+        with self.lock:
+            # another thread may have added it in the meantime
+            return self.cache.setdefault(ctx, ctx)
 
     def get(self, ctx:PredictionContext):
         return self.cache.get(ctx, None)
 
+    # Drop all cached contexts. Contexts already in use stay valid; they are
+    # just no longer shared with contexts added later.
+    def clear(self):
+        self.cache = dict()
+
     def __len__(self):
         return len(self.cache)
 
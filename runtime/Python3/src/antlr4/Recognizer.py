@@ -121,6 +121,45 @@ class Recognizer(object):
     def getErrorListenerDispatch(self):
         return ProxyErrorListener(self._listeners)
 
+    # Clear the DFA cache and the prediction context cache shared by all
+    # instances of this recognizer class, e.g. after a pathological input made
+    # them grow. Instances with an isolated cache ({@link #isolateDFACache})
+    # are not affected. Parsers running concurrently keep working, but have to
+    # learn their decisions again.
+    @classmethod
+    def clearDFACache(cls):
+        from antlr4.dfa.DFA import DFA
+        decisionsToDFA = cls.decisionsToDFA
+        for d in range(0, len(decisionsToDFA)):
+            decisionsToDFA[d] = DFA(cls.atn.getDecisionState(d), d)
+        sharedContextCache = getattr(cls, "sharedContextCache", None)
+        if sharedContextCache is not None:
+            sharedContextCache.clear()
+
+    # Give this instance an empty DFA cache and prediction context cache of
+    # its own, instead of the ones shared by its class. The DFA is learned
+    # from scratch and dropped with the recognizer; other instances neither
+    # see nor affect it.
+    def isolateDFACache(self):
+        from antlr4.PredictionContext import PredictionContextCache
+        interp = self._interp
+        interp.decisionToDFA = list(interp.decisionToDFA)
+        interp.clearDFA()
+        interp.sharedContextCache = PredictionContextCache()
+
+    # Limit the number of states in the DFA cache of this recognizer, or
+    # remove the limit if {@code budget} is {@code None}. DFAs that are
+    # already over budget are flushed right away.
+    #
+    # @see DFABudget
+    def setDFABudget(self, budget):
+        self._interp.dfaBudget = budget
+        if budget is not None:
+            budget.enforce(self._interp.decisionToDFA)
+
+    def getDFABudget(self):
+        return self._interp.dfaBudget
+
     # subclass needs to override these if there are sempreds or actions
     # that the ATN interp needs to execute
     def sempred(self, localctx:RuleContext, ruleIndex:int, actionIndex:int):
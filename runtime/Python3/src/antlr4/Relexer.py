@@ -0,0 +1,211 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# A token source that can lex an edited text again from the edit on, and
+# patch the tokens of a {@link BufferedTokenStream}.
+#
+# <p>The relexer passes the tokens of a lexer through, and records for each
+# token the lexer mode and mode stack it was lexed in, and the furthest
+# character the lexer had looked at up to and including that token.
+# {@link #edit} changes the text of the lexer's
+# {@link IncrementalInputStream} and restarts the lexer at the end of the
+# last token whose lexing did not look at the changed characters, with the
+# mode, mode stack, line and column it had there. It stops when the lexer
+# is about to look for a token at the place it did before, in the same mode,
+# and splices the new tokens into the stream. The tokens after them are
+# kept, with their index, position and line moved by the edit; they remain
+# the same objects. The lexer's checkpoints after them, see
+# {@link Lexer#setCheckpointInterval}, are moved the same way. The work
+# done is proportional to the tokens that changed, apart from moving the
+# tokens after them.</p>
+#
+# <pre>
+# lexer = MyLexer(IncrementalInputStream(text))
+# relexer = Relexer(lexer)
+# tokens = CommonTokenStream(relexer)
+# tokens.fill()
+# ...
+# first, stop, added = relexer.edit(tokens, 120, 125, "count")
+# </pre>
+#
+# <p>Lexers whose actions or predicates depend on other state than the
+# mode and position can't be restarted in the middle of the text.</p>
+#
+from array import array
+from bisect import bisect_left
+from antlr4.BufferedTokenStream import BufferedTokenStream
+from antlr4.IncrementalInputStream import IncrementalInputStream
+from antlr4.Lexer import Lexer, LexerState
+from antlr4.Token import Token
+from antlr4.error.Errors import IllegalStateException
+
+
+class Relexer(object):
+    __slots__ = ('lexer', 'states', 'looks')
+
+    def __init__(self, lexer:Lexer):
+        if not isinstance(lexer.inputStream, IncrementalInputStream):
+            raise IllegalStateException("the lexer must read from an IncrementalInputStream")
+        self.lexer = lexer
+        # the lexer mode and mode stack before each token
+        self.states = []
+        # the furthest character looked at up to and including each token
+        self.looks = array('i')
+
+    # the rest of the token source interface is the lexer's
+
+    def __getattr__(self, name:str):
+        return getattr(self.lexer, name)
+
+    @property
+    def _factory(self):
+        return self.lexer._factory
+
+    @_factory.setter
+    def _factory(self, factory):
+        self.lexer._factory = factory
+
+    # Lex the next token and record the state and lookahead for it.
+    def nextToken(self):
+        lexer = self.lexer
+        input = lexer.inputStream
+        state = (lexer._mode, tuple(lexer._modeStack))
+        if len(self.states) > 0 and state == self.states[-1]:
+            state = self.states[-1]
+        input.lookahead = -1
+        t = lexer.nextToken()
+        look = max(input.lookahead, input.index)
+        if len(self.looks) > 0 and self.looks[-1] > look:
+            look = self.looks[-1]
+        self.states.append(state)
+        self.looks.append(look)
+        return t
+
+    def reset(self):
+        self.lexer.reset()
+        self.states = []
+        self.looks = array('i')
+
+    # Replace the characters from {@code start} up to {@code stop}, not
+    # included, by {@code text}, relex what the change affects and patch
+    # {@code tokens}, which must have been fed by this relexer.
+    #
+    # @return the index of the first new token, the index after the last
+    # new token, and the number of tokens this added (or removed, if
+    # negative)
+    def edit(self, tokens:BufferedTokenStream, start:int, stop:int, text:str):
+        lexer = self.lexer
+        input = lexer.inputStream
+        if tokens.tokenSource is not self:
+            raise IllegalStateException("the tokens were not lexed by this relexer")
+        if start < 0 or stop < start or stop > input.size:
+            raise ValueError("invalid range " + str(start) + ".." + str(stop))
+        tokens.fill()
+        old = tokens.tokens
+        delta = len(text) - (stop - start)
+        # the first token whose lexing looked at the changed text
+        first = bisect_left(self.looks, start)
+        startLine, startColumn = self.position(old, start)
+        stopLine, stopColumn = self.position(old, stop)
+        if first == 0:
+            resume, line, column = 0, 1, 0
+        else:
+            resume = old[first-1].stop + 1
+            line, column = self.position(old, resume)
+        # where the text after the edit starts now
+        endLine, endColumn = startLine, startColumn
+        for c in text:
+            if c == '\n':
+                endLine += 1
+                endColumn = 0
+            else:
+                endColumn += 1
+        input.replace(start, stop, text)
+
+        # checkpoints after the place the lexer resumes at may no longer hold
+        checkpoints = lexer.getCheckpoints()
+        later = [ c for c in checkpoints if c.index > resume ] if checkpoints is not None else []
+        lexer.discardCheckpoints(resume)
+        mode, modeStack = self.states[first]
+        lexer.restore(LexerState(resume, line, column, mode, modeStack))
+
+        # lex until the lexer looks for a token where it did before, in the
+        # same state
+        states, looks = self.states, self.looks
+        self.states, self.looks = states[:first], looks[:first]
+        new = []
+        resync = first
+        while True:
+            position = input.index
+            if position >= start + len(text):
+                # the first old token the lexer started to look for after
+                # the edit, here or later
+                while resync < len(old) and (self.resumeIndex(old, resync) < stop or
+                                             self.resumeIndex(old, resync) + delta < position):
+                    resync += 1
+                if resync < len(old) and self.resumeIndex(old, resync) + delta == position and \
+                        states[resync] == (lexer._mode, tuple(lexer._modeStack)):
+                    break
+            t = self.nextToken()
+            new.append(t)
+            if t.type == Token.EOF:
+                resync = len(old)
+                break
+
+        self.states.extend(states[resync:])
+        look = self.looks[-1] if len(self.looks) > 0 else -1
+        for i in range(resync, len(looks)):
+            look = max(look, looks[i] + delta)
+            self.looks.append(look)
+        lineDelta = endLine - stopLine
+        columnDelta = endColumn - stopColumn
+        # the old checkpoints from where the lexer found the old tokens again
+        if resync < len(old):
+            oldResume = self.resumeIndex(old, resync)
+            for c in later:
+                if c.index >= oldResume:
+                    lexer.addCheckpoint(LexerState(c.index + delta, c.line + lineDelta,
+                                                   c.column + columnDelta if c.line == stopLine else c.column,
+                                                   c.mode, c.modeStack, c.hitEOF))
+        for i in range(resync, len(old)):
+            t = old[i]
+            t.start += delta
+            t.stop += delta
+            if t.line == stopLine:
+                t.column += columnDelta
+            t.line += lineDelta
+        tokens.splice(first, resync, new)
+        return first, first + len(new), len(new) - (resync - first)
+
+    # The character index the lexer was at when it started to look for
+    # token {@code i}.
+    def resumeIndex(self, tokens:list, i:int):
+        return tokens[i-1].stop + 1 if i > 0 else 0
+
+    # The line and column of character {@code index}, from the tokens
+    # before it.
+    def position(self, tokens:list, index:int):
+        lo, hi = 0, len(tokens)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            t = tokens[mid]
+            if t.type != Token.EOF and t.start <= index:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            line, column, pos = 1, 0, 0
+        else:
+            t = tokens[lo-1]
+            line, column, pos = t.line, t.column, t.start
+        for c in self.lexer.inputStream.data[pos:index]:
+            if c == 10:
+                line += 1
+                column = 0
+            else:
+                column += 1
+        return line, column
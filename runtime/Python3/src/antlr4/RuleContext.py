@@ -81,8 +81,16 @@ class RuleContext(RuleNode):
         if self.getChildCount() == 0:
             return ""
         with StringIO() as builder:
-            for child in self.getChildren():
-                builder.write(child.getText())
+            # descend into rule children without recursing
+            stack = [ iter(self.getChildren()) ]
+            while len(stack) > 0:
+                child = next(stack[-1], None)
+                if child is None:
+                    stack.pop()
+                elif isinstance(child, RuleContext) and type(child).getText is RuleContext.getText:
+                    stack.append(iter(child.getChildren()))
+                else:
+                    builder.write(child.getText())
             return builder.getvalue()
 
     def getRuleIndex(self):
@@ -0,0 +1,438 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# Finds token sequences described by regular expressions over token types,
+# without parsing.
+#
+# <p>Each rule is a pattern such as</p>
+#
+# <pre>
+# matcher = TokenPatternMatcher(MyLexer)
+# matcher.addRule("string-concat", "STRING '+' STRING")
+# matcher.addRule("empty-block", "'{' '}'")
+# matcher.addRule("todo", "COMMENT/.*TODO.*/", channels=[MyLexer.HIDDEN])
+# for m in matcher.match(tokens):
+#     print(m.rule, m.start.line)
+# </pre>
+#
+# <p>Pattern elements are:</p>
+#
+# <ul>
+# <li>{@code NAME} - a token by its symbolic name, or {@code EOF}</li>
+# <li>{@code 'text'} - a token by its literal name</li>
+# <li>{@code .} - any token but EOF</li>
+# <li>{@code ~X}, {@code ~(X|Y)} - any token but EOF and those listed</li>
+# <li>{@code X/regex/} - a token that also has text matching {@code regex};
+# {@code \/} stands for a slash in the regex</li>
+# <li>{@code (...)}, {@code |}, {@code ?}, {@code *}, {@code +} - grouping,
+# alternatives and repetition</li>
+# </ul>
+#
+# <p>All rules are compiled into one NFA that is run over the token buffer in
+# a single pass; the cost of a pass depends on how many rules are in progress
+# at each token, not on how many rules there are. A rule only sees tokens on
+# its channels, by default {@link Token#DEFAULT_CHANNEL}. For every rule the
+# leftmost-longest, non-overlapping matches are reported.</p>
+#
+import re
+from antlr4.BufferedTokenStream import BufferedTokenStream
+from antlr4.Token import Token
+
+
+class TokenPatternMatch(object):
+    __slots__ = ('rule', 'start', 'stop')
+
+    def __init__(self, rule:str, start:Token, stop:Token):
+        # The name of the rule that matched.
+        self.rule = rule
+        # The first and last token of the match; tokens on channels the rule
+        # does not see may be in between.
+        self.start = start
+        self.stop = stop
+
+    def __str__(self):
+        return self.rule + "@" + str(self.start.tokenIndex) + ".." + str(self.stop.tokenIndex)
+
+
+class TokenPatternMatcher(object):
+    __slots__ = ('tokenTypes', 'lexerClass', 'ruleNames', 'ruleChannels', 'rulePatterns',
+                 'atomTests', 'atomRules', 'atomNext', 'startByType', 'startAny')
+
+    # @param recognizer a lexer or parser (class or instance) whose token
+    # names are used in the patterns.
+    def __init__(self, recognizer):
+        from antlr4.Lexer import Lexer
+        self.tokenTypes = { "EOF":Token.EOF }
+        recognizerClass = recognizer if isinstance(recognizer, type) else type(recognizer)
+        if issubclass(recognizerClass, Lexer):
+            # the name lists of generated lexers are not indexed by token type;
+            # use the token type constants, and the lexer itself for literals
+            self.lexerClass = recognizerClass
+            for name in recognizer.symbolicNames:
+                ttype = getattr(recognizerClass, name, None)
+                if isinstance(ttype, int):
+                    self.tokenTypes[name] = ttype
+        else:
+            self.lexerClass = None
+            for names in (recognizer.literalNames, recognizer.symbolicNames):
+                for ttype, name in enumerate(names):
+                    if name is not None and name != "<INVALID>":
+                        self.tokenTypes[name] = ttype
+        self.ruleNames = []
+        self.ruleChannels = []
+        self.rulePatterns = []
+        self.atomTests = None
+
+    # Add a rule. Matches are reported under {@code name}.
+    #
+    # @param channels the token channels the rule sees, or {@code None} for
+    # all channels.
+    def addRule(self, name:str, pattern:str, channels:list=(Token.DEFAULT_CHANNEL,)):
+        # build now so errors show up where the rule is added
+        self.buildRule(pattern, len(self.ruleNames))
+        self.ruleNames.append(name)
+        self.ruleChannels.append(None if channels is None else frozenset(channels))
+        self.rulePatterns.append(pattern)
+        self.atomTests = None
+
+    # Build the NFA of a rule, ending in its accept state.
+    #
+    # @return the start state.
+    def buildRule(self, pattern:str, ruleIndex:int):
+        start, exits = _PatternParser(self, pattern, ruleIndex).parse()
+        _patch(exits, _NFAState(_NFAState.ACCEPT, ruleIndex))
+        for s in _closure(start):
+            if s.kind == _NFAState.ACCEPT:
+                raise Exception("pattern matches no tokens: " + pattern)
+        return start
+
+    def compile(self):
+        starts = [ self.buildRule(pattern, ruleIndex) for ruleIndex, pattern in enumerate(self.rulePatterns) ]
+
+        # number the atom states; accept states are numbered -1 - ruleIndex
+        atoms = []
+        index = dict()
+        pending = list(starts)
+        while len(pending) > 0:
+            s = pending.pop()
+            if id(s) in index:
+                continue
+            if s.kind == _NFAState.ATOM:
+                index[id(s)] = len(atoms)
+                atoms.append(s)
+            elif s.kind == _NFAState.ACCEPT:
+                index[id(s)] = -1 - s.value
+            else:
+                index[id(s)] = None
+            pending.extend(s.out)
+
+        self.atomTests = [ s.value for s in atoms ]
+        self.atomRules = [ s.rule for s in atoms ]
+        self.atomNext = [ tuple(index[id(t)] for t in _closure(s.out[0])) for s in atoms ]
+        self.startByType = dict()
+        self.startAny = []
+        for start in starts:
+            for s in _closure(start):
+                types, negate, regex = s.value
+                if types is None or negate:
+                    self.startAny.append(index[id(s)])
+                else:
+                    for ttype in types:
+                        self.startByType.setdefault(ttype, []).append(index[id(s)])
+
+    # Find all matches of all rules in {@code tokens}, which is filled first.
+    #
+    # @return the matches ordered by start token, then by rule.
+    def match(self, tokens:BufferedTokenStream):
+        if self.atomTests is None:
+            self.compile()
+        tokens.fill()
+        atomTests = self.atomTests
+        atomRules = self.atomRules
+        atomNext = self.atomNext
+        startByType = self.startByType
+        startAny = self.startAny
+        ruleChannels = self.ruleChannels
+        matches = []
+        # atom state -> index of the first token of the match in progress
+        threads = dict()
+        # rule -> { start -> longest end } of matches not reported yet
+        candidates = dict()
+
+        def step(atom, start, i):
+            for nxt in atomNext[atom]:
+                if nxt < 0:
+                    rule = -1 - nxt
+                    ends = candidates.get(rule, None)
+                    if ends is None:
+                        candidates[rule] = { start:i }
+                    elif ends.get(start, -1) < i:
+                        ends[start] = i
+                else:
+                    current = nextThreads.get(nxt, None)
+                    if current is None or start < current:
+                        nextThreads[nxt] = start
+
+        for i, t in enumerate(tokens.tokens):
+            nextThreads = dict()
+            for atom, start in threads.items():
+                channels = ruleChannels[atomRules[atom]]
+                if channels is not None and t.channel not in channels:
+                    # invisible to this rule; wait for the next token
+                    current = nextThreads.get(atom, None)
+                    if current is None or start < current:
+                        nextThreads[atom] = start
+                elif _test(atomTests[atom], t):
+                    step(atom, start, i)
+            for spawn in (startByType.get(t.type, ()), startAny):
+                for atom in spawn:
+                    channels = ruleChannels[atomRules[atom]]
+                    if (channels is None or t.channel in channels) and _test(atomTests[atom], t):
+                        step(atom, i, i)
+            threads = nextThreads
+            if len(candidates) > 0:
+                self.report(threads, candidates, matches, False)
+        self.report(threads, candidates, matches, True)
+        matches.sort(key=lambda m: (m[1], m[0]))
+        return [ TokenPatternMatch(self.ruleNames[rule], tokens.tokens[start], tokens.tokens[stop])
+                 for rule, start, stop in matches ]
+
+    # Report the matches that can no longer be extended, or preceded by an
+    # earlier one, and drop whatever overlaps them.
+    def report(self, threads:dict, candidates:dict, matches:list, final:bool):
+        atomRules = self.atomRules
+        firstLive = dict()
+        if not final:
+            for atom, start in threads.items():
+                rule = atomRules[atom]
+                if rule in candidates and firstLive.get(rule, start) >= start:
+                    firstLive[rule] = start
+        for rule in list(candidates.keys()):
+            ends = candidates[rule]
+            live = firstLive.get(rule, None)
+            for start in sorted(ends.keys()):
+                if start not in ends:
+                    continue # overlapped by a reported match
+                if live is not None and live <= start:
+                    break
+                stop = ends[start]
+                matches.append((rule, start, stop))
+                for other in [ s for s in ends if s <= stop ]:
+                    del ends[other]
+                for atom in [ a for a, s in threads.items() if atomRules[a] == rule and s <= stop ]:
+                    del threads[atom]
+            if len(ends) == 0:
+                del candidates[rule]
+
+
+def _test(test:tuple, t:Token):
+    types, negate, regex = test
+    if types is None or negate:
+        if t.type == Token.EOF or (types is not None and t.type in types):
+            return False
+    elif t.type not in types:
+        return False
+    return regex is None or regex.fullmatch(t.text) is not None
+
+
+class _NFAState(object):
+    __slots__ = ('kind', 'value', 'out', 'rule')
+
+    ATOM = 0    # value is (types, negate, regex); out is the one next state
+    SPLIT = 1   # epsilon edges to all states in out
+    ACCEPT = 2  # value is the rule index
+
+    def __init__(self, kind:int, value=None):
+        self.kind = kind
+        self.value = value
+        self.out = []
+        # the rule an atom state belongs to
+        self.rule = value if kind == self.ACCEPT else None
+
+
+# Connect the dangling exits of a fragment to {@code target}.
+def _patch(exits:list, target:_NFAState):
+    for s in exits:
+        s.out.append(target)
+
+# The atom and accept states reachable from {@code s} without consuming a
+# token, in a stable order.
+def _closure(s:_NFAState):
+    result = []
+    seen = set()
+    pending = [s]
+    while len(pending) > 0:
+        s = pending.pop()
+        if id(s) in seen:
+            continue
+        seen.add(id(s))
+        if s.kind == _NFAState.SPLIT:
+            pending.extend(reversed(s.out))
+        else:
+            result.append(s)
+    return result
+
+
+#
+# Recursive descent parser turning a pattern into a Thompson NFA fragment,
+# a (start state, dangling exit states) pair.
+#
+class _PatternParser(object):
+    __slots__ = ('matcher', 'pattern', 'pos', 'rule')
+
+    def __init__(self, matcher:TokenPatternMatcher, pattern:str, rule:int):
+        self.matcher = matcher
+        self.pattern = pattern
+        self.pos = 0
+        self.rule = rule
+
+    def parse(self):
+        fragment = self.parseAlternatives()
+        if self.peek() is not None:
+            self.error("unexpected '" + self.peek() + "'")
+        return fragment
+
+    def error(self, msg:str):
+        raise Exception(msg + " at " + str(self.pos) + " in pattern: " + self.pattern)
+
+    def peek(self):
+        while self.pos < len(self.pattern) and self.pattern[self.pos].isspace():
+            self.pos += 1
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def expect(self, c:str):
+        if self.peek() != c:
+            self.error("missing '" + c + "'")
+        self.pos += 1
+
+    def parseAlternatives(self):
+        fragments = [ self.parseSequence() ]
+        while self.peek() == '|':
+            self.pos += 1
+            fragments.append(self.parseSequence())
+        if len(fragments) == 1:
+            return fragments[0]
+        split = _NFAState(_NFAState.SPLIT)
+        exits = []
+        for start, ends in fragments:
+            split.out.append(start)
+            exits.extend(ends)
+        return split, exits
+
+    def parseSequence(self):
+        fragment = None
+        while self.peek() not in (None, '|', ')'):
+            item = self.parseItem()
+            if fragment is None:
+                fragment = item
+            else:
+                _patch(fragment[1], item[0])
+                fragment = fragment[0], item[1]
+        if fragment is None:
+            self.error("missing element")
+        return fragment
+
+    def parseItem(self):
+        start, exits = self.parseAtom()
+        while self.peek() in ('?', '*', '+'):
+            op = self.pattern[self.pos]
+            self.pos += 1
+            split = _NFAState(_NFAState.SPLIT)
+            split.out.append(start)
+            if op == '?':
+                start, exits = split, exits + [split]
+            elif op == '*':
+                _patch(exits, split)
+                start, exits = split, [split]
+            else:
+                _patch(exits, split)
+                exits = [split]
+        return start, exits
+
+    def parseAtom(self):
+        c = self.peek()
+        if c == '(':
+            self.pos += 1
+            fragment = self.parseAlternatives()
+            self.expect(')')
+            return fragment
+        if c == '.':
+            self.pos += 1
+            types, negate = None, False
+        elif c == '~':
+            self.pos += 1
+            types, negate = self.parseSet(), True
+        else:
+            types, negate = frozenset([self.parseTokenRef()]), False
+        regex = None
+        if self.pos < len(self.pattern) and self.pattern[self.pos] == '/':
+            regex = self.parseRegex()
+        atom = _NFAState(_NFAState.ATOM, (types, negate, regex))
+        atom.rule = self.rule
+        return atom, [atom]
+
+    def parseSet(self):
+        if self.peek() != '(':
+            return frozenset([self.parseTokenRef()])
+        self.pos += 1
+        types = set([self.parseTokenRef()])
+        while self.peek() == '|':
+            self.pos += 1
+            types.add(self.parseTokenRef())
+        self.expect(')')
+        return frozenset(types)
+
+    def parseTokenRef(self):
+        c = self.peek()
+        start = self.pos
+        if c == "'":
+            self.pos += 1
+            while self.pos < len(self.pattern) and self.pattern[self.pos] != "'":
+                self.pos += 2 if self.pattern[self.pos] == '\\' else 1
+            if self.pos >= len(self.pattern):
+                self.error("unterminated literal")
+            self.pos += 1
+        elif c is not None and (c.isalpha() or c == '_'):
+            while self.pos < len(self.pattern) and (self.pattern[self.pos].isalnum() or self.pattern[self.pos] == '_'):
+                self.pos += 1
+        else:
+            self.error("missing token")
+        name = self.pattern[start:self.pos]
+        ttype = self.matcher.tokenTypes.get(name, None)
+        if ttype is None and c == "'" and self.matcher.lexerClass is not None:
+            ttype = self.lexLiteral(name)
+        if ttype is None:
+            self.pos = start
+            self.error("unknown token " + name)
+        return ttype
+
+    # The type of the single token the lexer makes of a literal, if any.
+    def lexLiteral(self, literal:str):
+        from antlr4.InputStream import InputStream
+        text = re.sub(r"\\(.)", r"\1", literal[1:-1])
+        lexer = self.matcher.lexerClass(InputStream(text))
+        lexer.removeErrorListeners()
+        token = lexer.nextToken()
+        if token.text != text or lexer.nextToken().type != Token.EOF:
+            return None
+        self.matcher.tokenTypes[literal] = token.type
+        return token.type
+
+    def parseRegex(self):
+        self.pos += 1
+        start = self.pos
+        while self.pos < len(self.pattern) and self.pattern[self.pos] != '/':
+            self.pos += 2 if self.pattern[self.pos] == '\\' else 1
+        if self.pos >= len(self.pattern):
+            self.error("unterminated regex")
+        text = self.pattern[start:self.pos].replace("\\/", "/")
+        self.pos += 1
+        try:
+            return re.compile(text)
+        except re.error as e:
+            self.pos = start
+            self.error("bad regex " + text + " (" + str(e) + ")")
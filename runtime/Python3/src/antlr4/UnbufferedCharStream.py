@@ -0,0 +1,171 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# Do not buffer up the entire char stream. It does keep a small buffer
+# for efficiency and also buffers while a mark exists (set by the lexer for
+# the text of the current token). "Unbuffered" here refers to fact that it
+# doesn't buffer all data, not that's it's on demand loading of char.
+#
+# <p>Characters are read in chunks of {@code bufferSize} from any file-like
+# object. If {@code read} returns bytes, they are decoded with
+# {@code encoding}.</p>
+#
+# <p>Text before the oldest outstanding mark is discarded, so tokens can't
+# get their text from the stream once they have been emitted. Have the lexer
+# copy it instead:</p>
+#
+# <pre>
+# lexer = MyLexer(UnbufferedCharStream(sys.stdin))
+# lexer._factory = CommonTokenFactory(copyText=True)
+# </pre>
+#
+import codecs
+from antlr4.Token import Token
+from antlr4.error.Errors import IllegalStateException, UnsupportedOperationException
+
+
+class UnbufferedCharStream(object):
+    __slots__ = ('name', 'input', 'bufferSize', 'decoder', 'data', 'p', 'bufferStart',
+                 'numMarkers', 'lastCharBufferStart', 'eof')
+
+    def __init__(self, input, bufferSize:int=256, encoding:str='utf-8', errors:str='strict'):
+        self.name = getattr(input, "name", "<unknown>")
+        self.input = input
+        self.bufferSize = bufferSize
+        # only used if {@code input} returns bytes
+        self.decoder = codecs.getincrementaldecoder(encoding)(errors)
+        # A moving window buffer of the data being scanned. While there's a
+        # marker, we keep adding to the buffer. Otherwise, consumed
+        # characters are dropped from the front.
+        self.data = []
+        # 0..len(data) index into {@link #data} of the next character.
+        self.p = 0
+        # Absolute character index of {@code data[0]}.
+        self.bufferStart = 0
+        # Count up with {@link #mark} and down with {@link #release}. When we
+        # {@code release()} the last mark, {@code numMarkers} reaches 0 and
+        # consumed characters can be dropped.
+        self.numMarkers = 0
+        # the {@code LA(-1)} character for {@code data[0]}
+        self.lastCharBufferStart = Token.EOF
+        # true once {@code input} is exhausted
+        self.eof = False
+
+    @property
+    def index(self):
+        return self.bufferStart + self.p
+
+    @property
+    def size(self):
+        raise UnsupportedOperationException("Unbuffered stream cannot know its size")
+
+    def reset(self):
+        self.seek(0)
+
+    def consume(self):
+        if self.LA(1) == Token.EOF:
+            raise IllegalStateException("cannot consume EOF")
+        self.p += 1
+        if self.numMarkers == 0:
+            self.discard()
+
+    # Make sure we have {@code want} characters from the current position
+    # {@link #p}, unless the input ends before that.
+    def sync(self, want:int):
+        while self.p + want > len(self.data) and not self.eof:
+            self.fill()
+
+    # Add the next chunk of the input to the buffer.
+    def fill(self):
+        chunk = self.input.read(self.bufferSize)
+        final = len(chunk) == 0
+        if isinstance(chunk, (bytes, bytearray)):
+            chunk = self.decoder.decode(chunk, final)
+        self.data.extend(map(ord, chunk))
+        self.eof = final
+
+    # Drop consumed characters from the buffer. This is done once they make
+    # up half the buffer, which keeps the cost per character constant.
+    def discard(self):
+        p = self.p
+        if p > 0 and p * 2 >= len(self.data):
+            self.lastCharBufferStart = self.data[p-1]
+            del self.data[:p]
+            self.bufferStart += p
+            self.p = 0
+
+    def LA(self, offset:int):
+        if offset == 0:
+            return 0 # undefined
+        if offset < 0:
+            offset += 1 # e.g., translate LA(-1) to use offset=0
+            pos = self.p + offset - 1
+            if pos == -1:
+                return self.lastCharBufferStart
+            if pos < 0:
+                raise IndexError("LA(" + str(offset - 1) + ") is outside the buffer")
+            return self.data[pos]
+        self.sync(offset)
+        pos = self.p + offset - 1
+        if pos >= len(self.data):
+            return Token.EOF
+        return self.data[pos]
+
+    def LT(self, offset:int):
+        return self.LA(offset)
+
+    # Return a marker that we can release later.
+    #
+    # <p>The specific marker value used for this class allows for some level of
+    # protection against misuse where {@code seek()} is called on a mark or
+    # {@code release()} is called in the wrong order.</p>
+    def mark(self):
+        mark = -self.numMarkers - 1
+        self.numMarkers += 1
+        return mark
+
+    # Decrement number of markers, dropping consumed characters once we hit 0.
+    def release(self, marker:int):
+        expectedMark = -self.numMarkers
+        if marker != expectedMark:
+            raise IllegalStateException("release() called with an invalid marker.")
+        self.numMarkers -= 1
+        if self.numMarkers == 0:
+            self.discard()
+
+    # Seek to absolute character index, which might not be in the current
+    # sliding window. Move {@code p} to {@code index-bufferStart}.
+    def seek(self, index:int):
+        if index == self.index:
+            return
+        if index > self.index:
+            self.sync(index - self.index)
+            index = min(index, self.bufferStart + len(self.data))
+        i = index - self.bufferStart
+        if i < 0:
+            if index < 0:
+                raise ValueError("cannot seek to negative index " + str(index))
+            raise UnsupportedOperationException("seek to index outside buffer: " + str(index) + " not in " +
+                                                str(self.bufferStart) + ".." + str(self.bufferStart + len(self.data)))
+        self.p = i
+
+    def getText(self, start:int, stop:int):
+        end = self.bufferStart + len(self.data)
+        if stop >= end:
+            self.sync(stop - self.index + 1)
+            end = self.bufferStart + len(self.data)
+            stop = min(stop, end - 1)
+        if start > stop:
+            return ""
+        if start < self.bufferStart:
+            raise UnsupportedOperationException("interval " + str(start) + ".." + str(stop) + " outside buffer: " +
+                                                str(self.bufferStart) + ".." + str(end - 1))
+        i = start - self.bufferStart
+        return "".join(map(chr, self.data[i:i + stop - start + 1]))
+
+    def __str__(self):
+        return self.getText(self.bufferStart, self.bufferStart + len(self.data) - 1)
@@ -0,0 +1,182 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# A token stream that only keeps the tokens it may still need.
+#
+# <p>Unlike {@link BufferedTokenStream}, which keeps every token it fetched,
+# this stream buffers tokens only while a mark exists (set by the lookahead
+# prediction in the parser). Once the last mark is released, consumed tokens
+# are dropped, so memory use depends on the lookahead the grammar needs, not
+# on the length of the input.</p>
+#
+# <p>Tokens are not filtered by channel; the parser sees every token the
+# token source emits. {@link #get} and {@link #getText} only work on tokens
+# that are still buffered.</p>
+#
+from io import StringIO
+from antlr4.BufferedTokenStream import TokenStream
+from antlr4.Lexer import Lexer
+from antlr4.Token import Token
+from antlr4.error.Errors import IllegalStateException, UnsupportedOperationException
+
+
+class UnbufferedTokenStream(TokenStream):
+    __slots__ = ('tokenSource', 'tokens', 'p', 'bufferStart', 'numMarkers', 'lastTokenBufferStart')
+
+    def __init__(self, tokenSource:Lexer):
+        self.tokenSource = tokenSource
+        # A moving window buffer of the tokens being scanned. While there's a
+        # marker, we keep adding to the buffer. Otherwise, consumed tokens are
+        # dropped from the front.
+        self.tokens = []
+        # 0..len(tokens) index into {@link #tokens} of the next token. The
+        # {@code LT(1)} token is {@code tokens[p]}.
+        self.p = 0
+        # Absolute token index of {@code tokens[0]}.
+        self.bufferStart = 0
+        # Count up with {@link #mark} and down with {@link #release}. When we
+        # {@code release()} the last mark, {@code numMarkers} reaches 0 and
+        # consumed tokens can be dropped.
+        self.numMarkers = 0
+        # the {@code LT(-1)} token for {@code tokens[0]}
+        self.lastTokenBufferStart = None
+
+    @property
+    def index(self):
+        return self.bufferStart + self.p
+
+    @property
+    def size(self):
+        raise UnsupportedOperationException("Unbuffered stream cannot know its size")
+
+    def reset(self):
+        self.seek(0)
+
+    def get(self, index:int):
+        i = index - self.bufferStart
+        if i < 0 or i >= len(self.tokens):
+            raise IndexError("get(" + str(index) + ") outside buffer: " +
+                             str(self.bufferStart) + ".." + str(self.bufferStart + len(self.tokens)))
+        return self.tokens[i]
+
+    def LT(self, k:int):
+        if k == 0:
+            return None
+        if k < 0:
+            pos = self.p + k
+            if pos == -1:
+                return self.lastTokenBufferStart
+            if pos < 0:
+                raise IndexError("LT(" + str(k) + ") is outside the buffer")
+            return self.tokens[pos]
+        self.sync(k)
+        pos = self.p + k - 1
+        if pos >= len(self.tokens):
+            # EOF must be last token
+            return self.tokens[-1]
+        return self.tokens[pos]
+
+    def LA(self, k:int):
+        return self.LT(k).type
+
+    def consume(self):
+        if self.LA(1) == Token.EOF:
+            raise IllegalStateException("cannot consume EOF")
+        self.p += 1
+        if self.numMarkers == 0:
+            self.discard()
+
+    # Make sure we have {@code want} tokens from the current position
+    # {@link #p}, unless EOF comes before that.
+    def sync(self, want:int):
+        n = self.p + want - len(self.tokens) # how many more elements we need?
+        if n > 0:
+            self.fill(n)
+
+    # Add {@code n} tokens to the buffer.
+    #
+    # @return The actual number of tokens added to the buffer.
+    def fill(self, n:int):
+        tokens = self.tokens
+        for i in range(0, n):
+            if len(tokens) > 0 and tokens[-1].type == Token.EOF:
+                return i
+            t = self.tokenSource.nextToken()
+            t.tokenIndex = self.bufferStart + len(tokens)
+            tokens.append(t)
+        return n
+
+    # Drop consumed tokens from the buffer. This is done once they make up
+    # half the buffer, which keeps the cost per token constant.
+    def discard(self):
+        p = self.p
+        if p > 0 and p * 2 >= len(self.tokens):
+            self.lastTokenBufferStart = self.tokens[p-1]
+            del self.tokens[:p]
+            self.bufferStart += p
+            self.p = 0
+
+    # Return a marker that we can release later.
+    #
+    # <p>The specific marker value used for this class allows for some level of
+    # protection against misuse where {@code seek()} is called on a mark or
+    # {@code release()} is called in the wrong order.</p>
+    def mark(self):
+        mark = -self.numMarkers - 1
+        self.numMarkers += 1
+        return mark
+
+    # Decrement number of markers, dropping consumed tokens once we hit 0.
+    def release(self, marker:int):
+        expectedMark = -self.numMarkers
+        if marker != expectedMark:
+            raise IllegalStateException("release() called with an invalid marker.")
+        self.numMarkers -= 1
+        if self.numMarkers == 0:
+            self.discard()
+
+    # Seek to absolute token index, which might not be in the current
+    # sliding window. Move {@code p} to {@code index-bufferStart}.
+    def seek(self, index:int):
+        if index == self.index:
+            return
+        if index > self.index:
+            self.sync(index - self.index + 1)
+            index = min(index, self.bufferStart + len(self.tokens) - 1)
+        i = index - self.bufferStart
+        if i < 0:
+            if index < 0:
+                raise ValueError("cannot seek to negative index " + str(index))
+            raise UnsupportedOperationException("seek to index outside buffer: " + str(index) + " not in " +
+                                                str(self.bufferStart) + ".." + str(self.bufferStart + len(self.tokens)))
+        self.p = i
+
+    def getTokenSource(self):
+        return self.tokenSource
+
+    def getSourceName(self):
+        return self.tokenSource.getSourceName()
+
+    # Get the text of the buffered tokens from start..stop inclusively.
+    def getText(self, start:int=None, stop:int=None):
+        if start is None and stop is None:
+            return ""
+        if isinstance(start, Token):
+            start = start.tokenIndex
+        if isinstance(stop, Token):
+            stop = stop.tokenIndex
+        end = self.bufferStart + len(self.tokens) - 1
+        if start < self.bufferStart or stop > end:
+            raise UnsupportedOperationException("interval " + str(start) + ".." + str(stop) +
+                                                " not in token buffer window: " + str(self.bufferStart) + ".." + str(end))
+        with StringIO() as buf:
+            for i in range(start - self.bufferStart, stop - self.bufferStart + 1):
+                t = self.tokens[i]
+                if t.type==Token.EOF:
+                    break
+                buf.write(t.text)
+            return buf.getvalue()
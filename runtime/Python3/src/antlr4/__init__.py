@@ -1,9 +1,13 @@
 from antlr4.Token import Token
 from antlr4.InputStream import InputStream
 from antlr4.FileStream import FileStream
+from antlr4.MappedFileStream import MappedFileStream
 from antlr4.StdinStream import StdinStream
+from antlr4.UnbufferedCharStream import UnbufferedCharStream
 from antlr4.BufferedTokenStream import TokenStream
 from antlr4.CommonTokenStream import CommonTokenStream
+from antlr4.CompactTokenStream import CompactTokenStream
+from antlr4.UnbufferedTokenStream import UnbufferedTokenStream
 from antlr4.Lexer import Lexer
 from antlr4.Parser import Parser
 from antlr4.dfa.DFA import DFA
@@ -14,7 +18,7 @@ from antlr4.atn.ParserATNSimulator import ParserATNSimulator
 from antlr4.atn.PredictionMode import PredictionMode
 from antlr4.PredictionContext import PredictionContextCache
 from antlr4.ParserRuleContext import RuleContext, ParserRuleContext
-from antlr4.tree.Tree import ParseTreeListener, ParseTreeVisitor, ParseTreeWalker, TerminalNode, ErrorNode, RuleNode
+from antlr4.tree.Tree import ParseTreeListener, ParseTreeVisitor, IterativeParseTreeVisitor, ParseTreeWalker, IterativeParseTreeWalker, TerminalNode, ErrorNode, RuleNode
 from antlr4.error.Errors import RecognitionException, IllegalStateException, NoViableAltException
 from antlr4.error.ErrorStrategy import BailErrorStrategy
 from antlr4.error.DiagnosticErrorListener import DiagnosticErrorListener
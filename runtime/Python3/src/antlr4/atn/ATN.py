@@ -15,7 +15,7 @@ class ATN(object):
     __slots__ = (
         'grammarType', 'maxTokenType', 'states', 'decisionToState',
         'ruleToStartState', 'ruleToStopState', 'modeNameToStartState',
-        'ruleToTokenType', 'lexerActions', 'modeToStartState'
+        'ruleToTokenType', 'lexerActions', 'modeToStartState', 'lazyEdges'
     )
 
     INVALID_ALT_NUMBER = 0
@@ -46,6 +46,9 @@ class ATN(object):
         # be referenced by action transitions in the ATN.
         self.lexerActions = None
         self.modeToStartState = []
+        # For ATNs deserialized with {@link ATNDeserializationOptions#lazy}, the
+        # loader of the transitions of rules that were not used yet.
+        self.lazyEdges = None
 
     # Compute the set of valid tokens that can occur starting in state {@code s}.
     #  If {@code ctx} is null, the set of tokens will not include what can follow
@@ -72,6 +75,12 @@ class ATN(object):
         else:
             return self.nextTokensInContext(s, ctx)
 
+    # Build the transitions of all rules that have not been used yet. Does
+    # nothing unless the ATN was deserialized lazily.
+    def materialize(self):
+        if self.lazyEdges is not None:
+            self.lazyEdges.loadAll()
+
     def addState(self, state:ATNState):
         if state is not None:
             state.atn = self
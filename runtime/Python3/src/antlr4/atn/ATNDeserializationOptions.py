@@ -6,7 +6,7 @@
 ATNDeserializationOptions = None
 
 class ATNDeserializationOptions(object):
-    __slots__ = ('readonly', 'verifyATN', 'generateRuleBypassTransitions')
+    __slots__ = ('readonly', 'verifyATN', 'generateRuleBypassTransitions', 'lazy')
 
     defaultOptions = None
 
@@ -14,6 +14,10 @@ class ATNDeserializationOptions(object):
         self.readonly = False
         self.verifyATN = True if copyFrom is None else copyFrom.verifyATN
         self.generateRuleBypassTransitions = False if copyFrom is None else copyFrom.generateRuleBypassTransitions
+        # Build the transitions of a rule only when the rule is first used.
+        # Generated recognizers deserialize with {@link #defaultOptions}; replace
+        # it with lazy options before importing them to enable this for them.
+        self.lazy = False if copyFrom is None else copyFrom.lazy
 
     def __setattr__(self, key, value):
         if key!="readonly" and self.readonly:
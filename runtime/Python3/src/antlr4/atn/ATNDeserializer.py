@@ -2,6 +2,7 @@
 # Use of this file is governed by the BSD 3-clause license that
 # can be found in the LICENSE.txt file in the project root.
 #/
+import threading
 from io import StringIO
 from typing import Callable
 from antlr4.Token import Token
@@ -17,12 +18,30 @@ SERIALIZED_VERSION = 4
 class ATNDeserializer (object):
     __slots__ = ('deserializationOptions', 'data', 'pos')
 
+    # The {@link ATNSnapshot} directory consulted before deserializing, if any.
+    # See {@link ATNSnapshot#install}.
+    snapshots = None
+
     def __init__(self, options : ATNDeserializationOptions = None):
         if options is None:
             options = ATNDeserializationOptions.defaultOptions
         self.deserializationOptions = options
 
     def deserialize(self, data : [int]):
+        snapshots = ATNDeserializer.snapshots
+        if snapshots is not None and not self.deserializationOptions.generateRuleBypassTransitions:
+            atn = snapshots.load(data)
+            if atn is None:
+                atn = self.deserializeATN(data)
+                if snapshots.writable:
+                    try:
+                        snapshots.save(atn, data)
+                    except OSError:
+                        pass # the snapshot is only a cache
+            return atn
+        return self.deserializeATN(data)
+
+    def deserializeATN(self, data : [int]):
         self.data = data
         self.pos = 0
         self.checkVersion()
@@ -32,13 +51,26 @@ class ATNDeserializer (object):
         self.readModes(atn)
         sets = []
         self.readSets(atn, sets)
-        self.readEdges(atn, sets)
+        generateRuleBypassTransitions = self.deserializationOptions.generateRuleBypassTransitions \
+                and atn.grammarType == ATNType.PARSER
+        # bypass transitions rewrite every rule, so they need the whole ATN
+        lazy = self.deserializationOptions.lazy and not generateRuleBypassTransitions
+        if lazy:
+            self.readEdgesLazily(atn, sets)
+        else:
+            self.readEdges(atn, sets)
         self.readDecisions(atn)
         self.readLexerActions(atn)
+        if lazy:
+            # precedence decisions are recognized by their transitions
+            for ruleIndex, startState in enumerate(atn.ruleToStartState):
+                if startState.isPrecedenceRule:
+                    atn.lazyEdges.load(ruleIndex)
         self.markPrecedenceDecisions(atn)
-        self.verifyATN(atn)
-        if self.deserializationOptions.generateRuleBypassTransitions \
-                and atn.grammarType == ATNType.PARSER:
+        if not lazy:
+            # lazy ATNs verify each rule as it is loaded
+            self.verifyATN(atn)
+        if generateRuleBypassTransitions:
             self.generateRuleBypassTransitions(atn)
             # re-verify after modification
             self.verifyATN(atn)
@@ -181,6 +213,85 @@ class ATNDeserializer (object):
                     if isinstance(target, StarLoopEntryState):
                         target.loopBackState = state
 
+    #
+    # Like {@link #readEdges}, but only records where the edges of each rule
+    # are. Transitions are created by {@link LazyEdges} the first time any
+    # state of the rule is asked for its transitions. Everything else
+    # {@link #readEdges} derives from the edges is computed right away, as it
+    # does not need transition objects.
+    #
+    def readEdgesLazily(self, atn:ATN, sets:list):
+        nedges = self.readInt()
+        start = self.pos
+        self.pos += 6 * nedges
+        data = self.data
+        states = atn.states
+        lazyEdges = LazyEdges(self, atn, sets)
+        ruleEdges = lazyEdges.ruleEdges
+        follows = lazyEdges.follows
+        counts = [0] * len(states)
+        for p in range(start, self.pos, 6):
+            src = data[p]
+            trg = data[p+1]
+            ttype = data[p+2]
+            srcState = states[src]
+            positions = ruleEdges.get(srcState.ruleIndex, None)
+            if positions is None:
+                positions = []
+                ruleEdges[srcState.ruleIndex] = positions
+            positions.append(p)
+            # same as ATNState.addTransition
+            isEpsilon = ttype in self.epsilonTransitionTypes
+            if counts[src]==0:
+                srcState.epsilonOnlyTransitions = isEpsilon
+            elif srcState.epsilonOnlyTransitions != isEpsilon:
+                srcState.epsilonOnlyTransitions = False
+            counts[src] += 1
+            if ttype == Transition.RULE:
+                # edges for rule stop states can be derived, so they aren't serialized
+                ruleIndex = states[data[p+3]].ruleIndex
+                outermostPrecedenceReturn = -1
+                if atn.ruleToStartState[ruleIndex].isPrecedenceRule:
+                    if data[p+5] == 0:
+                        outermostPrecedenceReturn = ruleIndex
+                ruleFollows = follows.get(ruleIndex, None)
+                if ruleFollows is None:
+                    ruleFollows = []
+                    follows[ruleIndex] = ruleFollows
+                ruleFollows.append((src, trg, outermostPrecedenceReturn))
+            target = states[trg]
+            if srcState.stateType == ATNState.PLUS_LOOP_BACK:
+                if target.stateType == ATNState.PLUS_BLOCK_START:
+                    target.loopBackState = srcState
+            elif srcState.stateType == ATNState.STAR_LOOP_BACK:
+                if target.stateType == ATNState.STAR_LOOP_ENTRY:
+                    target.loopBackState = srcState
+
+        for ruleIndex in follows:
+            stopState = atn.ruleToStopState[ruleIndex]
+            if counts[stopState.stateNumber]==0:
+                stopState.epsilonOnlyTransitions = True
+
+        ruleStates = lazyEdges.ruleStates
+        for state in states:
+            if state is None:
+                continue
+            state.transitions = LazyTransitions(lazyEdges, state)
+            rule = ruleStates.get(state.ruleIndex, None)
+            if rule is None:
+                rule = []
+                ruleStates[state.ruleIndex] = rule
+            rule.append(state)
+            if isinstance(state, BlockStartState):
+                # we need to know the end state to set its start state
+                if state.endState is None:
+                    raise Exception("IllegalState")
+                # block end states can only be associated to a single block start state
+                if state.endState.startState is not None:
+                    raise Exception("IllegalState")
+                state.endState.startState = state
+        atn.lazyEdges = lazyEdges
+
     def readDecisions(self, atn:ATN):
         ndecisions = self.readInt()
         for i in range(0, ndecisions):
@@ -315,45 +426,47 @@ class ATNDeserializer (object):
         for state in atn.states:
             if state is None:
                 continue
+            self.verifyState(state)
 
-            self.checkCondition(state.epsilonOnlyTransitions or len(state.transitions) <= 1)
+    def verifyState(self, state:ATNState):
+        self.checkCondition(state.epsilonOnlyTransitions or len(state.transitions) <= 1)
 
-            if isinstance(state, PlusBlockStartState):
-                self.checkCondition(state.loopBackState is not None)
+        if isinstance(state, PlusBlockStartState):
+            self.checkCondition(state.loopBackState is not None)
 
-            if isinstance(state, StarLoopEntryState):
-                self.checkCondition(state.loopBackState is not None)
-                self.checkCondition(len(state.transitions) == 2)
+        if isinstance(state, StarLoopEntryState):
+            self.checkCondition(state.loopBackState is not None)
+            self.checkCondition(len(state.transitions) == 2)
 
-                if isinstance(state.transitions[0].target, StarBlockStartState):
-                    self.checkCondition(isinstance(state.transitions[1].target, LoopEndState))
-                    self.checkCondition(not state.nonGreedy)
-                elif isinstance(state.transitions[0].target, LoopEndState):
-                    self.checkCondition(isinstance(state.transitions[1].target, StarBlockStartState))
-                    self.checkCondition(state.nonGreedy)
-                else:
-                    raise Exception("IllegalState")
+            if isinstance(state.transitions[0].target, StarBlockStartState):
+                self.checkCondition(isinstance(state.transitions[1].target, LoopEndState))
+                self.checkCondition(not state.nonGreedy)
+            elif isinstance(state.transitions[0].target, LoopEndState):
+                self.checkCondition(isinstance(state.transitions[1].target, StarBlockStartState))
+                self.checkCondition(state.nonGreedy)
+            else:
+                raise Exception("IllegalState")
 
-            if isinstance(state, StarLoopbackState):
-                self.checkCondition(len(state.transitions) == 1)
-                self.checkCondition(isinstance(state.transitions[0].target, StarLoopEntryState))
+        if isinstance(state, StarLoopbackState):
+            self.checkCondition(len(state.transitions) == 1)
+            self.checkCondition(isinstance(state.transitions[0].target, StarLoopEntryState))
 
-            if isinstance(state, LoopEndState):
-                self.checkCondition(state.loopBackState is not None)
+        if isinstance(state, LoopEndState):
+            self.checkCondition(state.loopBackState is not None)
 
-            if isinstance(state, RuleStartState):
-                self.checkCondition(state.stopState is not None)
+        if isinstance(state, RuleStartState):
+            self.checkCondition(state.stopState is not None)
 
-            if isinstance(state, BlockStartState):
-                self.checkCondition(state.endState is not None)
+        if isinstance(state, BlockStartState):
+            self.checkCondition(state.endState is not None)
 
-            if isinstance(state, BlockEndState):
-                self.checkCondition(state.startState is not None)
+        if isinstance(state, BlockEndState):
+            self.checkCondition(state.startState is not None)
 
-            if isinstance(state, DecisionState):
-                self.checkCondition(len(state.transitions) <= 1 or state.decision >= 0)
-            else:
-                self.checkCondition(len(state.transitions) <= 1 or isinstance(state, RuleStopState))
+        if isinstance(state, DecisionState):
+            self.checkCondition(len(state.transitions) <= 1 or state.decision >= 0)
+        else:
+            self.checkCondition(len(state.transitions) <= 1 or isinstance(state, RuleStopState))
 
     def checkCondition(self, condition:bool, message=None):
         if not condition:
@@ -366,6 +479,9 @@ class ATNDeserializer (object):
         self.pos += 1
         return i
 
+    epsilonTransitionTypes = frozenset([ Transition.EPSILON, Transition.RULE, Transition.PREDICATE,
+                                         Transition.ACTION, Transition.PRECEDENCE ])
+
     edgeFactories = [ lambda args : None,
                       lambda atn, src, trg, arg1, arg2, arg3, sets, target : EpsilonTransition(target),
                       lambda atn, src, trg, arg1, arg2, arg3, sets, target : \
@@ -444,3 +560,125 @@ class ATNDeserializer (object):
             raise Exception("The specified lexer action type " + str(type) + " is not valid.")
         else:
             return self.actionFactories[type](data1, data2)
+
+
+#
+# The transitions of a lazily deserialized ATN that have not been built yet,
+# grouped by the rule of their source state. See
+# {@link ATNDeserializationOptions#lazy}.
+#
+class LazyEdges(object):
+    __slots__ = ('deserializer', 'atn', 'sets', 'ruleEdges', 'ruleStates', 'follows', 'lock')
+
+    def __init__(self, deserializer:ATNDeserializer, atn:ATN, sets:list):
+        self.deserializer = deserializer
+        self.atn = atn
+        self.sets = sets
+        # rule index -> positions of the serialized edges leaving its states
+        self.ruleEdges = dict()
+        # rule index -> states of the rule whose transitions are not built yet
+        self.ruleStates = dict()
+        # rule index -> (source, follow state, outermost precedence return)
+        # of every rule transition to it; these make the rule stop state edges
+        self.follows = dict()
+        # Parsers in other threads must wait for a rule that is being built;
+        # reentrant because verifying a state may load the next rule.
+        self.lock = threading.RLock()
+
+    def load(self, ruleIndex:int):
+        with self.lock:
+            self.loadRule(ruleIndex)
+
+    def loadRule(self, ruleIndex:int):
+        states = self.ruleStates.pop(ruleIndex, None)
+        if states is None:
+            return
+        deserializer = self.deserializer
+        data = deserializer.data
+        atn = self.atn
+        transitions = { state.stateNumber:[] for state in states }
+        for p in self.ruleEdges.pop(ruleIndex, ()):
+            trans = deserializer.edgeFactory(atn, data[p+2], data[p], data[p+1], data[p+3], data[p+4], data[p+5], self.sets)
+            transitions[data[p]].append(trans)
+        follows = self.follows.pop(ruleIndex, None)
+        if follows is not None:
+            # in the order readEdges would have added them
+            follows.sort(key=lambda follow: follow[0])
+            stopTransitions = transitions[atn.ruleToStopState[ruleIndex].stateNumber]
+            for src, followState, outermostPrecedenceReturn in follows:
+                stopTransitions.append(EpsilonTransition(atn.states[followState], outermostPrecedenceReturn))
+        for state in states:
+            state.transitions = transitions[state.stateNumber]
+        if deserializer.deserializationOptions.verifyATN:
+            for state in states:
+                deserializer.verifyState(state)
+        if len(self.ruleStates)==0:
+            atn.lazyEdges = None
+
+    def loadAll(self):
+        with self.lock:
+            for ruleIndex in list(self.ruleStates.keys()):
+                self.loadRule(ruleIndex)
+
+
+#
+# Stands in for the transition list of a state until the transitions of its
+# rule are built.
+#
+class LazyTransitions(list):
+    __slots__ = ('lazyEdges', 'state')
+
+    def __init__(self, lazyEdges:LazyEdges, state:ATNState):
+        super().__init__()
+        self.lazyEdges = lazyEdges
+        self.state = state
+
+    def load(self):
+        if self.state.transitions is self:
+            self.lazyEdges.load(self.state.ruleIndex)
+        return self.state.transitions
+
+    def __len__(self):
+        return len(self.load())
+
+    def __getitem__(self, index):
+        return self.load()[index]
+
+    def __setitem__(self, index, value):
+        self.load()[index] = value
+
+    def __delitem__(self, index):
+        del self.load()[index]
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __reversed__(self):
+        return reversed(self.load())
+
+    def __contains__(self, item):
+        return item in self.load()
+
+    def __eq__(self, other):
+        return self.load() == other
+
+    def __ne__(self, other):
+        return self.load() != other
+
+    def __str__(self):
+        return str(self.load())
+
+    def __repr__(self):
+        return repr(self.load())
+
+    def append(self, item):
+        self.load().append(item)
+
+    def insert(self, index, item):
+        self.load().insert(index, item)
+
+    def pop(self, index=-1):
+        return self.load().pop(index)
+
+    def index(self, item, *args):
+        return self.load().index(item, *args)
@@ -10,7 +10,7 @@ from antlr4.dfa.DFAState import DFAState
 
 
 class ATNSimulator(object):
-    __slots__ = ('atn', 'sharedContextCache', '__dict__')
+    __slots__ = ('atn', 'sharedContextCache', 'dfaBudget', '__dict__')
 
     # Must distinguish between missing edge and edge we know leads nowhere#/
     ERROR = DFAState(configs=ATNConfigSet())
@@ -39,6 +39,19 @@ class ATNSimulator(object):
     def __init__(self, atn:ATN, sharedContextCache:PredictionContextCache):
         self.atn = atn
         self.sharedContextCache = sharedContextCache
+        # The {@link DFABudget} that limits the size of the DFA, if any.
+        self.dfaBudget = None
+
+    # Clear the DFA cache used by the current instance. Since the DFA cache may
+    # be shared by multiple ATN simulators, this method may affect the
+    # performance (but not accuracy) of other parsers which are being used
+    # concurrently.
+    #
+    # @throws UnsupportedOperationException if the current instance does not
+    # support clearing the DFA.
+    def clearDFA(self):
+        from antlr4.error.Errors import UnsupportedOperationException
+        raise UnsupportedOperationException("This ATN simulator does not support clearing the DFA.")
 
     def getCachedContext(self, context:PredictionContext):
         if self.sharedContextCache is None:
@@ -0,0 +1,184 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# A binary snapshot of a fully built {@link ATN} that can be loaded without
+# running the {@link ATNDeserializer}.
+#
+# <p>Generated recognizers deserialize their ATN when the module is imported.
+# For large grammars that dominates import time. Snapshots live in a directory
+# and are named after a digest of the serialized ATN they were built from, so
+# a snapshot is only ever used for the exact grammar it was produced for.</p>
+#
+# <p>Produce snapshots ahead of time with:</p>
+#
+# <pre>
+# python -m antlr4.atn.ATNSnapshot -o snapshots MyLexer.py MyParser.py
+# </pre>
+#
+# <p>and install the directory before the generated modules are imported:</p>
+#
+# <pre>
+# from antlr4.atn.ATNSnapshot import ATNSnapshot
+# ATNSnapshot.install("snapshots")
+# from MyParser import MyParser
+# </pre>
+#
+# <p>ATNs deserialized with rule bypass transitions are never taken from or
+# written to the snapshot directory. Snapshots are pickles;
+# only install a directory you trust.</p>
+#
+import copyreg
+import hashlib
+import os
+import pickle
+import sys
+from array import array
+
+from antlr4.atn.ATN import ATN
+from antlr4.atn.ATNDeserializer import ATNDeserializer
+from antlr4.atn.ATNState import ATNState
+from antlr4.atn.LexerAction import LexerAction, LexerSkipAction, LexerMoreAction, LexerPopModeAction
+
+
+class ATNSnapshot(object):
+    __slots__ = ('directory', 'writable')
+
+    MAGIC = b"ANTLRATN"
+    # bump whenever the layout of ATN, ATNState or Transition changes
+    VERSION = 2
+
+    def __init__(self, directory:str, writable:bool=False):
+        self.directory = directory
+        # if true, ATNs that had to be deserialized are saved for next time
+        self.writable = writable
+
+    # Make {@link ATNDeserializer#deserialize} look up snapshots in
+    # {@code directory} before deserializing.
+    @staticmethod
+    def install(directory:str, writable:bool=False):
+        ATNDeserializer.snapshots = ATNSnapshot(directory, writable)
+
+    @staticmethod
+    def uninstall():
+        ATNDeserializer.snapshots = None
+
+    @staticmethod
+    def fingerprint(serializedATN:list):
+        digest = hashlib.sha1(array('i', serializedATN).tobytes())
+        digest.update(str(ATNSnapshot.VERSION).encode())
+        return digest.hexdigest()
+
+    def fileNameFor(self, serializedATN:list):
+        return os.path.join(self.directory, self.fingerprint(serializedATN) + ".atn")
+
+    # @return the snapshot of the ATN for {@code serializedATN}, or {@code None}
+    # if there is no usable snapshot.
+    def load(self, serializedATN:list):
+        try:
+            with open(self.fileNameFor(serializedATN), "rb") as file:
+                return self.read(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+            return None
+
+    def save(self, atn:ATN, serializedATN:list):
+        fileName = self.fileNameFor(serializedATN)
+        tmpName = fileName + "." + str(os.getpid()) + ".tmp"
+        os.makedirs(self.directory, exist_ok=True)
+        with open(tmpName, "wb") as file:
+            self.write(atn, file)
+        os.replace(tmpName, fileName)
+
+    @staticmethod
+    def write(atn:ATN, file):
+        atn.materialize()
+        file.write(ATNSnapshot.MAGIC)
+        pickler = pickle.Pickler(file, pickle.HIGHEST_PROTOCOL)
+        # Pickling the graph as is would recurse along every path through the
+        # ATN. Instead every state is first written empty, then filled in;
+        # by then all transition targets are already in the memo.
+        dispatch = { cls:_reduceEmptyState for cls in { type(s) for s in atn.states if s is not None } }
+        dispatch[_StateFields] = _StateFields.reduce
+        for cls in (LexerSkipAction, LexerMoreAction, LexerPopModeAction):
+            dispatch[cls] = _reduceSingleton
+        pickler.dispatch_table = dispatch
+        fields = [ None if s is None else _StateFields(s) for s in atn.states ]
+        pickler.dump((atn.states, fields, atn))
+
+    @staticmethod
+    def read(file):
+        if file.read(len(ATNSnapshot.MAGIC)) != ATNSnapshot.MAGIC:
+            raise pickle.UnpicklingError("not an ATN snapshot")
+        states, fields, atn = pickle.load(file)
+        return atn
+
+
+def _reduceEmptyState(state:ATNState):
+    return copyreg.__newobj__, (type(state),)
+
+def _reduceSingleton(action:LexerAction):
+    return type(action).__qualname__ + ".INSTANCE"
+
+def _fill(state:ATNState):
+    return state
+
+# Placeholder for the slot values of a state. It is unpickled as the state
+# itself, with the slot values applied to it.
+class _StateFields(object):
+    __slots__ = 'state'
+
+    def __init__(self, state:ATNState):
+        self.state = state
+
+    def reduce(self):
+        s = self.state
+        return _fill, (s,), (None, { slot:getattr(s, slot) for slot in _slotsOf(type(s)) if hasattr(s, slot) })
+
+
+_slotCache = dict()
+
+# All slots of an ATN state class.
+def _slotsOf(cls):
+    slots = _slotCache.get(cls, None)
+    if slots is None:
+        slots = []
+        for c in reversed(cls.__mro__):
+            names = c.__dict__.get('__slots__', ())
+            if isinstance(names, str):
+                names = (names,)
+            slots.extend(names)
+        slots = tuple(slots)
+        _slotCache[cls] = slots
+    return slots
+
+
+def main(argv:list=None):
+    import argparse
+    import importlib.util
+    parser = argparse.ArgumentParser(prog="python -m antlr4.atn.ATNSnapshot",
+                                     description="Write ATN snapshots for generated recognizers.")
+    parser.add_argument("-o", "--output", default=".", help="snapshot directory")
+    parser.add_argument("modules", nargs="+", help="generated lexer or parser .py files")
+    args = parser.parse_args(argv)
+    snapshots = ATNSnapshot(args.output)
+    for path in args.modules:
+        path = os.path.abspath(path)
+        name = os.path.splitext(os.path.basename(path))[0]
+        sys.path.insert(0, os.path.dirname(path))
+        try:
+            spec = importlib.util.spec_from_file_location(name, path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        finally:
+            sys.path.pop(0)
+        serializedATN = module.serializedATN()
+        atn = ATNDeserializer().deserialize(serializedATN)
+        snapshots.save(atn, serializedATN)
+        print(name + ": " + snapshots.fileNameFor(serializedATN))
+
+
+if __name__ == '__main__':
+    main()
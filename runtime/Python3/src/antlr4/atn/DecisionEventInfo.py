@@ -0,0 +1,126 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# Events recorded by the {@link ProfilingATNSimulator} during prediction.
+#
+from antlr4.BufferedTokenStream import TokenStream
+from antlr4.atn.ATNConfigSet import ATNConfigSet
+from antlr4.atn.SemanticContext import SemanticContext
+
+
+# This is the base class for gathering detailed information about prediction
+# events which occur during parsing.
+#
+# <p>Note that we could record the parser call stack at the time this event
+# occurred but in the presence of left recursive rules, the stack is kind of
+# meaningless. It's better to look at the individual configurations for their
+# individual stacks. Of course that is a {@link PredictionContext} object
+# not a parse tree node and so it does not have information about the extent
+# (start...stop) of the various subtrees. Examining the stack tops of all
+# configurations provide the return states for the rule invocations.
+# From there you can get the enclosing rule.</p>
+class DecisionEventInfo(object):
+    __slots__ = ('decision', 'configs', 'input', 'startIndex', 'stopIndex', 'fullCtx')
+
+    def __init__(self, decision:int, configs:ATNConfigSet, input:TokenStream, startIndex:int, stopIndex:int, fullCtx:bool):
+        # The invoked decision number which this event is related to.
+        self.decision = decision
+        # The configuration set containing additional information relevant to
+        # the prediction state when the current event occurred, or {@code None}
+        # if no additional information is relevant or available.
+        self.configs = configs
+        # The input token stream which is being parsed.
+        self.input = input
+        # The token index in the input stream at which the current prediction
+        # was originally invoked.
+        self.startIndex = startIndex
+        # The token index in the input stream at which the current event
+        # occurred.
+        self.stopIndex = stopIndex
+        # {@code True} if the current event occurred during LL prediction;
+        # otherwise, {@code False} if the input occurred during SLL prediction.
+        self.fullCtx = fullCtx
+
+
+# This class represents profiling event information for tracking the
+# lookahead depth required in order to make a prediction.
+class LookaheadEventInfo(DecisionEventInfo):
+    __slots__ = 'predictedAlt'
+
+    def __init__(self, decision:int, configs:ATNConfigSet, predictedAlt:int, input:TokenStream,
+                 startIndex:int, stopIndex:int, fullCtx:bool):
+        super().__init__(decision, configs, input, startIndex, stopIndex, fullCtx)
+        # The alternative chosen by adaptivePredict(), not necessarily the
+        # outermost alt shown for a rule; left-recursive rules have user-level
+        # alts that differ from the rewritten rule with a (...) block and a
+        # (..)* loop.
+        self.predictedAlt = predictedAlt
+
+
+# This class represents profiling event information for a syntax error
+# identified during prediction. Syntax errors occur when the prediction
+# algorithm is unable to identify an alternative which would lead to a
+# successful parse.
+class ErrorInfo(DecisionEventInfo):
+    __slots__ = ()
+
+
+# This class represents profiling event information for an ambiguity.
+# Ambiguities are decisions where a particular input resulted in an SLL
+# conflict, followed by LL prediction also reaching a conflict state
+# (indicating a true ambiguity in the grammar).
+#
+# <p>This event may be reported during SLL prediction in cases where the
+# conflicting SLL configuration set provides sufficient information to
+# determine that the SLL conflict is truly an ambiguity. For example, if none
+# of the ATN configurations in the conflicting SLL configuration set have
+# traversed a global follow transition (i.e.
+# {@link ATNConfig#reachesIntoOuterContext} is 0 for all configurations), then
+# the result of SLL prediction for that input is known to be equivalent to the
+# result of LL prediction for that input.</p>
+class AmbiguityInfo(DecisionEventInfo):
+    __slots__ = 'ambigAlts'
+
+    def __init__(self, decision:int, configs:ATNConfigSet, ambigAlts:set, input:TokenStream,
+                 startIndex:int, stopIndex:int, fullCtx:bool):
+        super().__init__(decision, configs, input, startIndex, stopIndex, fullCtx)
+        # The set of alternative numbers for this decision event that lead to
+        # a valid parse.
+        self.ambigAlts = ambigAlts
+
+
+# This class represents profiling event information for a context sensitivity.
+# Context sensitivities are decisions where a particular input resulted in an
+# SLL conflict, but LL prediction produced a single unique alternative.
+#
+# <p>In some cases, the unique alternative identified by LL prediction is not
+# equal to the minimum represented alternative in the conflicting SLL
+# configuration set. Grammars and inputs which result in this scenario are
+# unable to use {@link PredictionMode#SLL}, which in some cases may result in
+# dramatically reduced performance.</p>
+class ContextSensitivityInfo(DecisionEventInfo):
+    __slots__ = ()
+
+    def __init__(self, decision:int, configs:ATNConfigSet, input:TokenStream, startIndex:int, stopIndex:int):
+        super().__init__(decision, configs, input, startIndex, stopIndex, True)
+
+
+# This class represents profiling event information for semantic predicate
+# evaluations which occur during prediction.
+class PredicateEvalInfo(DecisionEventInfo):
+    __slots__ = ('semctx', 'predictedAlt', 'evalResult')
+
+    def __init__(self, decision:int, input:TokenStream, startIndex:int, stopIndex:int,
+                 semctx:SemanticContext, evalResult:bool, predictedAlt:int, fullCtx:bool):
+        super().__init__(decision, ATNConfigSet(), input, startIndex, stopIndex, fullCtx)
+        # The semantic context which was evaluated.
+        self.semctx = semctx
+        # The alternative number for the decision which is guarded by the
+        # semantic context {@link #semctx}.
+        self.predictedAlt = predictedAlt
+        # The result of evaluating the semantic context {@link #semctx}.
+        self.evalResult = evalResult
@@ -0,0 +1,96 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# This class contains profiling gathered for a particular decision.
+#
+# <p>Parsing performance in ANTLR 4 is heavily influenced by both static
+# factors (e.g. the form of the rules in the grammar) and dynamic factors
+# (e.g. the choice of input and the state of the DFA cache at the time
+# profiling operations are started). For best results, gather and use
+# aggregate statistics from a large sample of inputs representing the
+# inputs expected in production before using the results to make changes
+# in the grammar.</p>
+#
+class DecisionInfo(object):
+    __slots__ = (
+        'decision', 'invocations', 'timeInPrediction',
+        'SLL_TotalLook', 'SLL_MinLook', 'SLL_MaxLook', 'SLL_MaxLookEvent',
+        'LL_TotalLook', 'LL_MinLook', 'LL_MaxLook', 'LL_MaxLookEvent',
+        'contextSensitivities', 'errors', 'ambiguities', 'predicateEvals',
+        'SLL_ATNTransitions', 'SLL_DFATransitions', 'LL_Fallback',
+        'LL_ATNTransitions', 'LL_DFATransitions'
+    )
+
+    def __init__(self, decision:int):
+        # The decision number, which is an index into {@link ATN#decisionToState}.
+        self.decision = decision
+        # The total number of times {@link ParserATNSimulator#adaptivePredict}
+        # was invoked for this decision.
+        self.invocations = 0
+        # The total time spent in {@link ParserATNSimulator#adaptivePredict}
+        # for this decision, in nanoseconds. The value includes the time spent
+        # evaluating semantic predicates.
+        self.timeInPrediction = 0
+        # The sum of the lookahead required for SLL prediction for this
+        # decision. Note that SLL prediction is used before LL prediction for
+        # performance reasons even when {@link PredictionMode#LL} or
+        # {@link PredictionMode#LL_EXACT_AMBIG_DETECTION} is used.
+        self.SLL_TotalLook = 0
+        # The minimum and maximum lookahead required for any single SLL
+        # prediction to complete for this decision, and the event for the
+        # maximum.
+        self.SLL_MinLook = 0
+        self.SLL_MaxLook = 0
+        self.SLL_MaxLookEvent = None
+        # The sum, minimum and maximum of the lookahead required for LL
+        # prediction for this decision, and the event for the maximum. Note
+        # that LL prediction is only used when SLL prediction reaches a
+        # conflict state.
+        self.LL_TotalLook = 0
+        self.LL_MinLook = 0
+        self.LL_MaxLook = 0
+        self.LL_MaxLookEvent = None
+        # A list of {@link ContextSensitivityInfo}, one for each context
+        # sensitivity detected for this decision.
+        self.contextSensitivities = []
+        # A list of {@link ErrorInfo}, one for each syntax error identified by
+        # prediction for this decision.
+        self.errors = []
+        # A list of {@link AmbiguityInfo}, one for each ambiguity detected for
+        # this decision.
+        self.ambiguities = []
+        # A list of {@link PredicateEvalInfo}, one for each semantic predicate
+        # evaluated during prediction for this decision.
+        self.predicateEvals = []
+        # The total number of ATN transitions required during SLL prediction
+        # for this decision. An ATN transition is determined by the number of
+        # times the DFA does not contain an edge that is required for
+        # prediction, resulting in on-the-fly computation of that edge.
+        self.SLL_ATNTransitions = 0
+        # The total number of DFA transitions required during SLL prediction
+        # for this decision.
+        self.SLL_DFATransitions = 0
+        # The number of times SLL prediction completed with a conflict,
+        # resulting in fallback to LL prediction.
+        self.LL_Fallback = 0
+        # The total number of ATN transitions required during LL prediction
+        # for this decision. LL prediction does not use the DFA, so every
+        # transition is computed from the ATN.
+        self.LL_ATNTransitions = 0
+        self.LL_DFATransitions = 0
+
+    def __str__(self):
+        return "{decision=" + str(self.decision) + \
+               ", contextSensitivities=" + str(len(self.contextSensitivities)) + \
+               ", errors=" + str(len(self.errors)) + \
+               ", ambiguities=" + str(len(self.ambiguities)) + \
+               ", SLL_lookahead=" + str(self.SLL_TotalLook) + \
+               ", SLL_ATNTransitions=" + str(self.SLL_ATNTransitions) + \
+               ", SLL_DFATransitions=" + str(self.SLL_DFATransitions) + \
+               ", LL_Fallback=" + str(self.LL_Fallback) + \
+               ", LL_lookahead=" + str(self.LL_TotalLook) + \
+               ", LL_ATNTransitions=" + str(self.LL_ATNTransitions) + "}"
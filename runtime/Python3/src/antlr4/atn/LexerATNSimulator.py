@@ -30,6 +30,7 @@ from antlr4.atn.ATNConfigSet import ATNConfigSet, OrderedATNConfigSet
 from antlr4.atn.ATNState import RuleStopState, ATNState
 from antlr4.atn.LexerActionExecutor import LexerActionExecutor
 from antlr4.atn.Transition import Transition
+from antlr4.dfa.DFA import DFA
 from antlr4.dfa.DFAState import DFAState
 from antlr4.error.Errors import LexerNoViableAltException, UnsupportedOperationException
 
@@ -52,14 +53,14 @@ LexerATNSimulator = None
 class LexerATNSimulator(ATNSimulator):
     __slots__ = (
         'decisionToDFA', 'recog', 'startIndex', 'line', 'column', 'mode',
-        'DEFAULT_MODE', 'MAX_CHAR_VALUE', 'prevAccept'
+        'DEFAULT_MODE', 'MAX_CHAR_VALUE', 'prevAccept', 'fastPath'
     )
 
     debug = False
     dfa_debug = False
 
     MIN_DFA_EDGE = 0
-    MAX_DFA_EDGE = 127 # forces unicode to stay in ATN
+    MAX_DFA_EDGE = 127 # edges above go to DFAState.sparseEdges
 
     ERROR = None
 
@@ -83,6 +84,11 @@ class LexerATNSimulator(ATNSimulator):
         self.MAX_CHAR_VALUE = Lexer.MAX_CHAR_VALUE
         # Used during DFA/ATN exec to record the most recent accept configuration info
         self.prevAccept = SimState()
+        # Follow existing DFA edges in {@link #execDFA} when the input reads
+        # and consumes characters as {@link InputStream} does; see
+        # {@link #canFastPath}. Turn off to see every step in
+        # {@link #getExistingTargetState}.
+        self.fastPath = True
 
 
     def copyState(self, simulator:LexerATNSimulator ):
@@ -93,6 +99,9 @@ class LexerATNSimulator(ATNSimulator):
 
     def match(self, input:InputStream , mode:int):
         self.mode = mode
+        budget = self.dfaBudget
+        if budget is not None and budget.pending > budget.room:
+            budget.enforce(self.decisionToDFA)
         mark = input.mark()
         try:
             self.startIndex = input.index
@@ -100,6 +109,16 @@ class LexerATNSimulator(ATNSimulator):
             dfa = self.decisionToDFA[mode]
             if dfa.s0 is None:
                 return self.matchATN(input)
+            elif self.canFastPath(input):
+                s = dfa.s0
+                if s.isAcceptState:
+                    self.captureSimState(self.prevAccept, input, s)
+                s = self.execDFA(input, s)
+                # the whole token was matched by the DFA and ended on a known
+                # dead end; no need to go through execATN
+                if self.prevAccept.dfaState is not None and self.getExistingTargetState(s, input.LA(1)) is self.ERROR:
+                    return self.failOrAccept(self.prevAccept, input, s.configs, Token.INVALID_TYPE)
+                return self.execATN(input, s)
             else:
                 return self.execATN(input, dfa.s0)
         finally:
@@ -112,6 +131,10 @@ class LexerATNSimulator(ATNSimulator):
         self.column = 0
         self.mode = self.DEFAULT_MODE
 
+    def clearDFA(self):
+        for d in range(0, len(self.decisionToDFA)):
+            self.decisionToDFA[d] = DFA(self.atn.getDecisionState(d), d)
+
     def matchATN(self, input:InputStream):
         startState = self.atn.modeToStartState[self.mode]
 
@@ -144,8 +167,13 @@ class LexerATNSimulator(ATNSimulator):
 
         t = input.LA(1)
         s = ds0 # s is current/from DFA state
+        fastPath = self.canFastPath(input)
 
         while True: # while more work
+            if fastPath:
+                s = self.execDFA(input, s)
+                t = input.LA(1)
+
             if LexerATNSimulator.debug:
                 print("execATN loop starting closure:", str(s.configs))
 
@@ -194,6 +222,60 @@ class LexerATNSimulator(ATNSimulator):
 
         return self.failOrAccept(self.prevAccept, input, s.configs, t)
 
+    # Follow the DFA from {@code s} for as long as there are edges for the
+    # input, working on the input buffer directly. This is the loop in
+    # {@link #execATN} with {@link #getExistingTargetState},
+    # {@link #consume} and {@link #captureSimState} inlined. Stops before the
+    # first symbol that has no edge or leads to {@link #ERROR}, and at EOF;
+    # {@link #execATN} takes it from there.
+    #
+    # @return the DFA state reached
+    # Whether {@link #execDFA} may read {@code input} directly. The characters
+    # are taken from {@code data} without calling {@code LA} or
+    # {@code consume}, so a stream class that overrides either of them, such
+    # as one that folds case in {@code LA}, goes through {@link #execATN} one
+    # character at a time.
+    def canFastPath(self, input:InputStream):
+        cls = type(input)
+        return self.fastPath and not LexerATNSimulator.debug \
+               and getattr(cls, "LA", None) is InputStream.LA and getattr(cls, "consume", None) is InputStream.consume
+
+    def execDFA(self, input:InputStream, s:DFAState):
+        data = input.data
+        size = input._size
+        index = input._index
+        line = self.line
+        column = self.column
+        prevAccept = self.prevAccept
+        error = self.ERROR
+        maxEdge = self.MAX_DFA_EDGE
+        while index < size:
+            t = data[index]
+            if t > maxEdge:
+                edges = s.sparseEdges
+                target = None if edges is None else edges.get(t, None)
+            else:
+                edges = s.edges
+                target = None if edges is None else edges[t]
+            if target is None or target is error:
+                break
+            index += 1
+            if t == 10: # '\n'
+                line += 1
+                column = 0
+            else:
+                column += 1
+            if target.isAcceptState:
+                prevAccept.index = index
+                prevAccept.line = line
+                prevAccept.column = column
+                prevAccept.dfaState = target
+            s = target
+        input._index = index
+        self.line = line
+        self.column = column
+        return s
+
     # Get an existing target state for an edge in the DFA. If the target state
     # for the edge has not yet been computed or is otherwise not available,
     # this method returns {@code null}.
@@ -204,10 +286,14 @@ class LexerATNSimulator(ATNSimulator):
     # {@code t}, or {@code null} if the target state for this edge is not
     # already cached
     def getExistingTargetState(self, s:DFAState, t:int):
-        if s.edges is None or t < self.MIN_DFA_EDGE or t > self.MAX_DFA_EDGE:
+        if t > self.MAX_DFA_EDGE:
+            if s.sparseEdges is None:
+                return None
+            target = s.sparseEdges.get(t, None)
+        elif s.edges is None or t < self.MIN_DFA_EDGE:
             return None
-
-        target = s.edges[t - self.MIN_DFA_EDGE]
+        else:
+            target = s.edges[t - self.MIN_DFA_EDGE]
         if LexerATNSimulator.debug and target is not None:
             print("reuse state", str(s.stateNumber), "edge to", str(target.stateNumber))
 
@@ -498,18 +584,26 @@ class LexerATNSimulator(ATNSimulator):
                 return to
 
         # add the edge
-        if tk < self.MIN_DFA_EDGE or tk > self.MAX_DFA_EDGE:
+        if tk < self.MIN_DFA_EDGE:
             # Only track edges within the DFA bounds
             return to
 
         if LexerATNSimulator.debug:
             print("EDGE " + str(from_) + " -> " + str(to) + " upon "+ chr(tk))
 
-        if from_.edges is None:
-            #  make room for tokens 1..n and -1 masquerading as index 0
-            from_.edges = [ None ] * (self.MAX_DFA_EDGE - self.MIN_DFA_EDGE + 1)
+        with self.decisionToDFA[self.mode].lock:
+            if tk > self.MAX_DFA_EDGE:
+                # non-ASCII edges are sparse; don't give every state a full table
+                if from_.sparseEdges is None:
+                    from_.sparseEdges = dict()
+                from_.sparseEdges[tk] = to
+                return to
 
-        from_.edges[tk - self.MIN_DFA_EDGE] = to # connect
+            if from_.edges is None:
+                #  make room for tokens 1..n and -1 masquerading as index 0
+                from_.edges = [ None ] * (self.MAX_DFA_EDGE - self.MIN_DFA_EDGE + 1)
+
+            from_.edges[tk - self.MIN_DFA_EDGE] = to # connect
 
         return to
 
@@ -529,16 +623,19 @@ class LexerATNSimulator(ATNSimulator):
             proposed.prediction = self.atn.ruleToTokenType[firstConfigWithRuleStopState.state.ruleIndex]
 
         dfa = self.decisionToDFA[self.mode]
-        existing = dfa.states.get(proposed, None)
-        if existing is not None:
-            return existing
-
-        newState = proposed
-
-        newState.stateNumber = len(dfa.states)
-        configs.setReadonly(True)
-        newState.configs = configs
-        dfa.states[newState] = newState
+        with dfa.lock:
+            existing = dfa.states.get(proposed, None)
+            if existing is not None:
+                return existing
+
+            newState = proposed
+
+            newState.stateNumber = len(dfa.states)
+            configs.setReadonly(True)
+            newState.configs = configs
+            dfa.states[newState] = newState
+        if self.dfaBudget is not None:
+            self.dfaBudget.pending += 1
         return newState
 
     def getDFA(self, mode:int):
@@ -0,0 +1,106 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# Statistics gathered by the {@link ProfilingLexerATNSimulator}.
+#
+from io import StringIO
+
+
+# Profiling information for one lexer mode.
+class LexerModeInfo(object):
+    __slots__ = ('mode', 'matches', 'timeInMatch', 'DFA_Transitions', 'ATN_Transitions',
+                 'DFA_Chars', 'ATN_Chars', 'startStateComputations')
+
+    def __init__(self, mode:int):
+        self.mode = mode
+        # The number of times {@link LexerATNSimulator#match} was invoked in
+        # this mode, i.e. the number of tokens, including skipped ones and
+        # {@code more} fragments, and errors.
+        self.matches = 0
+        # The total time spent in {@link LexerATNSimulator#match}, in
+        # nanoseconds. This includes lexer actions and predicates.
+        self.timeInMatch = 0
+        # The number of steps that followed an existing DFA edge, including
+        # edges to the error state that end a token.
+        self.DFA_Transitions = 0
+        # The number of steps that had to be computed from the ATN, which is
+        # what makes lexing slow.
+        self.ATN_Transitions = 0
+        # The number of characters consumed over DFA and ATN transitions.
+        self.DFA_Chars = 0
+        self.ATN_Chars = 0
+        # The number of times the DFA for the mode had no start state yet.
+        self.startStateComputations = 0
+
+
+# Profiling information for one lexer rule. Transitions and time are
+# attributed to the rule that matched the token.
+class LexerRuleInfo(object):
+    __slots__ = ('rule', 'tokens', 'timeInMatch', 'DFA_Transitions', 'ATN_Transitions',
+                 'predicateEvals', 'timeInPredicates', 'actionExecutions', 'timeInActions')
+
+    def __init__(self, rule:int):
+        self.rule = rule
+        # The number of tokens matched by this rule, including skipped ones.
+        self.tokens = 0
+        self.timeInMatch = 0
+        self.DFA_Transitions = 0
+        self.ATN_Transitions = 0
+        # The number of times a predicate of this rule was evaluated, and the
+        # time that took in nanoseconds.
+        self.predicateEvals = 0
+        self.timeInPredicates = 0
+        # The number of times the actions of this rule were executed, and the
+        # time that took in nanoseconds.
+        self.actionExecutions = 0
+        self.timeInActions = 0
+
+
+class LexerProfileInfo(object):
+    __slots__ = 'atnSimulator'
+
+    def __init__(self, atnSimulator):
+        self.atnSimulator = atnSimulator
+
+    def getModeInfo(self):
+        return self.atnSimulator.modes
+
+    def getRuleInfo(self):
+        return self.atnSimulator.rules
+
+    # Gets the total time spent matching tokens, in nanoseconds.
+    def getTotalTimeInMatch(self):
+        return sum(info.timeInMatch for info in self.getModeInfo())
+
+    def getTotalATNTransitions(self):
+        return sum(info.ATN_Transitions for info in self.getModeInfo())
+
+    def getTotalDFATransitions(self):
+        return sum(info.DFA_Transitions for info in self.getModeInfo())
+
+    # A table of the modes, and of the rules that matched any tokens, with the
+    # rules that needed the most ATN transitions first.
+    def report(self):
+        recog = self.atnSimulator.recog
+        modeNames = getattr(recog, "modeNames", None)
+        ruleNames = getattr(recog, "ruleNames", None)
+        with StringIO() as buf:
+            buf.write("%-24s %10s %12s %12s %12s %12s\n" % ("mode", "matches", "time(ms)", "DFA chars", "ATN chars", "ATN trans"))
+            for info in self.getModeInfo():
+                name = modeNames[info.mode] if modeNames is not None else str(info.mode)
+                buf.write("%-24s %10d %12.3f %12d %12d %12d\n" % (name, info.matches, info.timeInMatch / 1e6,
+                                                                  info.DFA_Chars, info.ATN_Chars, info.ATN_Transitions))
+            buf.write("\n")
+            buf.write("%-24s %10s %12s %12s %12s %12s\n" % ("rule", "tokens", "time(ms)", "DFA trans", "ATN trans", "actions(ms)"))
+            rules = sorted((info for info in self.getRuleInfo() if info.tokens > 0 or info.predicateEvals > 0),
+                           key=lambda info: (-info.ATN_Transitions, -info.timeInMatch))
+            for info in rules:
+                name = ruleNames[info.rule] if ruleNames is not None else str(info.rule)
+                buf.write("%-24s %10d %12.3f %12d %12d %12.3f\n" % (name, info.tokens, info.timeInMatch / 1e6,
+                                                                    info.DFA_Transitions, info.ATN_Transitions,
+                                                                    (info.timeInActions + info.timeInPredicates) / 1e6))
+            return buf.getvalue()
@@ -0,0 +1,66 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# This class provides access to specific and aggregate statistics gathered
+# during profiling of a parser.
+#
+from antlr4.atn.ProfilingATNSimulator import ProfilingATNSimulator
+
+
+class ParseInfo(object):
+    __slots__ = 'atnSimulator'
+
+    def __init__(self, atnSimulator:ProfilingATNSimulator):
+        self.atnSimulator = atnSimulator
+
+    # Gets an array of {@link DecisionInfo} instances containing the profiling
+    # information gathered for each decision in the ATN.
+    def getDecisionInfo(self):
+        return self.atnSimulator.getDecisionInfo()
+
+    # Gets the decision numbers for decisions that required one or more
+    # full-context predictions during parsing. These are decisions for which
+    # {@link DecisionInfo#LL_Fallback} is non-zero.
+    def getLLDecisions(self):
+        return [ info.decision for info in self.getDecisionInfo() if info.LL_Fallback > 0 ]
+
+    # Gets the total time spent during prediction across all decisions made
+    # during parsing, in nanoseconds.
+    def getTotalTimeInPrediction(self):
+        return sum(info.timeInPrediction for info in self.getDecisionInfo())
+
+    # Gets the total number of SLL lookahead operations across all decisions
+    # made during parsing.
+    def getTotalSLLLookaheadOps(self):
+        return sum(info.SLL_TotalLook for info in self.getDecisionInfo())
+
+    # Gets the total number of LL lookahead operations across all decisions
+    # made during parsing.
+    def getTotalLLLookaheadOps(self):
+        return sum(info.LL_TotalLook for info in self.getDecisionInfo())
+
+    # Gets the total number of ATN lookahead operations for SLL prediction
+    # across all decisions made during parsing.
+    def getTotalSLLATNLookaheadOps(self):
+        return sum(info.SLL_ATNTransitions for info in self.getDecisionInfo())
+
+    # Gets the total number of ATN lookahead operations for LL prediction
+    # across all decisions made during parsing.
+    def getTotalLLATNLookaheadOps(self):
+        return sum(info.LL_ATNTransitions for info in self.getDecisionInfo())
+
+    # Gets the total number of ATN lookahead operations for SLL and LL
+    # prediction across all decisions made during parsing.
+    def getTotalATNLookaheadOps(self):
+        return self.getTotalSLLATNLookaheadOps() + self.getTotalLLATNLookaheadOps()
+
+    # Gets the total number of DFA states stored in the DFA cache for all
+    # decisions in the ATN, or for a particular decision.
+    def getDFASize(self, decision:int=None):
+        if decision is None:
+            return sum(len(dfa.states) for dfa in self.atnSimulator.decisionToDFA)
+        return len(self.atnSimulator.decisionToDFA[decision].states)
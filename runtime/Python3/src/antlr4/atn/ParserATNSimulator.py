@@ -257,7 +257,7 @@ from antlr4.error.Errors import NoViableAltException
 class ParserATNSimulator(ATNSimulator):
     __slots__ = (
         'parser', 'decisionToDFA', 'predictionMode', '_input', '_startIndex',
-        '_outerContext', '_dfa', 'mergeCache'
+        '_outerContext', '_dfa', 'mergeCache', 'parseBudget'
     )
 
     debug = False
@@ -286,11 +286,17 @@ class ParserATNSimulator(ATNSimulator):
         #  also be examined during cache lookup.
         #
         self.mergeCache = None
+        # The {@link ParseBudget} of the parser, see Parser#setParseBudget.
+        self.parseBudget = None
 
 
     def reset(self):
         pass
 
+    def clearDFA(self):
+        for d in range(0, len(self.decisionToDFA)):
+            self.decisionToDFA[d] = DFA(self.atn.getDecisionState(d), d)
+
     def adaptivePredict(self, input:TokenStream, decision:int, outerContext:ParserRuleContext):
         if ParserATNSimulator.debug or ParserATNSimulator.trace_atn_sim:
             print("adaptivePredict decision " + str(decision) +
@@ -301,6 +307,15 @@ class ParserATNSimulator(ATNSimulator):
         self._startIndex = input.index
         self._outerContext = outerContext
 
+        budget = self.dfaBudget
+        if budget is not None and budget.pending > budget.room:
+            budget.enforce(self.decisionToDFA)
+        budget = self.parseBudget
+        if budget is not None:
+            budget.predictions += 1
+            if budget.predictions >= budget.predictionLimit:
+                budget.check()
+
         dfa = self.decisionToDFA[decision]
         self._dfa = dfa
         m = input.mark()
@@ -466,6 +481,8 @@ class ParserATNSimulator(ATNSimulator):
             if t != Token.EOF:
                 input.consume()
                 t = input.LA(1)
+                if self.parseBudget is not None:
+                    self.parseBudget.checkLookahead(input.index - startIndex)
 
     #
     # Get an existing target state for an edge in the DFA. If the target state
@@ -619,6 +636,8 @@ class ParserATNSimulator(ATNSimulator):
             if t != Token.EOF:
                 input.consume()
                 t = input.LA(1)
+                if self.parseBudget is not None:
+                    self.parseBudget.checkLookahead(input.index - startIndex)
 
         # If the configuration set uniquely predicts an alternative,
         # without conflict, then we know that it's a full LL decision
@@ -1074,7 +1093,8 @@ class ParserATNSimulator(ATNSimulator):
                 if not complete:
                     break
                 continue
-            predicateEvaluationResult = pair.pred.eval(self.parser, outerContext)
+            fullCtx = False # in dfa
+            predicateEvaluationResult = self.evalPredicate(pair.pred, outerContext, pair.alt, fullCtx)
             if ParserATNSimulator.debug or ParserATNSimulator.dfa_debug:
                 print("eval pred " + str(pair) + "=" + str(predicateEvaluationResult))
 
@@ -1086,6 +1106,23 @@ class ParserATNSimulator(ATNSimulator):
                     break
         return predictions
 
+    # Evaluate a semantic context within a specific parser context.
+    #
+    # <p>Operator predicates (represented by {@link SemanticContext.AND} and
+    # {@link SemanticContext.OR}) are evaluated as a single semantic context,
+    # rather than evaluating the operands individually.</p>
+    #
+    # @param pred The semantic context to evaluate
+    # @param parserCallStack The parser context in which to evaluate the
+    # semantic context
+    # @param alt The alternative which is guarded by {@code pred}
+    # @param fullCtx {@code true} if the evaluation is occurring during LL
+    # prediction; otherwise, {@code false} if the evaluation is occurring
+    # during SLL prediction
+    #
+    def evalPredicate(self, pred:SemanticContext, parserCallStack:ParserRuleContext, alt:int, fullCtx:bool):
+        return pred.eval(self.parser, parserCallStack)
+
 
     # TODO: If we are doing predicates, there is no point in pursuing
     #     closure operations if we reach a DFA state that uniquely predicts
@@ -1143,6 +1180,11 @@ class ParserATNSimulator(ATNSimulator):
 
     # Do the actual work of walking epsilon edges#
     def closure_(self, config:ATNConfig, configs:ATNConfigSet, closureBusy:set, collectPredicates:bool, fullCtx:bool, depth:int, treatEofAsEpsilon:bool):
+        budget = self.parseBudget
+        if budget is not None:
+            budget.closureOperations += 1
+            if budget.closureOperations >= budget.closureLimit:
+                budget.check()
         p = config.state
         # optimization
         if not p.epsilonOnlyTransitions:
@@ -1399,7 +1441,7 @@ class ParserATNSimulator(ATNSimulator):
                 # later during conflict resolution.
                 currentPosition = self._input.index
                 self._input.seek(self._startIndex)
-                predSucceeds = pt.getPredicate().eval(self.parser, self._outerContext)
+                predSucceeds = self.evalPredicate(pt.getPredicate(), self._outerContext, config.alt, fullCtx)
                 self._input.seek(currentPosition)
                 if predSucceeds:
                     c = ATNConfig(state=pt.target, config=config) # no pred context
@@ -1429,7 +1471,7 @@ class ParserATNSimulator(ATNSimulator):
                 # later during conflict resolution.
                 currentPosition = self._input.index
                 self._input.seek(self._startIndex)
-                predSucceeds = pt.getPredicate().eval(self.parser, self._outerContext)
+                predSucceeds = self.evalPredicate(pt.getPredicate(), self._outerContext, config.alt, fullCtx)
                 self._input.seek(currentPosition)
                 if predSucceeds:
                     c = ATNConfig(state=pt.target, config=config) # no pred context
@@ -1576,9 +1618,10 @@ class ParserATNSimulator(ATNSimulator):
         if from_ is None or t < -1 or t > self.atn.maxTokenType:
             return to
 
-        if from_.edges is None:
-            from_.edges = [None] * (self.atn.maxTokenType + 2)
-        from_.edges[t+1] = to # connect
+        with dfa.lock:
+            if from_.edges is None:
+                from_.edges = [None] * (self.atn.maxTokenType + 2)
+            from_.edges[t+1] = to # connect
 
         if ParserATNSimulator.debug:
             names = None if self.parser is None else self.parser.literalNames
@@ -1606,19 +1649,22 @@ class ParserATNSimulator(ATNSimulator):
             return D
 
 
-        existing = dfa.states.get(D, None)
-        if existing is not None:
-            if ParserATNSimulator.trace_atn_sim: print("addDFAState", str(D), "exists")
-            return existing
+        with dfa.lock:
+            existing = dfa.states.get(D, None)
+            if existing is not None:
+                if ParserATNSimulator.trace_atn_sim: print("addDFAState", str(D), "exists")
+                return existing
 
-        D.stateNumber = len(dfa.states)
-        if not D.configs.readonly:
-            D.configs.optimizeConfigs(self)
-            D.configs.setReadonly(True)
+            D.stateNumber = len(dfa.states)
+            if not D.configs.readonly:
+                D.configs.optimizeConfigs(self)
+                D.configs.setReadonly(True)
 
-        if ParserATNSimulator.trace_atn_sim: print("addDFAState new", str(D))
+            if ParserATNSimulator.trace_atn_sim: print("addDFAState new", str(D))
 
-        dfa.states[D] = D
+            dfa.states[D] = D
+        if self.dfaBudget is not None:
+            self.dfaBudget.pending += 1
         return D
 
     def reportAttemptingFullContext(self, dfa:DFA, conflictingAlts:set, configs:ATNConfigSet, startIndex:int, stopIndex:int):
@@ -0,0 +1,175 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# A {@link ParserATNSimulator} that records a {@link DecisionInfo} for each
+# decision of the grammar. Install it with {@link Parser#setProfile} and
+# read the results with {@link Parser#getParseInfo}.
+#
+import time
+from antlr4.BufferedTokenStream import TokenStream
+from antlr4.Parser import Parser
+from antlr4.ParserRuleContext import ParserRuleContext
+from antlr4.atn.ATNConfigSet import ATNConfigSet
+from antlr4.atn.DecisionEventInfo import LookaheadEventInfo, ErrorInfo, AmbiguityInfo, \
+    ContextSensitivityInfo, PredicateEvalInfo
+from antlr4.atn.DecisionInfo import DecisionInfo
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+from antlr4.atn.SemanticContext import SemanticContext, PrecedencePredicate
+from antlr4.dfa.DFA import DFA
+from antlr4.dfa.DFAState import DFAState
+
+
+class ProfilingATNSimulator(ParserATNSimulator):
+    __slots__ = (
+        'decisions', 'numDecisions', '_sllStopIndex', '_llStopIndex',
+        'currentDecision', 'currentState', 'conflictingAltResolvedBySLL'
+    )
+
+    def __init__(self, parser:Parser):
+        interp = parser._interp
+        super().__init__(parser, interp.atn, interp.decisionToDFA, interp.sharedContextCache)
+        self.numDecisions = len(self.atn.decisionToState)
+        self.decisions = [ DecisionInfo(i) for i in range(0, self.numDecisions) ]
+        self._sllStopIndex = -1
+        self._llStopIndex = -1
+        self.currentDecision = -1
+        self.currentState = None
+        # At the point of LL failover, we record how SLL would resolve the
+        # conflict so that we can determine whether or not a decision / input
+        # pair is context-sensitive. If LL gives a different result than SLL's
+        # predicted alternative, we have a context sensitivity for sure. The
+        # converse is not necessarily true, however. It's possible that after
+        # conflict resolution chooses minimum alternatives, SLL could get the
+        # same answer as LL. Regardless of whether or not the result indicates
+        # an ambiguity, it is not treated as a context sensitivity because LL
+        # prediction was not required in order to produce a correct prediction
+        # for this decision and input sequence. It may in fact still be a
+        # context sensitivity but we don't know by looking at the minimum
+        # alternatives for the current input.
+        self.conflictingAltResolvedBySLL = 0
+
+    def adaptivePredict(self, input:TokenStream, decision:int, outerContext:ParserRuleContext):
+        try:
+            self._sllStopIndex = -1
+            self._llStopIndex = -1
+            self.currentDecision = decision
+            start = time.perf_counter_ns() # expensive but useful info
+            alt = super().adaptivePredict(input, decision, outerContext)
+            stop = time.perf_counter_ns()
+            info = self.decisions[decision]
+            info.timeInPrediction += stop - start
+            info.invocations += 1
+
+            SLL_k = self._sllStopIndex - self._startIndex + 1
+            info.SLL_TotalLook += SLL_k
+            info.SLL_MinLook = SLL_k if info.SLL_MinLook == 0 else min(info.SLL_MinLook, SLL_k)
+            if SLL_k > info.SLL_MaxLook:
+                info.SLL_MaxLook = SLL_k
+                info.SLL_MaxLookEvent = LookaheadEventInfo(decision, None, alt, input, self._startIndex,
+                                                           self._sllStopIndex, False)
+
+            if self._llStopIndex >= 0:
+                LL_k = self._llStopIndex - self._startIndex + 1
+                info.LL_TotalLook += LL_k
+                info.LL_MinLook = LL_k if info.LL_MinLook == 0 else min(info.LL_MinLook, LL_k)
+                if LL_k > info.LL_MaxLook:
+                    info.LL_MaxLook = LL_k
+                    info.LL_MaxLookEvent = LookaheadEventInfo(decision, None, alt, input, self._startIndex,
+                                                              self._llStopIndex, True)
+            return alt
+        finally:
+            self.currentDecision = -1
+
+    def getExistingTargetState(self, previousD:DFAState, t:int):
+        # this method is called after each time the input position advances
+        # during SLL prediction
+        self._sllStopIndex = self._input.index
+
+        existingTargetState = super().getExistingTargetState(previousD, t)
+        if existingTargetState is not None:
+            info = self.decisions[self.currentDecision]
+            info.SLL_DFATransitions += 1 # count only if we transition over a DFA state
+            if existingTargetState is self.ERROR:
+                info.errors.append(ErrorInfo(self.currentDecision, previousD.configs, self._input,
+                                             self._startIndex, self._sllStopIndex, False))
+
+        self.currentState = existingTargetState
+        return existingTargetState
+
+    def computeTargetState(self, dfa:DFA, previousD:DFAState, t:int):
+        state = super().computeTargetState(dfa, previousD, t)
+        self.currentState = state
+        return state
+
+    def computeReachSet(self, closure:ATNConfigSet, t:int, fullCtx:bool):
+        if fullCtx:
+            # this method is called after each time the input position advances
+            # during full context prediction
+            self._llStopIndex = self._input.index
+
+        reachConfigs = super().computeReachSet(closure, t, fullCtx)
+        info = self.decisions[self.currentDecision]
+        if fullCtx:
+            info.LL_ATNTransitions += 1 # count computation even if error
+            if reachConfigs is None: # no reach on current lookahead symbol. ERROR.
+                info.errors.append(ErrorInfo(self.currentDecision, closure, self._input,
+                                             self._startIndex, self._llStopIndex, True))
+        else:
+            info.SLL_ATNTransitions += 1
+            if reachConfigs is None: # no reach on current lookahead symbol. ERROR.
+                info.errors.append(ErrorInfo(self.currentDecision, closure, self._input,
+                                             self._startIndex, self._sllStopIndex, False))
+        return reachConfigs
+
+    def evalPredicate(self, pred:SemanticContext, parserCallStack:ParserRuleContext, alt:int, fullCtx:bool):
+        result = super().evalPredicate(pred, parserCallStack, alt, fullCtx)
+        if not isinstance(pred, PrecedencePredicate):
+            fullContext = self._llStopIndex >= 0
+            stopIndex = self._llStopIndex if fullContext else self._sllStopIndex
+            self.decisions[self.currentDecision].predicateEvals.append(
+                PredicateEvalInfo(self.currentDecision, self._input, self._startIndex, stopIndex,
+                                  pred, result, alt, fullCtx))
+        return result
+
+    def reportAttemptingFullContext(self, dfa:DFA, conflictingAlts:set, configs:ATNConfigSet, startIndex:int, stopIndex:int):
+        if conflictingAlts is not None:
+            self.conflictingAltResolvedBySLL = min(conflictingAlts)
+        else:
+            self.conflictingAltResolvedBySLL = min(c.alt for c in configs)
+        self.decisions[self.currentDecision].LL_Fallback += 1
+        super().reportAttemptingFullContext(dfa, conflictingAlts, configs, startIndex, stopIndex)
+
+    def reportContextSensitivity(self, dfa:DFA, prediction:int, configs:ATNConfigSet, startIndex:int, stopIndex:int):
+        if prediction != self.conflictingAltResolvedBySLL:
+            self.decisions[self.currentDecision].contextSensitivities.append(
+                ContextSensitivityInfo(self.currentDecision, configs, self._input, startIndex, stopIndex))
+        super().reportContextSensitivity(dfa, prediction, configs, startIndex, stopIndex)
+
+    def reportAmbiguity(self, dfa:DFA, D:DFAState, startIndex:int, stopIndex:int,
+                        exact:bool, ambigAlts:set, configs:ATNConfigSet):
+        if ambigAlts is not None:
+            prediction = min(ambigAlts)
+        else:
+            prediction = min(c.alt for c in configs)
+        info = self.decisions[self.currentDecision]
+        if configs.fullCtx and prediction != self.conflictingAltResolvedBySLL:
+            # Even though this is an ambiguity we are reporting, we can
+            # still detect some context sensitivities.  Both SLL and LL
+            # are showing a conflict, hence an ambiguity, but if they resolve
+            # to different minimum alternatives we have also identified a
+            # context sensitivity.
+            info.contextSensitivities.append(
+                ContextSensitivityInfo(self.currentDecision, configs, self._input, startIndex, stopIndex))
+        info.ambiguities.append(AmbiguityInfo(self.currentDecision, configs, ambigAlts,
+                                              self._input, startIndex, stopIndex, configs.fullCtx))
+        super().reportAmbiguity(dfa, D, startIndex, stopIndex, exact, ambigAlts, configs)
+
+    def getDecisionInfo(self):
+        return self.decisions
+
+    def getCurrentState(self):
+        return self.currentState
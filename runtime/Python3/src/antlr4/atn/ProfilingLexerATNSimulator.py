@@ -0,0 +1,139 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# A {@link LexerATNSimulator} that records a {@link LexerModeInfo} for each
+# mode and a {@link LexerRuleInfo} for each rule of the lexer. Install it
+# with {@link Lexer#setProfile} and read the results with
+# {@link Lexer#getProfileInfo}.
+#
+# <p>Characters consumed by the DFA fast path ({@link #execDFA}) are counted
+# in bulk, so profiling doesn't change which path the lexer takes.</p>
+#
+import time
+from antlr4.InputStream import InputStream
+from antlr4.Lexer import Lexer
+from antlr4.Token import Token
+from antlr4.atn.ATNConfigSet import ATNConfigSet
+from antlr4.atn.ATNState import RuleStopState
+from antlr4.atn.LexerActionExecutor import LexerActionExecutor
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator, SimState
+from antlr4.atn.LexerProfileInfo import LexerModeInfo, LexerRuleInfo
+from antlr4.dfa.DFAState import DFAState
+
+
+class ProfilingLexerATNSimulator(LexerATNSimulator):
+    __slots__ = ('modes', 'rules', 'acceptedRule', 'acceptRules')
+
+    MAX_ACCEPT_RULES = 1024
+
+    def __init__(self, lexer:Lexer):
+        interp = lexer._interp
+        super().__init__(lexer, interp.atn, interp.decisionToDFA, interp.sharedContextCache)
+        self.copyState(interp)
+        self.fastPath = interp.fastPath
+        self.modes = [ LexerModeInfo(i) for i in range(0, len(self.atn.modeToStartState)) ]
+        self.rules = [ LexerRuleInfo(i) for i in range(0, len(self.atn.ruleToStartState)) ]
+        # the rule that matched the current token, or -1
+        self.acceptedRule = -1
+        # accept DFA state id -> (state, rule index)
+        self.acceptRules = dict()
+
+    def match(self, input:InputStream, mode:int):
+        info = self.modes[mode]
+        dfaTransitions = info.DFA_Transitions
+        atnTransitions = info.ATN_Transitions
+        self.acceptedRule = -1
+        start = time.perf_counter_ns()
+        try:
+            return super().match(input, mode)
+        finally:
+            elapsed = time.perf_counter_ns() - start
+            info.matches += 1
+            info.timeInMatch += elapsed
+            if self.acceptedRule >= 0:
+                rule = self.rules[self.acceptedRule]
+                rule.tokens += 1
+                rule.timeInMatch += elapsed
+                rule.DFA_Transitions += info.DFA_Transitions - dfaTransitions
+                rule.ATN_Transitions += info.ATN_Transitions - atnTransitions
+
+    def matchATN(self, input:InputStream):
+        self.modes[self.mode].startStateComputations += 1
+        return super().matchATN(input)
+
+    def execDFA(self, input:InputStream, s:DFAState):
+        index = input.index
+        s = super().execDFA(input, s)
+        n = input.index - index
+        info = self.modes[self.mode]
+        info.DFA_Transitions += n
+        info.DFA_Chars += n
+        return s
+
+    def getExistingTargetState(self, s:DFAState, t:int):
+        target = super().getExistingTargetState(s, t)
+        if target is not None:
+            info = self.modes[self.mode]
+            info.DFA_Transitions += 1
+            if target is not self.ERROR and t != Token.EOF:
+                info.DFA_Chars += 1
+        return target
+
+    def computeTargetState(self, input:InputStream, s:DFAState, t:int):
+        target = super().computeTargetState(input, s, t)
+        info = self.modes[self.mode]
+        info.ATN_Transitions += 1
+        if target is not self.ERROR and t != Token.EOF:
+            info.ATN_Chars += 1
+        return target
+
+    def failOrAccept(self, prevAccept:SimState, input:InputStream, reach:ATNConfigSet, t:int):
+        if prevAccept.dfaState is not None:
+            self.acceptedRule = self.getAcceptedRule(prevAccept.dfaState)
+        return super().failOrAccept(prevAccept, input, reach, t)
+
+    def accept(self, input:InputStream, lexerActionExecutor:LexerActionExecutor, startIndex:int, index:int, line:int, charPos:int):
+        if lexerActionExecutor is None or self.acceptedRule < 0:
+            super().accept(input, lexerActionExecutor, startIndex, index, line, charPos)
+            return
+        start = time.perf_counter_ns()
+        try:
+            super().accept(input, lexerActionExecutor, startIndex, index, line, charPos)
+        finally:
+            rule = self.rules[self.acceptedRule]
+            rule.actionExecutions += 1
+            rule.timeInActions += time.perf_counter_ns() - start
+
+    def evaluatePredicate(self, input:InputStream, ruleIndex:int, predIndex:int, speculative:bool):
+        start = time.perf_counter_ns()
+        try:
+            return super().evaluatePredicate(input, ruleIndex, predIndex, speculative)
+        finally:
+            rule = self.rules[ruleIndex]
+            rule.predicateEvals += 1
+            rule.timeInPredicates += time.perf_counter_ns() - start
+
+    # The index of the rule an accept state of the DFA matches.
+    def getAcceptedRule(self, dfaState:DFAState):
+        entry = self.acceptRules.get(id(dfaState), None)
+        if entry is not None and entry[0] is dfaState:
+            return entry[1]
+        ruleIndex = -1
+        for c in dfaState.configs:
+            if isinstance(c.state, RuleStopState):
+                ruleIndex = c.state.ruleIndex
+                break
+        else:
+            # no configurations, e.g. a DFA loaded from a snapshot
+            ruleToTokenType = self.atn.ruleToTokenType
+            if dfaState.prediction in ruleToTokenType:
+                ruleIndex = ruleToTokenType.index(dfaState.prediction)
+        if len(self.acceptRules) >= self.MAX_ACCEPT_RULES:
+            # don't keep states a DFABudget flushed alive
+            self.acceptRules.clear()
+        self.acceptRules[id(dfaState)] = (dfaState, ruleIndex)
+        return ruleIndex
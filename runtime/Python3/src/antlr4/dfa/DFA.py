@@ -2,6 +2,7 @@
 # Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
 # Use of this file is governed by the BSD 3-clause license that
 # can be found in the LICENSE.txt file in the project root.
+import threading
 from antlr4.atn.ATNState import StarLoopEntryState
 
 from antlr4.atn.ATNConfigSet import ATNConfigSet
@@ -11,7 +12,7 @@ from antlr4.error.Errors import IllegalStateException
 
 
 class DFA(object):
-    __slots__ = ('atnStartState', 'decision', '_states', 's0', 'precedenceDfa')
+    __slots__ = ('atnStartState', 'decision', '_states', 's0', 'precedenceDfa', 'lock')
 
     def __init__(self, atnStartState:DecisionState, decision:int=0):
         # From which ATN state did we create this DFA?
@@ -25,6 +26,11 @@ class DFA(object):
         # {@code false}. This is the backing field for {@link #isPrecedenceDfa},
         # {@link #setPrecedenceDfa}.
         self.precedenceDfa = False
+        # Guards changes to {@link #states} and to the edges of the states.
+        # Reads take no lock: a thread that misses a state or an edge that is
+        # being added just computes it again, and {@link #states} keeps the
+        # first copy.
+        self.lock = threading.Lock()
 
         if isinstance(atnStartState, StarLoopEntryState):
             if atnStartState.isPrecedenceDecision:
@@ -73,10 +79,12 @@ class DFA(object):
         # synchronization on s0 here is ok. when the DFA is turned into a
         # precedence DFA, s0 will be initialized once and not updated again
         # s0.edges is never null for a precedence DFA
-        if precedence >= len(self.s0.edges):
-            ext = [None] * (precedence + 1 - len(self.s0.edges))
-            self.s0.edges.extend(ext)
-        self.s0.edges[precedence] = startState
+        with self.lock:
+            edges = self.s0.edges
+            if precedence >= len(edges):
+                ext = [None] * (precedence + 1 - len(edges))
+                edges.extend(ext)
+            edges[precedence] = startState
     #
     # Sets whether this is a precedence DFA. If the specified value differs
     # from the current DFA configuration, the following actions are taken;
@@ -107,6 +115,20 @@ class DFA(object):
                 self.s0 = None
             self.precedenceDfa = precedenceDfa
 
+    # Drop all states, so that the DFA is rebuilt from the ATN as it is used
+    # again. A precedence DFA gets a new, empty precedence start state.
+    def clear(self):
+        with self.lock:
+            self._states = dict()
+            if self.precedenceDfa:
+                precedenceState = DFAState(configs=ATNConfigSet())
+                precedenceState.edges = []
+                precedenceState.isAcceptState = False
+                precedenceState.requiresFullContext = False
+                self.s0 = precedenceState
+            else:
+                self.s0 = None
+
     @property
     def states(self):
         return self._states
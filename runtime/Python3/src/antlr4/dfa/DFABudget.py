@@ -0,0 +1,88 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# Caps the number of states the DFAs of a recognizer may hold.
+#
+# <p>The DFA cache ({@code decisionToDFA}) is shared by every instance of a
+# generated recognizer and normally lives as long as the process, growing
+# with every new combination of lookahead it sees. With a budget installed
+# through {@link Recognizer#setDFABudget}, the simulator checks the total
+# number of states before each prediction ({@link ParserATNSimulator}) or
+# token ({@link LexerATNSimulator}). Once it exceeds {@link #maxStates}, the
+# largest DFAs are flushed with {@link DFA#clear} until at most
+# {@link #retainStates} states remain. Flushed decisions are rebuilt from
+# the ATN the next time they are used.</p>
+#
+# <p>Whole DFAs are dropped rather than single states because states are
+# reachable through the edges of other states; a partially evicted DFA would
+# keep the evicted states alive anyway.</p>
+#
+# <p>A budget applies to the DFAs of the recognizer it is installed on. Since
+# these are shared, install the same budget on every instance of a
+# recognizer class.</p>
+#
+
+
+class DFABudget(object):
+    __slots__ = ('maxStates', 'retainStates', 'pending', 'room', 'checks', 'flushes', 'flushedDFAs',
+                 'evictedStates', 'decisionFlushes')
+
+    # @param maxStates the number of DFA states above which DFAs are flushed
+    # @param retain the fraction of {@code maxStates} kept after a flush
+    def __init__(self, maxStates:int, retain:float=0.5):
+        if maxStates <= 0:
+            raise ValueError("maxStates must be positive")
+        if retain < 0 or retain > 1:
+            raise ValueError("retain must be between 0 and 1")
+        self.maxStates = maxStates
+        self.retainStates = int(maxStates * retain)
+        # The number of states added since the last count, and the number that
+        # can still be added before the states are counted again. Counting is
+        # only needed when {@code pending} exceeds {@code room}.
+        self.pending = 0
+        self.room = maxStates
+        # The number of times the states were counted.
+        self.checks = 0
+        # The number of times the budget was exceeded.
+        self.flushes = 0
+        # The number of DFAs cleared, and the number of states they held.
+        self.flushedDFAs = 0
+        self.evictedStates = 0
+        # decision (or mode) -> number of times its DFA was cleared
+        self.decisionFlushes = dict()
+
+    # Flush DFAs if {@code decisionToDFA} holds more than {@link #maxStates}
+    # states, largest first.
+    #
+    # @return the number of states evicted
+    def enforce(self, decisionToDFA:list):
+        self.checks += 1
+        size = sum(len(dfa.states) for dfa in decisionToDFA)
+        evicted = 0
+        if size > self.maxStates:
+            self.flushes += 1
+            for dfa in sorted(decisionToDFA, key=lambda dfa: len(dfa.states), reverse=True):
+                if size <= self.retainStates:
+                    break
+                n = len(dfa.states)
+                if n == 0:
+                    break
+                dfa.clear()
+                size -= n
+                evicted += n
+                self.flushedDFAs += 1
+                self.decisionFlushes[dfa.decision] = self.decisionFlushes.get(dfa.decision, 0) + 1
+            self.evictedStates += evicted
+        self.pending = 0
+        self.room = self.maxStates - size
+        return evicted
+
+    def __str__(self):
+        return "DFABudget(maxStates=" + str(self.maxStates) + \
+               ", flushes=" + str(self.flushes) + \
+               ", flushedDFAs=" + str(self.flushedDFAs) + \
+               ", evictedStates=" + str(self.evictedStates) + ")"
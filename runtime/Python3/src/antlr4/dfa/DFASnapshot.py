@@ -0,0 +1,553 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# Saves the DFA a recognizer has learned so far to disk, and loads it back
+# into a fresh process so that {@link ParserATNSimulator#adaptivePredict} and
+# {@link LexerATNSimulator#match} start out warm instead of re-learning every
+# decision from the ATN.
+#
+# <p>A snapshot is keyed by a digest of the recognizer's serialized ATN. A
+# snapshot taken for a different version of the grammar is ignored by
+# {@link #load}, so it is always safe to ship a stale file. So is a truncated
+# or otherwise corrupt one: the whole file is decoded before any DFA is
+# replaced, and a file that doesn't decode leaves the DFAs as they were.</p>
+#
+# <p>Typical use is at import time, right after the generated module:</p>
+#
+# <pre>
+# from MyParser import MyParser
+# DFASnapshot(MyParser).load("MyParser.dfa")
+# ...
+# DFASnapshot(MyParser).save("MyParser.dfa")
+# </pre>
+#
+# <p>The encoding follows the serialized ATN: a flat list of integers that
+# refers to shared prediction contexts, semantic contexts and lexer action
+# executors by their index in a table written ahead of the DFA states.</p>
+#
+import hashlib
+import os
+import sys
+from array import array
+
+from antlr4.PredictionContext import PredictionContext, SingletonPredictionContext, ArrayPredictionContext
+from antlr4.atn.ATNConfig import ATNConfig, LexerATNConfig
+from antlr4.atn.ATNConfigSet import ATNConfigSet
+from antlr4.atn.ATNSimulator import ATNSimulator
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from antlr4.atn.LexerAction import LexerIndexedCustomAction
+from antlr4.atn.LexerActionExecutor import LexerActionExecutor
+from antlr4.atn.SemanticContext import SemanticContext, Predicate, PrecedencePredicate, AND, OR
+from antlr4.dfa.DFA import DFA
+from antlr4.dfa.DFAState import DFAState, PredPrediction
+from antlr4.error.Errors import IllegalStateException
+
+
+class DFASnapshot(object):
+    __slots__ = ('recognizer', 'atn', 'decisionToDFA', 'contextCache', 'isLexer', 'digest', 'actionIndex')
+
+    MAGIC = b"ANTLRDFA"
+    VERSION = 2
+
+    # context kinds
+    CONTEXT_EMPTY = 0
+    CONTEXT_SINGLETON = 1
+    CONTEXT_ARRAY = 2
+
+    # semantic context kinds
+    SEMCTX_NONE = 0
+    SEMCTX_PREDICATE = 1
+    SEMCTX_PRECEDENCE = 2
+    SEMCTX_AND = 3
+    SEMCTX_OR = 4
+
+    # edge targets other than a state index
+    EDGE_NONE = -1
+    EDGE_ERROR = -2
+
+    # A recognizer is either a generated lexer/parser class, in which case the
+    # class-level {@code decisionsToDFA} shared by all instances is used, or an
+    # instance, in which case the DFA its interpreter actually uses is.
+    #
+    # @param serializedATN the serialized ATN of the grammar; when omitted it is
+    # read from the {@code serializedATN()} function of the generated module.
+    def __init__(self, recognizer, serializedATN:list=None):
+        from antlr4.Lexer import Lexer
+        self.recognizer = recognizer
+        recognizerClass = recognizer if isinstance(recognizer, type) else type(recognizer)
+        self.isLexer = issubclass(recognizerClass, Lexer)
+        if isinstance(recognizer, type):
+            self.atn = recognizer.atn
+            self.decisionToDFA = recognizer.decisionsToDFA
+            self.contextCache = getattr(recognizer, "sharedContextCache", None)
+        else:
+            self.atn = recognizer._interp.atn
+            self.decisionToDFA = recognizer._interp.decisionToDFA
+            self.contextCache = getattr(recognizer._interp, "sharedContextCache", None)
+        if serializedATN is None:
+            module = sys.modules.get(recognizerClass.__module__, None)
+            factory = getattr(module, "serializedATN", None)
+            if factory is None:
+                raise IllegalStateException("cannot find serializedATN() for " + recognizerClass.__name__)
+            serializedATN = factory()
+        self.digest = self.fingerprint(serializedATN)
+
+    @staticmethod
+    def fingerprint(serializedATN:list):
+        return hashlib.sha1(array('i', serializedATN).tobytes()).digest()
+
+    # Write the current DFA of every decision to {@code fileName}. The file is
+    # written to a temporary name first so concurrent readers never see a
+    # partial snapshot.
+    def save(self, fileName:str):
+        tmpName = fileName + "." + str(os.getpid()) + ".tmp"
+        with open(tmpName, "wb") as file:
+            file.write(self.serialize())
+        os.replace(tmpName, fileName)
+
+    # Load a snapshot written by {@link #save}, replacing the current DFA of
+    # every decision.
+    #
+    # @return {@code true} if the snapshot was loaded; {@code false} if the file
+    # does not exist, was produced for a different grammar or is corrupt.
+    def load(self, fileName:str):
+        try:
+            with open(fileName, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return False
+        return self.deserialize(data)
+
+    def serialize(self):
+        data = array('i', self.encode())
+        if sys.byteorder != "little":
+            data.byteswap()
+        return self.MAGIC + self.digest + data.tobytes()
+
+    def deserialize(self, data:bytes):
+        header = len(self.MAGIC) + len(self.digest)
+        if data[:len(self.MAGIC)] != self.MAGIC or data[len(self.MAGIC):header] != self.digest:
+            return False
+        values = array('i')
+        try:
+            values.frombytes(data[header:])
+        except ValueError:
+            return False
+        if sys.byteorder != "little":
+            values.byteswap()
+        if len(values) < 3 or values[0] != self.VERSION or values[1] != int(self.isLexer) \
+                or values[2] != len(self.decisionToDFA):
+            return False
+        try:
+            decoded, newContexts = self.decode(values)
+        except (IndexError, ValueError):
+            return False
+        if self.contextCache is not None:
+            for ctx in newContexts:
+                self.contextCache.add(ctx)
+        for dfa, states, s0 in decoded:
+            with dfa.lock:
+                dfa._states = states
+                if dfa.precedenceDfa:
+                    dfa.s0.edges = s0
+                else:
+                    dfa.s0 = s0
+        return True
+
+    #
+    # Encoding
+    #
+
+    def encode(self):
+        data = [self.VERSION, int(self.isLexer), len(self.decisionToDFA)]
+        contexts = _Table(self.encodeContext, self.contextDependencies)
+        semanticContexts = _Table(self.encodeSemanticContext, self.semanticContextDependencies)
+        executors = _Table(self.encodeLexerActionExecutor, lambda executor: ())
+        actionIndex = dict()
+        for i, action in enumerate(self.atn.lexerActions or ()):
+            actionIndex.setdefault(action, i)
+        self.actionIndex = actionIndex
+        body = []
+        for dfa in self.decisionToDFA:
+            self.encodeDFA(dfa, body, contexts, semanticContexts, executors)
+        for table in (contexts, semanticContexts, executors):
+            data.append(len(table))
+            data.extend(table.data)
+        data.extend(body)
+        return data
+
+    def encodeDFA(self, dfa:DFA, data:list, contexts, semanticContexts, executors):
+        states = list(dfa._states.values())
+        index = { id(s):i for i, s in enumerate(states) }
+        if dfa.s0 is not None and not dfa.precedenceDfa and id(dfa.s0) not in index:
+            index[id(dfa.s0)] = len(states)
+            states.append(dfa.s0)
+        # edges may reach states that were never registered in _states
+        i = 0
+        while i < len(states):
+            s = states[i]
+            targets = s.edges or ()
+            if s.sparseEdges is not None:
+                targets = list(targets) + list(s.sparseEdges.values())
+            for target in targets:
+                if target is not None and not self.isErrorState(target) and id(target) not in index:
+                    index[id(target)] = len(states)
+                    states.append(target)
+            i += 1
+        data.append(dfa.decision)
+        data.append(len(states))
+        for s in states:
+            self.encodeDFAState(s, data, contexts, semanticContexts, executors)
+        for s in states:
+            self.encodeEdges(s.edges, index, data)
+            self.encodeSparseEdges(s.sparseEdges, index, data)
+        if dfa.precedenceDfa:
+            self.encodeEdges(dfa.s0.edges, index, data)
+        else:
+            data.append(-1 if dfa.s0 is None else index[id(dfa.s0)])
+
+    def encodeDFAState(self, s:DFAState, data:list, contexts, semanticContexts, executors):
+        data.append(s.stateNumber)
+        data.append((1 if s.isAcceptState else 0) | (2 if s.requiresFullContext else 0))
+        data.append(s.prediction)
+        data.append(-1 if s.lexerActionExecutor is None else executors.add(s.lexerActionExecutor))
+        if s.predicates is None:
+            data.append(-1)
+        else:
+            data.append(len(s.predicates))
+            for p in s.predicates:
+                data.append(semanticContexts.add(p.pred))
+                data.append(p.alt)
+        configs = s.configs
+        data.append((1 if configs.fullCtx else 0) | (2 if configs.hasSemanticContext else 0)
+                    | (4 if configs.dipsIntoOuterContext else 0) | (8 if configs.readonly else 0))
+        data.append(configs.uniqueAlt)
+        if configs.conflictingAlts is None:
+            data.append(-1)
+        else:
+            data.append(len(configs.conflictingAlts))
+            data.extend(sorted(configs.conflictingAlts))
+        data.append(len(configs.configs))
+        for c in configs.configs:
+            data.append(c.state.stateNumber)
+            data.append(c.alt)
+            data.append(-1 if c.context is None else contexts.add(c.context))
+            data.append(semanticContexts.add(c.semanticContext))
+            data.append(c.reachesIntoOuterContext)
+            data.append(1 if c.precedenceFilterSuppressed else 0)
+            if self.isLexer:
+                data.append(-1 if c.lexerActionExecutor is None else executors.add(c.lexerActionExecutor))
+                data.append(1 if c.passedThroughNonGreedyDecision else 0)
+
+    def encodeEdges(self, edges:list, index:dict, data:list):
+        if edges is None:
+            data.append(-1)
+            return
+        data.append(len(edges))
+        for target in edges:
+            if target is None:
+                data.append(self.EDGE_NONE)
+            elif self.isErrorState(target):
+                data.append(self.EDGE_ERROR)
+            else:
+                data.append(index[id(target)])
+
+    def encodeSparseEdges(self, edges:dict, index:dict, data:list):
+        if edges is None:
+            data.append(-1)
+            return
+        data.append(len(edges))
+        for symbol, target in edges.items():
+            data.append(symbol)
+            data.append(self.EDGE_ERROR if self.isErrorState(target) else index[id(target)])
+
+    def isErrorState(self, s:DFAState):
+        return s is ATNSimulator.ERROR or s is LexerATNSimulator.ERROR
+
+    def contextDependencies(self, ctx:PredictionContext):
+        if ctx is PredictionContext.EMPTY:
+            return ()
+        elif isinstance(ctx, SingletonPredictionContext):
+            return (ctx.parentCtx,) if ctx.parentCtx is not None else ()
+        else:
+            return [p for p in ctx.parents if p is not None]
+
+    def encodeContext(self, ctx:PredictionContext, table):
+        if ctx is PredictionContext.EMPTY:
+            return [self.CONTEXT_EMPTY]
+        elif isinstance(ctx, SingletonPredictionContext):
+            return [self.CONTEXT_SINGLETON, table.indexOf(ctx.parentCtx), ctx.returnState]
+        data = [self.CONTEXT_ARRAY, len(ctx.returnStates)]
+        for parent, returnState in zip(ctx.parents, ctx.returnStates):
+            data.append(table.indexOf(parent))
+            data.append(returnState)
+        return data
+
+    def semanticContextDependencies(self, ctx:SemanticContext):
+        if isinstance(ctx, (AND, OR)):
+            return ctx.opnds
+        return ()
+
+    def encodeSemanticContext(self, ctx:SemanticContext, table):
+        if ctx is SemanticContext.NONE:
+            return [self.SEMCTX_NONE]
+        elif isinstance(ctx, Predicate):
+            return [self.SEMCTX_PREDICATE, ctx.ruleIndex, ctx.predIndex, 1 if ctx.isCtxDependent else 0]
+        elif isinstance(ctx, PrecedencePredicate):
+            return [self.SEMCTX_PRECEDENCE, ctx.precedence]
+        data = [self.SEMCTX_AND if isinstance(ctx, AND) else self.SEMCTX_OR, len(ctx.opnds)]
+        data.extend(table.indexOf(opnd) for opnd in ctx.opnds)
+        return data
+
+    def encodeLexerActionExecutor(self, executor:LexerActionExecutor, table):
+        data = [len(executor.lexerActions)]
+        for action in executor.lexerActions:
+            if isinstance(action, LexerIndexedCustomAction):
+                data.append(self.actionIndex[action.action])
+                data.append(action.offset)
+            else:
+                data.append(self.actionIndex[action])
+                data.append(-1)
+        return data
+
+    #
+    # Decoding
+    #
+
+    # Decode the DFA of every decision, without touching the current ones or
+    # the context cache.
+    #
+    # @return a list of (dfa, states, s0) to install, where s0 is the list of
+    # start state edges for a precedence DFA, and the list of decoded
+    # contexts that are not in the context cache yet
+    # @throws IndexError, ValueError if {@code data} is corrupt
+    def decode(self, data:array):
+        p = 3
+        contexts, newContexts, p = self.decodeContexts(data, p)
+        semanticContexts, p = self.decodeSemanticContexts(data, p)
+        executors, p = self.decodeLexerActionExecutors(data, p)
+        errorState = LexerATNSimulator.ERROR if self.isLexer else ATNSimulator.ERROR
+        decoded = []
+        seen = set()
+        for _ in range(len(self.decisionToDFA)):
+            decision = data[p]
+            nstates = data[p+1]
+            p += 2
+            if decision in seen or nstates < 0:
+                raise ValueError("corrupt DFA snapshot")
+            seen.add(decision)
+            dfa = self.item(self.decisionToDFA, decision)
+            states = []
+            for _ in range(nstates):
+                s, p = self.decodeDFAState(data, p, contexts, semanticContexts, executors)
+                states.append(s)
+            for s in states:
+                s.edges, p = self.decodeEdges(data, p, states, errorState)
+                s.sparseEdges, p = self.decodeSparseEdges(data, p, states, errorState)
+            if dfa.precedenceDfa:
+                # s0 is the precedence start state created along with the DFA
+                s0, p = self.decodeEdges(data, p, states, errorState)
+                if s0 is None:
+                    raise ValueError("corrupt DFA snapshot")
+            else:
+                s0 = None if data[p] == -1 else self.item(states, data[p])
+                p += 1
+            decoded.append((dfa, { s:s for s in states }, s0))
+        if p != len(data):
+            raise ValueError("corrupt DFA snapshot")
+        return decoded, newContexts
+
+    # {@code items[i]}, refusing the negative indexes that Python would take
+    # from the end.
+    def item(self, items:list, i:int):
+        if i < 0:
+            raise IndexError("corrupt DFA snapshot")
+        return items[i]
+
+    # Contexts already in the cache are shared; the others are only added to
+    # it by {@link #deserialize} once the whole snapshot is decoded.
+    def decodeContexts(self, data:array, p:int):
+        contexts = []
+        newContexts = []
+        count = data[p]
+        p += 1
+        for _ in range(count):
+            kind = data[p]
+            if kind == self.CONTEXT_EMPTY:
+                ctx = PredictionContext.EMPTY
+                p += 1
+            elif kind == self.CONTEXT_SINGLETON:
+                parent = None if data[p+1] == -1 else self.item(contexts, data[p+1])
+                ctx = SingletonPredictionContext.create(parent, data[p+2])
+                p += 3
+            else:
+                n = data[p+1]
+                p += 2
+                parents = [ None if data[p+2*i] == -1 else self.item(contexts, data[p+2*i]) for i in range(n) ]
+                returnStates = [ data[p+2*i+1] for i in range(n) ]
+                ctx = ArrayPredictionContext(parents, returnStates)
+                p += 2*n
+            if self.contextCache is not None:
+                existing = self.contextCache.get(ctx)
+                if existing is None:
+                    newContexts.append(ctx)
+                else:
+                    ctx = existing
+            contexts.append(ctx)
+        return contexts, newContexts, p
+
+    def decodeSemanticContexts(self, data:array, p:int):
+        contexts = []
+        count = data[p]
+        p += 1
+        for _ in range(count):
+            kind = data[p]
+            if kind == self.SEMCTX_NONE:
+                ctx = SemanticContext.NONE
+                p += 1
+            elif kind == self.SEMCTX_PREDICATE:
+                ctx = Predicate(data[p+1], data[p+2], data[p+3] != 0)
+                p += 4
+            elif kind == self.SEMCTX_PRECEDENCE:
+                ctx = PrecedencePredicate(data[p+1])
+                p += 2
+            else:
+                # operands were already reduced when the context was built;
+                # going through the constructor would reorder them
+                n = data[p+1]
+                ctx = AND.__new__(AND) if kind == self.SEMCTX_AND else OR.__new__(OR)
+                ctx.opnds = [ self.item(contexts, data[p+2+i]) for i in range(n) ]
+                p += 2 + n
+            contexts.append(ctx)
+        return contexts, p
+
+    def decodeLexerActionExecutors(self, data:array, p:int):
+        executors = []
+        count = data[p]
+        p += 1
+        for _ in range(count):
+            n = data[p]
+            p += 1
+            actions = []
+            for _ in range(n):
+                action = self.item(self.atn.lexerActions, data[p])
+                if data[p+1] != -1:
+                    action = LexerIndexedCustomAction(data[p+1], action)
+                actions.append(action)
+                p += 2
+            executors.append(LexerActionExecutor(actions))
+        return executors, p
+
+    def decodeDFAState(self, data:array, p:int, contexts:list, semanticContexts:list, executors:list):
+        s = DFAState(data[p], None)
+        flags = data[p+1]
+        s.isAcceptState = (flags & 1) != 0
+        s.requiresFullContext = (flags & 2) != 0
+        s.prediction = data[p+2]
+        s.lexerActionExecutor = None if data[p+3] == -1 else self.item(executors, data[p+3])
+        npredicates = data[p+4]
+        p += 5
+        if npredicates != -1:
+            s.predicates = []
+            for _ in range(npredicates):
+                s.predicates.append(PredPrediction(self.item(semanticContexts, data[p]), data[p+1]))
+                p += 2
+        flags = data[p]
+        configs = ATNConfigSet((flags & 1) != 0)
+        configs.hasSemanticContext = (flags & 2) != 0
+        configs.dipsIntoOuterContext = (flags & 4) != 0
+        configs.uniqueAlt = data[p+1]
+        nconflicting = data[p+2]
+        p += 3
+        if nconflicting != -1:
+            configs.conflictingAlts = set(data[p:p+nconflicting])
+            p += nconflicting
+        nconfigs = data[p]
+        p += 1
+        states = self.atn.states
+        for _ in range(nconfigs):
+            state = self.item(states, data[p])
+            context = None if data[p+2] == -1 else self.item(contexts, data[p+2])
+            semantic = self.item(semanticContexts, data[p+3])
+            if self.isLexer:
+                executor = None if data[p+6] == -1 else self.item(executors, data[p+6])
+                c = LexerATNConfig(state, data[p+1], context, semantic, executor)
+                c.passedThroughNonGreedyDecision = data[p+7] != 0
+            else:
+                c = ATNConfig(state, data[p+1], context, semantic)
+            c.reachesIntoOuterContext = data[p+4]
+            c.precedenceFilterSuppressed = data[p+5] != 0
+            configs.configs.append(c)
+            p += 8 if self.isLexer else 6
+        if (flags & 8) != 0:
+            configs.setReadonly(True)
+        s.configs = configs
+        return s, p
+
+    def decodeEdges(self, data:array, p:int, states:list, errorState:DFAState):
+        n = data[p]
+        p += 1
+        if n == -1:
+            return None, p
+        edges = []
+        for target in data[p:p+n]:
+            if target == self.EDGE_NONE:
+                edges.append(None)
+            elif target == self.EDGE_ERROR:
+                edges.append(errorState)
+            else:
+                edges.append(self.item(states, target))
+        return edges, p + n
+
+    def decodeSparseEdges(self, data:array, p:int, states:list, errorState:DFAState):
+        n = data[p]
+        p += 1
+        if n == -1:
+            return None, p
+        edges = dict()
+        for i in range(p, p + 2*n, 2):
+            target = data[i+1]
+            edges[data[i]] = errorState if target == self.EDGE_ERROR else self.item(states, target)
+        return edges, p + 2*n
+
+
+# An indexed table of shared objects, written in dependency order so that
+# each entry only refers to entries before it.
+class _Table(object):
+    __slots__ = ('encoder', 'dependencies', 'index', 'data')
+
+    def __init__(self, encoder, dependencies):
+        self.encoder = encoder
+        self.dependencies = dependencies
+        self.index = dict()
+        self.data = []
+
+    def __len__(self):
+        return len(self.index)
+
+    def indexOf(self, obj):
+        return -1 if obj is None else self.index[obj]
+
+    def add(self, obj):
+        i = self.index.get(obj, None)
+        if i is not None:
+            return i
+        # walk dependencies without recursion; contexts can be very deep
+        pending = [obj]
+        while len(pending) > 0:
+            o = pending[-1]
+            if o in self.index:
+                pending.pop()
+                continue
+            missing = [d for d in self.dependencies(o) if d not in self.index]
+            if len(missing) > 0:
+                pending.extend(missing)
+                continue
+            pending.pop()
+            self.data.extend(self.encoder(o, self))
+            self.index[o] = len(self.index)
+        return self.index[obj]
@@ -46,7 +46,7 @@ class PredPrediction(object):
 #/
 class DFAState(object):
     __slots__ = (
-        'stateNumber', 'configs', 'edges', 'isAcceptState', 'prediction',
+        'stateNumber', 'configs', 'edges', 'sparseEdges', 'isAcceptState', 'prediction',
         'lexerActionExecutor', 'requiresFullContext', 'predicates'
     )
 
@@ -56,6 +56,10 @@ class DFAState(object):
         # {@code edges[symbol]} points to target of symbol. Shift up by 1 so (-1)
         #  {@link Token#EOF} maps to {@code edges[0]}.
         self.edges = None
+        # Lexer edges for code points above {@link LexerATNSimulator#MAX_DFA_EDGE},
+        # mapping code point to target state. {@code null} until the first one
+        # is added.
+        self.sparseEdges = None
         self.isAcceptState = False
         # if accept state, what ttype do we match or alt do we predict?
         #  This is set to {@link ATN#INVALID_ALT_NUMBER} when {@link #predicates}{@code !=null} or
@@ -163,6 +163,16 @@ class ParseCancellationException(CancellationException):
 
     pass
 
+# Raised by the parser when its {@link ParseBudget} is used up, or was
+#  cancelled. {@link #reason} is one of the reason constants of
+#  {@link ParseBudget}.
+class ParseBudgetExceededException(Exception):
+
+    def __init__(self, budget, reason:str):
+        super().__init__("parse budget exceeded: " + reason)
+        self.budget = budget
+        self.reason = reason
+
 del Token
 del Lexer
 del Parser
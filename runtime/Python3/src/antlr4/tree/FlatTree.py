@@ -0,0 +1,351 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# A parse tree stored as columns of integers, one entry per node in preorder.
+#
+# <p>A parse tree of {@link ParserRuleContext} objects costs several hundred
+# bytes per node: the context with its fields, its children list and a
+# {@link TerminalNodeImpl} per token. After {@link Parser#setBuildFlatTree}
+# the parser records the tree instead, in arrays of 32-bit integers:</p>
+#
+# <ul>
+# <li>{@link #kinds}: the index of the context class in {@link #classes} for
+# rule nodes, {@link #TERMINAL} or {@link #ERROR} for tokens</li>
+# <li>{@link #parents}: the index of the parent node, -1 for the root</li>
+# <li>{@link #starts}, {@link #stops}: the index of the first and last token
+# of the node in the token stream</li>
+# <li>{@link #sizes}: the number of nodes in the subtree of the node, so the
+# next sibling of node {@code i} is {@code i + sizes[i]}</li>
+# <li>{@link #invokingStates}: the invoking state of rule nodes</li>
+# </ul>
+#
+# <p>Tokens are read from the token stream of the parser, which must keep
+# all tokens, like {@link CommonTokenStream}. Tokens conjured up by error
+# recovery and the exceptions of rules that had an error are kept aside.</p>
+#
+# <p>{@link #getNode} returns a view of a node that is an instance of the
+# generated context class, so listeners, visitors, {@link Trees} and the
+# accessors of the generated class, like {@code ctx.expr(0)}, work as they do
+# on a regular tree. Views are created when they are asked for and are not
+# kept. Labels, arguments, return values and alt numbers of rules are not
+# recorded, and views cannot be changed.</p>
+#
+# <pre>
+# parser.setBuildFlatTree(True)
+# parser.prog()
+# tree = parser.getFlatTree()
+# ParseTreeWalker.DEFAULT.walk(listener, tree.getRoot())
+# </pre>
+#
+from array import array
+from io import StringIO
+from antlr4.tree.Tree import TerminalNodeImpl, ErrorNodeImpl, INVALID_INTERVAL
+
+
+class FlatTree(object):
+    __slots__ = ('parser', 'tokens', 'classes', 'classRules', 'kinds', 'parents', 'starts', 'stops', 'sizes',
+                 'invokingStates', 'exceptions', 'conjured')
+
+    # kinds of token nodes
+    TERMINAL = -1
+    ERROR = -2
+
+    def __init__(self, parser, classes:list, classRules:list):
+        self.parser = parser
+        self.tokens = parser.getTokenStream()
+        # context classes of rule nodes, and the rule index of each
+        self.classes = classes
+        self.classRules = classRules
+        self.kinds = array('i')
+        self.parents = array('i')
+        self.starts = array('i')
+        self.stops = array('i')
+        self.sizes = array('i')
+        self.invokingStates = array('i')
+        # node index -> exception of rules that had an error
+        self.exceptions = dict()
+        # node index -> token conjured up by error recovery
+        self.conjured = dict()
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def isRule(self, i:int):
+        return self.kinds[i] >= 0
+
+    def getRuleIndex(self, i:int):
+        kind = self.kinds[i]
+        return self.classRules[kind] if kind >= 0 else -1
+
+    def getParent(self, i:int):
+        return self.parents[i]
+
+    def getSubtreeSize(self, i:int):
+        return self.sizes[i]
+
+    def getChildCount(self, i:int):
+        n = 0
+        j = i + 1
+        end = i + self.sizes[i]
+        while j < end:
+            n += 1
+            j += self.sizes[j]
+        return n
+
+    # Yield the indexes of the children of node {@code i}.
+    def getChildren(self, i:int):
+        j = i + 1
+        end = i + self.sizes[i]
+        while j < end:
+            yield j
+            j += self.sizes[j]
+
+    # The token of a token node, or the first token of a rule node.
+    def getToken(self, i:int):
+        token = self.conjured.get(i, None)
+        if token is not None:
+            return token
+        index = self.starts[i]
+        return self.tokens.get(index) if index >= 0 else None
+
+    def getStopToken(self, i:int):
+        if self.kinds[i] < 0:
+            return self.getToken(i)
+        index = self.stops[i]
+        return self.tokens.get(index) if index >= 0 else None
+
+    # The text of the tokens in the subtree of node {@code i}, like
+    # {@link RuleContext#getText}.
+    def getText(self, i:int):
+        kinds = self.kinds
+        with StringIO() as buf:
+            for j in range(i, i + self.sizes[i]):
+                if kinds[j] < 0:
+                    buf.write(self.getToken(j).text)
+            return buf.getvalue()
+
+    def getRoot(self):
+        return self.getNode(0) if len(self.kinds) > 0 else None
+
+    # A view of node {@code i}: an instance of the context class of a rule
+    # node, or a {@link TerminalNodeImpl} or {@link ErrorNodeImpl}.
+    def getNode(self, i:int):
+        kind = self.kinds[i]
+        if kind >= 0:
+            cls = viewClass(self.classes[kind])
+            node = cls.__new__(cls)
+            node.tree = self
+            node.index = i
+            node.parser = self.parser
+            return node
+        node = TerminalNodeImpl(self.getToken(i)) if kind == self.TERMINAL else ErrorNodeImpl(self.getToken(i))
+        node.parentCtx = self.getNode(self.parents[i])
+        return node
+
+
+# Overrides the fields and child access of {@link ParserRuleContext} for
+# views of the rule nodes of a {@link FlatTree}. A view class derives from
+# this class and the generated context class.
+class FlatRuleContext(object):
+    __slots__ = ()
+
+    @property
+    def parentCtx(self):
+        parent = self.tree.parents[self.index]
+        return self.tree.getNode(parent) if parent >= 0 else None
+
+    @property
+    def invokingState(self):
+        return self.tree.invokingStates[self.index]
+
+    @property
+    def children(self):
+        if self.tree.sizes[self.index] == 1:
+            return None
+        return list(self.getChildren())
+
+    @property
+    def start(self):
+        return self.tree.getToken(self.index)
+
+    @property
+    def stop(self):
+        return self.tree.getStopToken(self.index)
+
+    @property
+    def exception(self):
+        return self.tree.exceptions.get(self.index, None)
+
+    def getParent(self):
+        return self.parentCtx
+
+    def getChildCount(self):
+        return self.tree.getChildCount(self.index)
+
+    def getChild(self, i:int, ttype:type = None):
+        for child in self.tree.getChildren(self.index):
+            if ttype is None:
+                if i == 0:
+                    return self.tree.getNode(child)
+            else:
+                node = self.tree.getNode(child)
+                if not isinstance(node, ttype):
+                    continue
+                if i == 0:
+                    return node
+            i -= 1
+        return None
+
+    def getChildren(self, predicate = None):
+        for child in self.tree.getChildren(self.index):
+            node = self.tree.getNode(child)
+            if predicate is not None and not predicate(node):
+                continue
+            yield node
+
+    def getText(self):
+        return self.tree.getText(self.index)
+
+    def getSourceInterval(self):
+        tree = self.tree
+        start = tree.starts[self.index]
+        stop = tree.stops[self.index]
+        if start < 0 or stop < 0:
+            return INVALID_INTERVAL
+        return (start, stop)
+
+    def __eq__(self, other):
+        return isinstance(other, FlatRuleContext) and self.tree is other.tree and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.tree), self.index))
+
+
+# context class -> view class
+_viewClasses = dict()
+
+def viewClass(ctxClass:type):
+    cls = _viewClasses.get(ctxClass, None)
+    if cls is None:
+        cls = type(ctxClass.__name__, (FlatRuleContext, ctxClass), { '__slots__': ('tree', 'index'),
+                                                                     '__module__': ctxClass.__module__ })
+        cls = _viewClasses.setdefault(ctxClass, cls)
+    return cls
+
+
+# Records the parse events of a {@link Parser} in postorder and turns them
+# into a {@link FlatTree} when the start rule returns.
+#
+# <p>The context class of a rule is taken when the rule ends, since
+# labeled alternatives replace the context after the rule starts.</p>
+class FlatTreeBuilder(object):
+    __slots__ = ('parser', 'tree', 'classIndexes', 'classes', 'classRules', 'kinds', 'starts', 'stops', 'sizes',
+                 'invokingStates', 'exceptions', 'conjured', 'open')
+
+    def __init__(self, parser):
+        self.parser = parser
+        # the tree of the last start rule
+        self.tree = None
+        self.classIndexes = dict()
+        self.classes = []
+        self.classRules = []
+        # the index of the first node of each open rule
+        self.open = []
+        self.clear()
+
+    def clear(self):
+        self.kinds = array('i')
+        self.starts = array('i')
+        self.stops = array('i')
+        self.sizes = array('i')
+        self.invokingStates = array('i')
+        self.exceptions = dict()
+        self.conjured = dict()
+        del self.open[:]
+
+    def enterRule(self):
+        if len(self.open) == 0:
+            self.clear()
+        self.open.append(len(self.kinds))
+
+    # Record {@code ctx}, whose first node is the first node of the open
+    # rule; used directly when a left-recursive rule wraps it in a new context.
+    def closeRule(self, ctx):
+        cls = type(ctx)
+        kind = self.classIndexes.get(cls, None)
+        if kind is None:
+            kind = len(self.classes)
+            self.classIndexes[cls] = kind
+            self.classes.append(cls)
+            self.classRules.append(ctx.getRuleIndex())
+        index = len(self.kinds)
+        if ctx.exception is not None:
+            self.exceptions[index] = ctx.exception
+        self.kinds.append(kind)
+        self.starts.append(ctx.start.tokenIndex if ctx.start is not None else -1)
+        self.stops.append(ctx.stop.tokenIndex if ctx.stop is not None else -1)
+        self.sizes.append(index - self.open[-1] + 1)
+        self.invokingStates.append(ctx.invokingState if ctx.invokingState is not None else -1)
+
+    def exitRule(self, ctx):
+        self.closeRule(ctx)
+        self.open.pop()
+        if len(self.open) == 0:
+            self.tree = self.build()
+
+    def visitTerminal(self, token, error:bool):
+        if len(self.open) == 0:
+            return
+        index = len(self.kinds)
+        if token.tokenIndex < 0:
+            self.conjured[index] = token
+        self.kinds.append(FlatTree.ERROR if error else FlatTree.TERMINAL)
+        self.starts.append(token.tokenIndex)
+        self.stops.append(token.tokenIndex)
+        self.sizes.append(1)
+        self.invokingStates.append(-1)
+
+    # Reorder the recorded nodes into preorder.
+    def build(self):
+        tree = FlatTree(self.parser, list(self.classes), list(self.classRules))
+        n = len(self.kinds)
+        kinds, starts, stops, sizes, invokingStates = self.kinds, self.starts, self.stops, self.sizes, self.invokingStates
+        zeros = array('i', [0]) * n
+        tree.kinds = array('i', zeros)
+        tree.parents = array('i', zeros)
+        tree.starts = array('i', zeros)
+        tree.stops = array('i', zeros)
+        tree.sizes = array('i', zeros)
+        tree.invokingStates = zeros
+        # (postorder index, preorder index of the parent), roots last to first
+        stack = []
+        i = n - 1
+        while i >= 0:
+            stack.append((i, -1))
+            i -= sizes[i]
+        p = 0
+        while len(stack) > 0:
+            i, parent = stack.pop()
+            tree.kinds[p] = kinds[i]
+            tree.parents[p] = parent
+            tree.starts[p] = starts[i]
+            tree.stops[p] = stops[i]
+            tree.sizes[p] = sizes[i]
+            tree.invokingStates[p] = invokingStates[i]
+            if i in self.exceptions:
+                tree.exceptions[p] = self.exceptions[i]
+            if i in self.conjured:
+                tree.conjured[p] = self.conjured[i]
+            # push the children last to first, so the first is visited next
+            j = i - 1
+            end = i - sizes[i]
+            while j > end:
+                stack.append((j, p))
+                j -= sizes[j]
+            p += 1
+        self.clear()
+        return tree
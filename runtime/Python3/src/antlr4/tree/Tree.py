@@ -7,6 +7,7 @@
 # The basic notion of a tree has a parent, a payload, and a list of children.
 #  It is the most abstract interface for all the trees used by ANTLR.
 #/
+from types import GeneratorType
 from antlr4.Token import Token
 
 INVALID_INTERVAL = (-1, -2)
@@ -33,18 +34,35 @@ class ParseTreeVisitor(object):
     def visit(self, tree):
         return tree.accept(self)
 
+    # Visit the children of {@code node} and aggregate their results.
+    #
+    # <p>Children whose {@code accept} would just call back into this method,
+    # which is the case for contexts of grammars generated without a visitor,
+    # are visited from an explicit stack instead of recursively, unless a
+    # subclass overrides this method. Deep trees then only recurse as far as
+    # the visit methods of the subclass do; {@link IterativeParseTreeVisitor}
+    # does not recurse at all.</p>
     def visitChildren(self, node):
-        result = self.defaultResult()
-        n = node.getChildCount()
-        for i in range(n):
-            if not self.shouldVisitNextChild(node, result):
+        from antlr4.RuleContext import RuleContext
+        inline = type(self).visitChildren is ParseTreeVisitor.visitChildren
+        # [node, number of children, next child, result]
+        frames = [ [node, node.getChildCount(), 0, self.defaultResult()] ]
+        while True:
+            frame = frames[-1]
+            node, n, i, result = frame
+            if i < n and self.shouldVisitNextChild(node, result):
+                frame[2] = i + 1
+                c = node.getChild(i)
+                if inline and type(c).accept is RuleContext.accept:
+                    frames.append([c, c.getChildCount(), 0, self.defaultResult()])
+                else:
+                    frame[3] = self.aggregateResult(result, c.accept(self))
+                continue
+            frames.pop()
+            if len(frames) == 0:
                 return result
-
-            c = node.getChild(i)
-            childResult = c.accept(self)
-            result = self.aggregateResult(result, childResult)
-
-        return result
+            frame = frames[-1]
+            frame[3] = self.aggregateResult(frame[3], result)
 
     def visitTerminal(self, node):
         return self.defaultResult()
@@ -61,6 +79,80 @@ class ParseTreeVisitor(object):
     def shouldVisitNextChild(self, node, currentResult):
         return True
 
+
+#
+# A visitor that keeps the visits in progress on a stack of its own rather
+# than on the thread stack, so trees of any depth can be visited, also with
+# the {@code accept} methods of contexts generated with {@code -visitor}.
+#
+# <p>A visit method either returns its result, or is a generator that yields
+# the trees it wants visited and receives their results:</p>
+#
+# <pre>
+# class Calculator(IterativeParseTreeVisitor, MyVisitor):
+#     def visitAdd(self, ctx):
+#         left = yield ctx.expr(0)
+#         right = yield ctx.expr(1)
+#         return left + right
+#     def visitInt(self, ctx):
+#         return int(ctx.getText())
+# </pre>
+#
+# <p>{@link #visitChildren} is such a generator, so the visit methods of a
+# generated visitor, which return {@code self.visitChildren(ctx)}, need no
+# change; a visit method that uses the result gets it with
+# {@code (yield from self.visitChildren(ctx))}. An exception raised by the
+# visit of a tree is raised at the {@code yield} of that tree. Calling
+# {@link #visit} from a visit method works too, but recurses.</p>
+#
+class IterativeParseTreeVisitor(ParseTreeVisitor):
+
+    def visit(self, tree):
+        result = tree.accept(self)
+        if not isinstance(result, GeneratorType):
+            return result
+        # the visits in progress, each waiting for the tree it yielded
+        stack = [ result ]
+        value = None
+        error = None
+        while True:
+            try:
+                if error is None:
+                    tree = stack[-1].send(value)
+                else:
+                    tree = stack[-1].throw(error)
+            except StopIteration as e:
+                stack.pop()
+                value, error = e.value, None
+            except Exception as e:
+                stack.pop()
+                value, error = None, e
+            else:
+                try:
+                    value, error = tree.accept(self), None
+                except Exception as e:
+                    value, error = None, e
+                if isinstance(value, GeneratorType):
+                    stack.append(value)
+                    value = None
+                continue
+            if len(stack) == 0:
+                if error is not None:
+                    raise error
+                return value
+
+    # A generator that yields the children of {@code node} and returns the
+    # aggregate of their results.
+    def visitChildren(self, node):
+        result = self.defaultResult()
+        n = node.getChildCount()
+        for i in range(n):
+            if not self.shouldVisitNextChild(node, result):
+                break
+            childResult = yield node.getChild(i)
+            result = self.aggregateResult(result, childResult)
+        return result
+
 ParserRuleContext = None
 
 class ParseTreeListener(object):
@@ -188,4 +280,44 @@ class ParseTreeWalker(object):
         ctx.exitRule(listener)
         listener.exitEveryRule(ctx)
 
-ParseTreeWalker.DEFAULT = ParseTreeWalker()
+
+#
+# An iterative (read: non-recursive) pre-order and post-order tree walker that
+# doesn't use the thread stack but heap-based stacks. Makes it possible to
+# process deeply nested parse trees.
+#
+class IterativeParseTreeWalker(ParseTreeWalker):
+
+    def walk(self, listener:ParseTreeListener, t:ParseTree):
+        """
+	    Sends the same events in the same order as {@link ParseTreeWalker#walk}, still through
+	    {@link ParseTreeWalker#enterRule} and {@link ParseTreeWalker#exitRule}, but is only called
+	    once for the whole tree.
+	    @param listener The listener used by the walker to process grammar rules
+	    @param t The parse tree to be walked on
+        """
+        if isinstance(t, ErrorNode):
+            listener.visitErrorNode(t)
+            return
+        elif isinstance(t, TerminalNode):
+            listener.visitTerminal(t)
+            return
+        self.enterRule(listener, t)
+        # the rule nodes being walked, and the iterators over their children
+        nodes = [ t ]
+        children = [ iter(t.getChildren()) ]
+        while len(nodes) > 0:
+            child = next(children[-1], None)
+            if child is None:
+                children.pop()
+                self.exitRule(listener, nodes.pop())
+            elif isinstance(child, ErrorNode):
+                listener.visitErrorNode(child)
+            elif isinstance(child, TerminalNode):
+                listener.visitTerminal(child)
+            else:
+                self.enterRule(listener, child)
+                nodes.append(child)
+                children.append(iter(child.getChildren()))
+
+ParseTreeWalker.DEFAULT = IterativeParseTreeWalker()
@@ -0,0 +1,476 @@
+#
+# Copyright (c) 2012-2017 The ANTLR Project. All rights reserved.
+# Use of this file is governed by the BSD 3-clause license that
+# can be found in the LICENSE.txt file in the project root.
+#
+
+#
+# Encodes a parse tree as a flat array of integers, and decodes it back into
+# contexts of the generated parser classes.
+#
+# <p>Pickling a parse tree copies the whole object graph, including the
+# parser, the token stream and the input, and recurses once per tree level.
+# {@link #serialize} writes the nodes in preorder instead, each with the
+# number of its children, and the tokens of the tree once, in a table that
+# includes their text. Neither direction recurses, so trees of any depth can
+# be sent to another process.</p>
+#
+# <p>Token positions and references to tokens are stored as the difference
+# to the previous one, which keeps almost all numbers small enough for one
+# byte. The few that aren't are replaced by {@link #ESCAPE} and stored in a
+# separate array of 32-bit integers.</p>
+#
+# <p>A rule node keeps its context class (so labeled alternatives decode to
+# their own class), invoking state, alt number, start and stop token, and
+# the fields the generated class adds, such as labels. Field values can be
+# tokens, nodes of the tree, lists of these, {@code None}, booleans, integers
+# and strings; other values, and nodes that are not part of the tree, decode
+# to {@code None}. The exception of a context that had an error is replaced
+# by a {@link RecognitionException} with the same message.</p>
+#
+# <p>Decoded tokens are {@link CommonToken}s without a source; their text is
+# the text the original tokens had.</p>
+#
+# <p>The context classes are named by module and qualified name in the data,
+# and {@link #deserialize} imports those modules. Only decode data from a
+# trusted source, as with pickle. Names that don't resolve to a subclass of
+# {@link ParserRuleContext} are rejected.</p>
+#
+# <pre>
+# data = TreeSerializer().serialize(parser.prog())
+# ...
+# tree = TreeSerializer().deserialize(data)
+# </pre>
+#
+import importlib
+import sys
+from array import array
+from antlr4.ParserRuleContext import ParserRuleContext
+from antlr4.Token import Token, CommonToken
+from antlr4.atn.ATN import ATN
+from antlr4.error.Errors import RecognitionException, IllegalStateException
+from antlr4.tree.Tree import TerminalNode, TerminalNodeImpl, ErrorNode, ErrorNodeImpl
+
+
+class TreeSerializer(object):
+    __slots__ = ('fieldNames', 'classes')
+
+    MAGIC = b"ANTLRTRE"
+    VERSION = 1
+
+    # node kinds
+    NODE_RULE = 0
+    NODE_TERMINAL = 1
+    NODE_ERROR = 2
+    NODE_KIND = 3
+
+    # flags of rule nodes, for the parts most nodes don't have
+    RULE_ALT_NUMBER = 4
+    RULE_EXCEPTION = 8
+    RULE_FIELDS = 16
+
+    # field value kinds
+    VALUE_NONE = 0
+    VALUE_FALSE = 1
+    VALUE_TRUE = 2
+    VALUE_INT = 3
+    VALUE_STRING = 4
+    VALUE_TOKEN = 5
+    VALUE_NODE = 6
+    VALUE_LIST = 7
+
+    # attributes every context has, which are encoded separately
+    CONTEXT_FIELDS = frozenset(('parentCtx', 'invokingState', 'children', 'start', 'stop', 'exception', 'parser'))
+
+    # number of integers per token in the token table
+    TOKEN_SIZE = 8
+
+    # stands for the next value of the wide array
+    ESCAPE = -0x80
+
+    def __init__(self):
+        # context class -> names of the fields it adds
+        self.fieldNames = dict()
+        # (module, qualified name) -> context class
+        self.classes = dict()
+
+    def serialize(self, tree):
+        strings = _StringTable()
+        data = self.encode(tree, strings)
+        data[0:0] = [ len(s) for s in strings.encoded ]
+        ESCAPE = self.ESCAPE
+        wide = array('i', [ v for v in data if v <= ESCAPE or v > 0x7F ])
+        narrow = array('b', [ v if ESCAPE < v <= 0x7F else ESCAPE for v in data ])
+        header = array('i', [self.VERSION, len(narrow), len(wide), len(strings)])
+        if sys.byteorder != "little":
+            header.byteswap()
+            wide.byteswap()
+        return self.MAGIC + header.tobytes() + narrow.tobytes() + wide.tobytes() + b"".join(strings.encoded)
+
+    # Decode a tree written by {@link #serialize}.
+    #
+    # @param parser the value of the {@code parser} field of the decoded
+    # contexts of generated classes
+    def deserialize(self, data:bytes, parser=None):
+        if data[:len(self.MAGIC)] != self.MAGIC:
+            raise IllegalStateException("not a serialized parse tree")
+        p = len(self.MAGIC)
+        header = array('i')
+        header.frombytes(data[p:p+16])
+        if sys.byteorder != "little":
+            header.byteswap()
+        version, size, nwide, nstrings = header
+        if version != self.VERSION:
+            raise IllegalStateException("unsupported parse tree version " + str(version))
+        p += 16
+        values = array('b')
+        values.frombytes(data[p:p+size])
+        p += size
+        if nwide > 0:
+            wide = array('i')
+            wide.frombytes(data[p:p+4*nwide])
+            if sys.byteorder != "little":
+                wide.byteswap()
+            p += 4*nwide
+            wide = iter(wide)
+            ESCAPE = self.ESCAPE
+            values = [ next(wide) if v == ESCAPE else v for v in values ]
+        strings = []
+        for i in range(0, nstrings):
+            n = values[i]
+            strings.append(data[p:p+n].decode("utf-8"))
+            p += n
+        return self.decode(values[nstrings:], strings, parser)
+
+    #
+    # Encoding
+    #
+
+    def encode(self, tree, strings):
+        # number the nodes in preorder, so that fields can refer to nodes
+        # further down the tree
+        nodes = []
+        stack = [ tree ]
+        while len(stack) > 0:
+            node = stack.pop()
+            nodes.append(node)
+            if isinstance(node, ParserRuleContext) and node.children is not None:
+                stack.extend(reversed(node.children))
+        nodeIndex = { id(node):i for i, node in enumerate(nodes) }
+        classes = _Table()
+        tokens = _TokenTable(strings)
+        body = []
+        for node in nodes:
+            if isinstance(node, ParserRuleContext):
+                cls = type(node)
+                altNumber = node.getAltNumber()
+                fields = [ (name, getattr(node, name)) for name in self.getFieldNames(node) ]
+                kind = self.NODE_RULE
+                if altNumber != ATN.INVALID_ALT_NUMBER:
+                    kind |= self.RULE_ALT_NUMBER
+                if node.exception is not None:
+                    kind |= self.RULE_EXCEPTION
+                if len(fields) > 0:
+                    kind |= self.RULE_FIELDS
+                body.append(kind)
+                body.append(classes.add(cls, (cls.__module__, cls.__qualname__)))
+                body.append(-1 if node.invokingState is None else node.invokingState)
+                body.append(tokens.ref(node.start))
+                body.append(tokens.ref(node.stop))
+                body.append(0 if node.children is None else len(node.children))
+                if kind & self.RULE_ALT_NUMBER:
+                    body.append(altNumber)
+                if kind & self.RULE_EXCEPTION:
+                    body.append(strings.add(str(getattr(node.exception, "message", None) or type(node.exception).__name__)))
+                if kind & self.RULE_FIELDS:
+                    body.append(len(fields))
+                    for name, value in fields:
+                        body.append(strings.add(name))
+                        self.encodeValue(value, body, strings, tokens, nodeIndex)
+            elif isinstance(node, TerminalNode):
+                body.append(self.NODE_ERROR if isinstance(node, ErrorNode) else self.NODE_TERMINAL)
+                body.append(tokens.ref(node.symbol))
+            else:
+                raise IllegalStateException("cannot serialize " + type(node).__name__)
+        data = [ len(classes) ]
+        for module, qualName in classes.keys:
+            data.append(strings.add(module))
+            data.append(strings.add(qualName))
+        data.append(len(tokens))
+        data.extend(tokens.data)
+        data.append(len(nodes))
+        data.extend(body)
+        return data
+
+    def encodeValue(self, value, data:list, strings, tokens, nodeIndex:dict):
+        if value is None:
+            data.append(self.VALUE_NONE)
+        elif value is True or value is False:
+            data.append(self.VALUE_TRUE if value else self.VALUE_FALSE)
+        elif isinstance(value, int) and -0x80000000 <= value <= 0x7FFFFFFF:
+            data.append(self.VALUE_INT)
+            data.append(value)
+        elif isinstance(value, str):
+            data.append(self.VALUE_STRING)
+            data.append(strings.add(value))
+        elif isinstance(value, Token):
+            data.append(self.VALUE_TOKEN)
+            data.append(tokens.add(value))
+        elif isinstance(value, (ParserRuleContext, TerminalNode)) and id(value) in nodeIndex:
+            data.append(self.VALUE_NODE)
+            data.append(nodeIndex[id(value)])
+        elif isinstance(value, list):
+            data.append(self.VALUE_LIST)
+            data.append(len(value))
+            for item in value:
+                self.encodeValue(item, data, strings, tokens, nodeIndex)
+        else:
+            data.append(self.VALUE_NONE)
+
+    # The fields of {@code ctx} that its generated class adds, e.g. labels.
+    def getFieldNames(self, ctx:ParserRuleContext):
+        cls = type(ctx)
+        names = self.fieldNames.get(cls, None)
+        if names is None:
+            names = []
+            for c in cls.__mro__:
+                if c is ParserRuleContext:
+                    break
+                slots = c.__dict__.get("__slots__", ())
+                for name in ((slots,) if isinstance(slots, str) else slots):
+                    if name not in self.CONTEXT_FIELDS and name != "__dict__" and name not in names:
+                        names.append(name)
+            self.fieldNames[cls] = names
+        d = getattr(ctx, "__dict__", None)
+        if d:
+            names = names + [ name for name in d if name not in self.CONTEXT_FIELDS and name not in names ]
+        return [ name for name in names if hasattr(ctx, name) ]
+
+    #
+    # Decoding
+    #
+
+    def decode(self, data:array, strings:list, parser):
+        p = 0
+        nclasses = data[p]
+        classes = [ self.getClass(strings[data[p+1+2*i]], strings[data[p+2+2*i]]) for i in range(0, nclasses) ]
+        p += 1 + 2*nclasses
+        ntokens = data[p]
+        p += 1
+        tokens = []
+        prev = CommonToken.__new__(CommonToken)
+        prev.tokenIndex = prev.start = prev.line = 0
+        for i in range(0, ntokens):
+            prev = self.decodeToken(data, p, strings, prev)
+            tokens.append(prev)
+            p += self.TOKEN_SIZE
+        # the token references of the nodes are relative to the previous one,
+        # and shifted by one to make room for None
+        ref = 0
+        nnodes = data[p]
+        p += 1
+        nodes = []
+        fields = []
+        # (context, number of children still to come)
+        stack = []
+        for i in range(0, nnodes):
+            kind = data[p]
+            if kind & self.NODE_KIND == self.NODE_RULE:
+                cls = classes[data[p+1]]
+                node = cls.__new__(cls)
+                node.parentCtx = None
+                node.invokingState = data[p+2]
+                ref += data[p+3]
+                node.start = None if ref == 0 else tokens[ref-1]
+                ref += data[p+4]
+                node.stop = None if ref == 0 else tokens[ref-1]
+                node.exception = None
+                nchildren = data[p+5]
+                node.children = [] if nchildren > 0 else None
+                if hasattr(cls, "parser"):
+                    node.parser = parser
+                p += 6
+                if kind & self.RULE_ALT_NUMBER:
+                    node.setAltNumber(data[p])
+                    p += 1
+                if kind & self.RULE_EXCEPTION:
+                    node.exception = RecognitionException(message=strings[data[p]])
+                    p += 1
+                if kind & self.RULE_FIELDS:
+                    nfields = data[p]
+                    p += 1
+                    for j in range(0, nfields):
+                        name = strings[data[p]]
+                        value, p = self.decodeValue(data, p+1, strings, tokens)
+                        fields.append((node, name, value))
+            else:
+                ref += data[p+1]
+                token = None if ref == 0 else tokens[ref-1]
+                node = ErrorNodeImpl(token) if kind == self.NODE_ERROR else TerminalNodeImpl(token)
+                nchildren = 0
+                p += 2
+            nodes.append(node)
+            if len(stack) > 0:
+                parent = stack[-1]
+                node.parentCtx = parent[0]
+                parent[0].children.append(node)
+                parent[1] -= 1
+                if parent[1] == 0:
+                    stack.pop()
+            if nchildren > 0:
+                stack.append([node, nchildren])
+        for node, name, value in fields:
+            setattr(node, name, self.resolveValue(value, nodes))
+        return nodes[0] if len(nodes) > 0 else None
+
+    def decodeToken(self, data:array, p:int, strings:list, prev:Token):
+        # like CompactTokenList.materialize; CommonToken's constructor would
+        # read the line and column from a lexer
+        t = CommonToken.__new__(CommonToken)
+        t.source = CommonToken.EMPTY_SOURCE
+        t.type = data[p]
+        t.channel = data[p+1]
+        t.tokenIndex = prev.tokenIndex + data[p+2]
+        t.start = prev.start + data[p+3]
+        t.stop = t.start + data[p+4]
+        t.line = prev.line + data[p+5]
+        t.column = data[p+6]
+        t._text = None if data[p+7] == -1 else strings[data[p+7]]
+        return t
+
+    # Decode a field value; references to nodes are resolved once all nodes
+    # exist.
+    def decodeValue(self, data:array, p:int, strings:list, tokens:list):
+        kind = data[p]
+        if kind == self.VALUE_NONE:
+            return None, p+1
+        elif kind == self.VALUE_FALSE:
+            return False, p+1
+        elif kind == self.VALUE_TRUE:
+            return True, p+1
+        elif kind == self.VALUE_INT:
+            return data[p+1], p+2
+        elif kind == self.VALUE_STRING:
+            return strings[data[p+1]], p+2
+        elif kind == self.VALUE_TOKEN:
+            return tokens[data[p+1]], p+2
+        elif kind == self.VALUE_NODE:
+            return _NodeRef(data[p+1]), p+2
+        elif kind == self.VALUE_LIST:
+            n = data[p+1]
+            p += 2
+            values = []
+            for i in range(0, n):
+                value, p = self.decodeValue(data, p, strings, tokens)
+                values.append(value)
+            return values, p
+        else:
+            raise IllegalStateException("unknown field value kind " + str(kind))
+
+    def resolveValue(self, value, nodes:list):
+        if isinstance(value, _NodeRef):
+            return nodes[value.index]
+        elif isinstance(value, list):
+            return [ self.resolveValue(item, nodes) for item in value ]
+        else:
+            return value
+
+    def getClass(self, moduleName:str, qualName:str):
+        cls = self.classes.get((moduleName, qualName), None)
+        if cls is None:
+            cls = importlib.import_module(moduleName)
+            for part in qualName.split("."):
+                cls = getattr(cls, part)
+            if not isinstance(cls, type) or not issubclass(cls, ParserRuleContext):
+                raise IllegalStateException(moduleName + "." + qualName + " is not a parser rule context class")
+            self.classes[(moduleName, qualName)] = cls
+        return cls
+
+
+class _NodeRef(object):
+    __slots__ = 'index'
+
+    def __init__(self, index:int):
+        self.index = index
+
+
+class _Table(object):
+    __slots__ = ('keys', 'index')
+
+    def __init__(self):
+        self.keys = []
+        self.index = dict()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, obj, key):
+        i = self.index.get(obj, None)
+        if i is None:
+            i = len(self.keys)
+            self.index[obj] = i
+            self.keys.append(key)
+        return i
+
+
+class _StringTable(object):
+    __slots__ = ('index', 'encoded')
+
+    def __init__(self):
+        self.index = dict()
+        self.encoded = []
+
+    def __len__(self):
+        return len(self.encoded)
+
+    def add(self, s:str):
+        i = self.index.get(s, None)
+        if i is None:
+            i = len(self.encoded)
+            self.index[s] = i
+            self.encoded.append(s.encode("utf-8"))
+        return i
+
+
+class _TokenTable(object):
+    __slots__ = ('strings', 'index', 'data', 'prev', 'lastRef')
+
+    def __init__(self, strings:_StringTable):
+        self.strings = strings
+        # id(token) -> (token, index); the token is kept so the id stays unique
+        self.index = dict()
+        self.data = []
+        # tokenIndex, start and line of the last token added
+        self.prev = (0, 0, 0)
+        # the last value returned by ref
+        self.lastRef = 0
+
+    def __len__(self):
+        return len(self.index)
+
+    def add(self, token:Token):
+        if token is None:
+            return -1
+        entry = self.index.get(id(token), None)
+        if entry is not None:
+            return entry[1]
+        i = len(self.index)
+        self.index[id(token)] = (token, i)
+        text = token.text
+        tokenIndex = token.tokenIndex if token.tokenIndex is not None else -1
+        line = token.line if token.line is not None else 0
+        prevIndex, prevStart, prevLine = self.prev
+        self.data.extend((token.type, token.channel, tokenIndex - prevIndex, token.start - prevStart,
+                          token.stop - token.start, line - prevLine,
+                          token.column if token.column is not None else -1,
+                          -1 if text is None else self.strings.add(text)))
+        self.prev = (tokenIndex, token.start, line)
+        return i
+
+    # Add {@code token} if needed, and return its index plus one ({@code 0}
+    # for {@code None}), relative to the previous reference.
+    def ref(self, token:Token):
+        ref = self.add(token) + 1
+        delta = ref - self.lastRef
+        self.lastRef = ref
+        return delta
@@ -23,18 +23,28 @@ class Trees(object):
     def toStringTree(cls, t:Tree, ruleNames:list=None, recog:Parser=None):
         if recog is not None:
             ruleNames = recog.ruleNames
-        s = escapeWhitespace(cls.getNodeText(t, ruleNames), False)
-        if t.getChildCount()==0:
-            return s
         with StringIO() as buf:
-            buf.write("(")
-            buf.write(s)
-            buf.write(' ')
-            for i in range(0, t.getChildCount()):
-                if i > 0:
-                    buf.write(' ')
-                buf.write(cls.toStringTree(t.getChild(i), ruleNames))
-            buf.write(")")
+            # nodes still to print, and the separators and parentheses
+            # between them
+            stack = [ t ]
+            while len(stack) > 0:
+                t = stack.pop()
+                if isinstance(t, str):
+                    buf.write(t)
+                    continue
+                s = escapeWhitespace(cls.getNodeText(t, ruleNames), False)
+                n = t.getChildCount()
+                if n==0:
+                    buf.write(s)
+                    continue
+                buf.write("(")
+                buf.write(s)
+                buf.write(' ')
+                stack.append(")")
+                for i in range(n-1, -1, -1):
+                    stack.append(t.getChild(i))
+                    if i > 0:
+                        stack.append(' ')
             return buf.getvalue()
 
     @classmethod
@@ -92,20 +102,22 @@ class Trees(object):
     @classmethod
     def _findAllNodes(cls, t:ParseTree, index:int, findTokens:bool, nodes:list):
         from antlr4.ParserRuleContext import ParserRuleContext
-        # check this node (the root) first
-        if findTokens and isinstance(t, TerminalNode):
-            if t.symbol.type==index:
-                nodes.append(t)
-        elif not findTokens and isinstance(t, ParserRuleContext):
-            if t.ruleIndex == index:
-                nodes.append(t)
-        # check children
-        for i in range(0, t.getChildCount()):
-            cls._findAllNodes(t.getChild(i), index, findTokens, nodes)
+        for t in cls.descendants(t):
+            if findTokens and isinstance(t, TerminalNode):
+                if t.symbol.type==index:
+                    nodes.append(t)
+            elif not findTokens and isinstance(t, ParserRuleContext):
+                if t.getRuleIndex() == index:
+                    nodes.append(t)
 
+    # Return {@code t} and all nodes below it, in preorder.
     @classmethod
     def descendants(cls, t:ParseTree):
-        nodes = [t]
-        for i in range(0, t.getChildCount()):
-            nodes.extend(cls.descendants(t.getChild(i)))
+        nodes = []
+        stack = [t]
+        while len(stack) > 0:
+            t = stack.pop()
+            nodes.append(t)
+            for i in range(t.getChildCount()-1, -1, -1):
+                stack.append(t.getChild(i))
         return nodes
@@ -0,0 +1,34 @@
+import unittest
+from antlr4.atn.ATNDeserializationOptions import ATNDeserializationOptions
+from antlr4.atn.ATNDeserializer import ATNDeserializer
+from expr import ExprLexer, ExprParser
+from TestATNSnapshot import dumpATN
+
+
+class TestATNDeserializer(unittest.TestCase):
+
+    def lazyOptions(self):
+        options = ATNDeserializationOptions()
+        options.lazy = True
+        return options
+
+    def testLazy(self):
+        for module in (ExprLexer, ExprParser):
+            data = module.serializedATN()
+            expected = ATNDeserializer().deserialize(data)
+            atn = ATNDeserializer(self.lazyOptions()).deserialize(data)
+            self.assertIsNotNone(atn.lazyEdges)
+            self.assertEqual([ s.epsilonOnlyTransitions for s in expected.states ],
+                             [ s.epsilonOnlyTransitions for s in atn.states ])
+            atn.materialize()
+            self.assertIsNone(atn.lazyEdges)
+            self.assertEqual(dumpATN(expected), dumpATN(atn))
+
+    def testLoadsUsedRulesOnly(self):
+        atn = ATNDeserializer(self.lazyOptions()).deserialize(ExprParser.serializedATN())
+        argIndex = ExprParser.ExprParser.ruleNames.index("arg")
+        bodyIndex = ExprParser.ExprParser.ruleNames.index("body")
+        start = atn.ruleToStartState[argIndex]
+        self.assertEqual(1, len(start.transitions))
+        self.assertNotIn(argIndex, atn.lazyEdges.ruleStates)
+        self.assertIn(bodyIndex, atn.lazyEdges.ruleStates)
@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+from antlr4.atn.ATNDeserializer import ATNDeserializer
+from antlr4.atn.ATNSnapshot import ATNSnapshot
+from expr import ExprLexer, ExprParser
+
+
+def dumpATN(atn):
+    states = []
+    for s in atn.states:
+        transitions = [ (type(t).__name__, t.target.stateNumber, None if t.label is None else t.label.intervals)
+                        for t in s.transitions ]
+        states.append((type(s).__name__, s.stateNumber, s.ruleIndex, s.epsilonOnlyTransitions, transitions))
+    return states, [ s.stateNumber for s in atn.decisionToState ], \
+        [ s.stateNumber for s in atn.ruleToStartState ], atn.ruleToTokenType, atn.lexerActions
+
+
+class TestATNSnapshot(unittest.TestCase):
+
+    def tearDown(self):
+        ATNSnapshot.uninstall()
+
+    def testInstall(self):
+        with tempfile.TemporaryDirectory() as dir:
+            ATNSnapshot.install(dir, writable=True)
+            for module in (ExprLexer, ExprParser):
+                data = module.serializedATN()
+                expected = ATNDeserializer().deserialize(data)
+                fileName = ATNSnapshot(dir).fileNameFor(data)
+                self.assertTrue(os.path.exists(fileName))
+                atn = ATNDeserializer().deserialize(data)
+                self.assertIsNot(expected, atn)
+                self.assertEqual(dumpATN(expected), dumpATN(atn))
+                self.assertTrue(all(s.atn is atn for s in atn.states))
+
+    def testStaleSnapshot(self):
+        with tempfile.TemporaryDirectory() as dir:
+            snapshots = ATNSnapshot(dir)
+            data = ExprParser.serializedATN()
+            self.assertIsNone(snapshots.load(data))
+            with open(snapshots.fileNameFor(data), "wb") as file:
+                file.write(b"garbage")
+            self.assertIsNone(snapshots.load(data))
@@ -0,0 +1,148 @@
+import asyncio
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from antlr4 import InputStream, CommonTokenStream
+from antlr4.AsyncCharStream import AsyncCharStream
+from antlr4.AsyncParser import AsyncParser
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.ParseBudget import ParseBudget
+from antlr4.error.Errors import IllegalStateException, ParseBudgetExceededException
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+class TestAsyncParser(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1); y; ; }\ndef g(x) { return 1+2*x/3; }\n"
+
+    def parser(self, input):
+        lexer = ExprLexer(input)
+        lexer._factory = CommonTokenFactory(copyText=True)
+        parser = ExprParser(CommonTokenStream(lexer))
+        parser.removeErrorListeners()
+        return parser
+
+    def expected(self, text):
+        parser = self.parser(InputStream(text))
+        return parser.prog().toStringTree(recog=parser)
+
+    def reader(self, text, eof=True):
+        reader = asyncio.StreamReader()
+        reader.feed_data(text.encode())
+        if eof:
+            reader.feed_eof()
+        return reader
+
+    def testParse(self):
+        text = self.INPUT * 20
+
+        async def main():
+            parser = self.parser(InputStream(text))
+            parser.isolateDFACache()
+            budget = ParseBudget()
+            parser.setParseBudget(budget)
+            asyncParser = AsyncParser(parser, interval=10)
+            work = asyncParser.budget
+            # the parser work done before each turn of another task
+            turns = []
+
+            def total():
+                return work.tokens + work.predictions + work.closureOperations
+
+            async def ticker():
+                while True:
+                    turns.append(total())
+                    # lets the parser thread run to the end of its slice
+                    time.sleep(0.0002)
+                    await asyncio.sleep(0)
+
+            task = asyncio.ensure_future(ticker())
+            await asyncio.sleep(0)
+            tree = await asyncParser.parse("prog")
+            task.cancel()
+            self.assertIs(budget, parser.getParseBudget())
+            return tree.toStringTree(recog=parser), turns, work
+
+        tree, turns, work = asyncio.run(main())
+        self.assertEqual(self.expected(text), tree)
+        # the other task got a turn after every slice of the parse, and a
+        # slice is at most interval tokens, predictions and closure
+        # operations each
+        self.assertTrue(work.checks > 10)
+        self.assertTrue(len(turns) > work.checks)
+        gaps = [ b - a for a, b in zip(turns, turns[1:]) ]
+        self.assertTrue(max(gaps) <= 3 * 10, max(gaps))
+        self.assertTrue(work.tokens + work.predictions + work.closureOperations - turns[-1] <= 3 * 10)
+
+    def testConcurrent(self):
+        # each parse has a thread of its own, so more parses than workers of
+        # the default executor can wait between their slices
+        async def main():
+            loop = asyncio.get_running_loop()
+            loop.set_default_executor(ThreadPoolExecutor(max_workers=2))
+            parsers = [ self.parser(InputStream(self.INPUT * 5)) for i in range(6) ]
+            trees = await asyncio.wait_for(asyncio.gather(*[ AsyncParser(p, interval=5).parse("prog")
+                                                             for p in parsers ]), 30)
+            return [ tree.toStringTree(recog=p) for p, tree in zip(parsers, trees) ]
+
+        self.assertEqual([ self.expected(self.INPUT * 5) ] * 6, asyncio.run(main()))
+
+    def testStreamReader(self):
+        text = self.INPUT * 10
+
+        async def main():
+            reader = asyncio.StreamReader()
+            parser = self.parser(AsyncCharStream(reader, bufferSize=16))
+
+            async def feed():
+                data = text.encode()
+                for i in range(0, len(data), 50):
+                    reader.feed_data(data[i:i+50])
+                    await asyncio.sleep(0.001)
+                reader.feed_eof()
+
+            feeder = asyncio.ensure_future(feed())
+            tree = await AsyncParser(parser).parse("prog")
+            await feeder
+            return tree.toStringTree(recog=parser)
+
+        self.assertEqual(self.expected(text), asyncio.run(main()))
+
+    def testCancel(self):
+        async def main():
+            # waits for data that never comes
+            parser = self.parser(AsyncCharStream(self.reader(self.INPUT, eof=False)))
+            task = asyncio.ensure_future(AsyncParser(parser).parse("prog"))
+            await asyncio.sleep(0.05)
+            self.assertFalse(task.done())
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # stops in the middle of parsing
+            parser = self.parser(InputStream(self.INPUT * 1000))
+            task = asyncio.ensure_future(AsyncParser(parser, interval=1).parse("prog"))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertTrue(parser.getTokenStream().index < 40 * 1000)
+
+        asyncio.run(main())
+
+    def testLimits(self):
+        async def main():
+            parser = self.parser(InputStream(self.INPUT))
+            with self.assertRaises(ParseBudgetExceededException):
+                await AsyncParser(parser, maxTokens=10).parse("prog")
+            with self.assertRaises(ValueError):
+                await AsyncParser(parser).parse("nosuchrule")
+            # only a parse of an AsyncParser can read the stream
+            parser = self.parser(AsyncCharStream(self.reader(self.INPUT)))
+            with self.assertRaises(IllegalStateException):
+                parser.prog()
+
+        asyncio.run(main())
+
+
+if __name__ == '__main__':
+    unittest.main()
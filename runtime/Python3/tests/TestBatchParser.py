@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import unittest
+from antlr4 import InputStream, CommonTokenStream, ParseTreeListener, ParseTreeWalker
+from antlr4.BatchParser import BatchParser
+from antlr4.dfa.DFASnapshot import DFASnapshot
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+class FuncNames(ParseTreeListener):
+
+    def __init__(self):
+        self.names = []
+
+    def enterEveryRule(self, ctx):
+        if isinstance(ctx, ExprParser.FuncContext):
+            self.names.append(ctx.ID().getText())
+
+
+def funcNames(fileName, parser, tree):
+    listener = FuncNames()
+    ParseTreeWalker.DEFAULT.walk(listener, tree)
+    return listener.names
+
+
+def failing(fileName, parser, tree):
+    if fileName.endswith("3.expr"):
+        raise ValueError("bad file")
+    return fileName
+
+
+class TestBatchParser(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.fileNames = []
+        for i in range(0, 10):
+            fileName = os.path.join(self.dir, str(i) + ".expr")
+            with open(fileName, "w") as file:
+                file.write("def f" + chr(ord("a") + i) + "(x) { return x*" + str(i) + "; }\n")
+                if i == 7:
+                    file.write("def g(x) { x = ; }\n")
+            self.fileNames.append(fileName)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def expected(self, fileName):
+        with open(fileName) as file:
+            parser = ExprParser(CommonTokenStream(ExprLexer(InputStream(file.read()))))
+        parser.removeErrorListeners()
+        return parser.prog().toStringTree(recog=parser)
+
+    def testOrdered(self):
+        with BatchParser(ExprLexer, ExprParser, "prog", workers=2, chunkSize=3, maxPending=1) as batch:
+            results = list(batch.parse(iter(self.fileNames)))
+        self.assertEqual(list(range(0, 10)), [ r.index for r in results ])
+        self.assertEqual([ self.expected(f) for f in self.fileNames ], [ r.value for r in results ])
+        self.assertEqual([ 7 ], [ r.index for r in results if r.errors ])
+        self.assertTrue(all(r.exception is None for r in results))
+
+    def testUnorderedWithHandler(self):
+        with BatchParser(ExprLexer, ExprParser, "prog", funcNames, workers=3, twoStage=True) as batch:
+            results = list(batch.parse(self.fileNames, ordered=False))
+        self.assertEqual(list(range(0, 10)), sorted(r.index for r in results))
+        for r in results:
+            self.assertEqual("f" + chr(ord("a") + r.index), r.value[0])
+
+    def testExceptions(self):
+        fileNames = self.fileNames + [ os.path.join(self.dir, "missing.expr") ]
+        with BatchParser(ExprLexer, ExprParser, "prog", failing, workers=2) as batch:
+            results = list(batch.parse(fileNames))
+        failed = [ r.index for r in results if r.exception is not None ]
+        self.assertEqual([ 3, 10 ], failed)
+        self.assertIn("ValueError: bad file", results[3].exception)
+        self.assertIn("FileNotFoundError", results[10].exception)
+        self.assertEqual(self.fileNames[4], results[4].value)
+
+    def testSnapshot(self):
+        for f in self.fileNames:
+            self.expected(f)
+        snapshot = os.path.join(self.dir, "ExprParser.dfa")
+        DFASnapshot(ExprParser).save(snapshot)
+        with BatchParser(ExprLexer, ExprParser, "prog", workers=1, parserSnapshot=snapshot) as batch:
+            results = list(batch.parse(self.fileNames))
+        self.assertEqual([ self.expected(f) for f in self.fileNames ], [ r.value for r in results ])
+
+    def testUnknownRule(self):
+        with self.assertRaises(ValueError):
+            BatchParser(ExprLexer, ExprParser, "nosuchrule")
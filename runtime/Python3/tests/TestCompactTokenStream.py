@@ -0,0 +1,43 @@
+import unittest
+from antlr4 import InputStream, CommonTokenStream, CompactTokenStream, Token
+from antlr4.Token import CommonToken
+from antlr4.ListTokenSource import ListTokenSource
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+class TestCompactTokenStream(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1); y; ; }\ndef g(x) { return 1+2*x/3; }\n"
+
+    def parse(self, cls):
+        parser = ExprParser(cls(ExprLexer(InputStream(self.INPUT))))
+        return parser.prog().toStringTree(recog=parser)
+
+    def testParse(self):
+        self.assertEqual(self.parse(CommonTokenStream), self.parse(CompactTokenStream))
+
+    def testTokens(self):
+        expected = CommonTokenStream(ExprLexer(InputStream(self.INPUT)))
+        expected.fill()
+        stream = CompactTokenStream(ExprLexer(InputStream(self.INPUT)))
+        stream.fill()
+        self.assertEqual([ str(t) for t in expected.tokens ], [ str(t) for t in stream.tokens ])
+        self.assertEqual(str(expected.get(5)), str(stream.get(5)))
+        self.assertEqual(expected.getText(), stream.getText())
+        self.assertEqual(expected.getNumberOfOnChannelTokens(), stream.getNumberOfOnChannelTokens())
+
+    def testChannels(self):
+        tokens = []
+        for i, channel in enumerate([0, 1, 1, 0, 1, 0]):
+            t = CommonToken(type=i+1, channel=channel)
+            t.text = "t" + str(i)
+            tokens.append(t)
+        eof = CommonToken(type=Token.EOF)
+        tokens.append(eof)
+        stream = CompactTokenStream(ListTokenSource(tokens))
+        self.assertEqual([1, 4, 6, Token.EOF], [ stream.LA(i) for i in range(1, 5) ])
+        stream.consume()
+        self.assertEqual("t1t2", "".join(t.text for t in stream.getHiddenTokensToLeft(3)))
+        self.assertEqual(["t4"], [ t.text for t in stream.getHiddenTokensToRight(3) ])
+        self.assertEqual(1, stream.LB(1).type)
+        self.assertEqual("t0t1t2t3t4t5", stream.getText())
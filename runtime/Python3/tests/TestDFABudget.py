@@ -0,0 +1,62 @@
+import unittest
+from antlr4 import InputStream, CommonTokenStream
+from antlr4.dfa.DFABudget import DFABudget
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+class TestDFABudget(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1); y; ; }\ndef g(x) { return 1+2*x/3; }\n"
+
+    def parse(self, budget=None, lexerBudget=None):
+        lexer = ExprLexer(InputStream(self.INPUT))
+        if lexerBudget is not None:
+            lexer.setDFABudget(lexerBudget)
+        parser = ExprParser(CommonTokenStream(lexer))
+        if budget is not None:
+            parser.setDFABudget(budget)
+        return parser.prog().toStringTree(recog=parser), parser, lexer
+
+    def size(self, recognizer):
+        return sum(len(dfa.states) for dfa in recognizer._interp.decisionToDFA)
+
+    def testParser(self):
+        expected, parser, _ = self.parse()
+        budget = DFABudget(4, retain=0)
+        for i in range(0, 3):
+            tree, parser, _ = self.parse(budget)
+            self.assertEqual(expected, tree)
+            self.assertIs(budget, parser.getDFABudget())
+        self.assertTrue(budget.flushes > 0)
+        self.assertTrue(budget.evictedStates > 0)
+        self.assertEqual(budget.evictedStates > 0, len(budget.decisionFlushes) > 0)
+        # one prediction may add states past the budget before the next check
+        budget.enforce(parser._interp.decisionToDFA)
+        self.assertTrue(self.size(parser) <= 4)
+
+    def testLexer(self):
+        expected = self.parse()[0]
+        budget = DFABudget(8)
+        tree, _, lexer = self.parse(lexerBudget=budget)
+        self.assertEqual(expected, tree)
+        self.assertTrue(budget.flushes > 0)
+        budget.enforce(lexer._interp.decisionToDFA)
+        self.assertTrue(self.size(lexer) <= 8)
+
+    def testKeepsProfile(self):
+        _, parser, _ = self.parse()
+        budget = DFABudget(1000)
+        parser.setDFABudget(budget)
+        parser.setProfile(True)
+        self.assertIs(budget, parser.getDFABudget())
+        parser.setProfile(False)
+        self.assertIs(budget, parser.getDFABudget())
+
+    def testPrecedenceDFA(self):
+        _, parser, _ = self.parse()
+        dfas = [ dfa for dfa in parser._interp.decisionToDFA if dfa.precedenceDfa ]
+        for dfa in dfas:
+            dfa.clear()
+            self.assertTrue(dfa.precedenceDfa)
+            self.assertEqual([], dfa.s0.edges)
+            self.assertEqual(0, len(dfa.states))
@@ -0,0 +1,54 @@
+import unittest
+from antlr4 import InputStream, CommonTokenStream
+from antlr4.PredictionContext import PredictionContextCache
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+class TestDFACache(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1); y; ; }\ndef g(x) { return 1+2*x/3; }\n"
+
+    def parser(self):
+        return ExprParser(CommonTokenStream(ExprLexer(InputStream(self.INPUT))))
+
+    def size(self, decisionToDFA):
+        return sum(len(dfa.states) for dfa in decisionToDFA)
+
+    def testClearDFACache(self):
+        self.parser().prog()
+        self.assertTrue(self.size(ExprParser.decisionsToDFA) > 0)
+        self.assertTrue(self.size(ExprLexer.decisionsToDFA) > 0)
+        decisionsToDFA = ExprParser.decisionsToDFA
+        ExprParser.clearDFACache()
+        ExprLexer.clearDFACache()
+        self.assertIs(decisionsToDFA, ExprParser.decisionsToDFA)
+        self.assertEqual(0, self.size(ExprParser.decisionsToDFA))
+        self.assertEqual(0, self.size(ExprLexer.decisionsToDFA))
+        self.assertEqual(0, len(ExprParser.sharedContextCache))
+        self.assertTrue(any(dfa.precedenceDfa for dfa in ExprParser.decisionsToDFA))
+        # and it is learned again
+        parser = self.parser()
+        parser.prog()
+        self.assertEqual(0, parser.getNumberOfSyntaxErrors())
+        self.assertTrue(self.size(ExprParser.decisionsToDFA) > 0)
+
+    def testIsolateDFACache(self):
+        parser = self.parser()
+        expected = parser.prog().toStringTree(recog=parser)
+        ExprParser.clearDFACache()
+        parser = self.parser()
+        parser.isolateDFACache()
+        parser._input.tokenSource.isolateDFACache()
+        self.assertIsNot(ExprParser.decisionsToDFA, parser._interp.decisionToDFA)
+        self.assertIsNot(ExprParser.sharedContextCache, parser._interp.sharedContextCache)
+        self.assertEqual(expected, parser.prog().toStringTree(recog=parser))
+        self.assertTrue(self.size(parser._interp.decisionToDFA) > 0)
+        self.assertEqual(0, self.size(ExprParser.decisionsToDFA))
+
+    def testPredictionContextCache(self):
+        cache = PredictionContextCache()
+        self.parser().prog()
+        for ctx in ExprParser.sharedContextCache.cache:
+            cache.add(ctx)
+        cache.clear()
+        self.assertEqual(0, len(cache))
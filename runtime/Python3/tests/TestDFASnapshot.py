@@ -0,0 +1,82 @@
+import os
+import tempfile
+import unittest
+from antlr4 import InputStream, CommonTokenStream
+from antlr4.dfa.DFA import DFA
+from antlr4.dfa.DFASnapshot import DFASnapshot
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+class TestDFASnapshot(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1); y; ; }\ndef g(x) { return 1+2*x/3; }\n"
+
+    def parse(self):
+        lexer = ExprLexer(InputStream(self.INPUT))
+        parser = ExprParser(CommonTokenStream(lexer))
+        return parser.prog().toStringTree(recog=parser)
+
+    def dumpDFA(self, recognizer):
+        if recognizer is ExprLexer:
+            return [ dfa.toLexerString() for dfa in recognizer.decisionsToDFA ]
+        return [ dfa.toString(recognizer.literalNames, recognizer.symbolicNames) for dfa in recognizer.decisionsToDFA ]
+
+    def resetDFA(self, recognizer):
+        recognizer.decisionsToDFA[:] = [ DFA(ds, i) for i, ds in enumerate(recognizer.atn.decisionToState) ]
+
+    def testSaveLoad(self):
+        tree = self.parse()
+        with tempfile.TemporaryDirectory() as dir:
+            for recognizer in (ExprLexer, ExprParser):
+                fileName = os.path.join(dir, recognizer.__name__ + ".dfa")
+                DFASnapshot(recognizer).save(fileName)
+                expected = self.dumpDFA(recognizer)
+                self.resetDFA(recognizer)
+                self.assertTrue(DFASnapshot(recognizer).load(fileName))
+                self.assertEqual(expected, self.dumpDFA(recognizer))
+        self.assertEqual(tree, self.parse())
+
+    def testCorruptSnapshot(self):
+        self.parse()
+        with tempfile.TemporaryDirectory() as dir:
+            for recognizer in (ExprLexer, ExprParser):
+                fileName = os.path.join(dir, recognizer.__name__ + ".dfa")
+                DFASnapshot(recognizer).save(fileName)
+                with open(fileName, "rb") as file:
+                    data = file.read()
+                expected = self.dumpDFA(recognizer)
+                states = [ dfa._states for dfa in recognizer.decisionsToDFA ]
+                header = len(DFASnapshot.MAGIC) + 20
+                for size in list(range(header, len(data), 7)) + [ len(data) - 4, len(data) - 3 ]:
+                    with open(fileName, "wb") as file:
+                        file.write(data[:size])
+                    self.assertFalse(DFASnapshot(recognizer).load(fileName), size)
+                    self.assertEqual(expected, self.dumpDFA(recognizer))
+                    for old, dfa in zip(states, recognizer.decisionsToDFA):
+                        self.assertIs(old, dfa._states)
+                with open(fileName, "wb") as file:
+                    file.write(data + data[-4:])
+                self.assertFalse(DFASnapshot(recognizer).load(fileName))
+            # nor does it add to the context cache
+            fileName = os.path.join(dir, "ExprParser.dfa")
+            DFASnapshot(ExprParser).save(fileName)
+            with open(fileName, "rb") as file:
+                data = file.read()
+            cache = ExprParser.sharedContextCache
+            cache.clear()
+            with open(fileName, "wb") as file:
+                file.write(data[:-4])
+            self.assertFalse(DFASnapshot(ExprParser).load(fileName))
+            self.assertEqual(0, len(cache.cache))
+            with open(fileName, "wb") as file:
+                file.write(data)
+            self.assertTrue(DFASnapshot(ExprParser).load(fileName))
+            self.assertTrue(len(cache.cache) > 0)
+
+    def testStaleSnapshot(self):
+        self.parse()
+        with tempfile.TemporaryDirectory() as dir:
+            fileName = os.path.join(dir, "ExprParser.dfa")
+            self.assertFalse(DFASnapshot(ExprParser).load(fileName))
+            DFASnapshot(ExprParser, [4, 1, 2, 3]).save(fileName)
+            self.assertFalse(DFASnapshot(ExprParser).load(fileName))
@@ -0,0 +1,120 @@
+import unittest
+from antlr4 import InputStream, CommonTokenStream, ParserRuleContext, ErrorNode, ParseTreeListener, ParseTreeWalker
+from antlr4.tree.FlatTree import FlatTree
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+class RuleRecorder(ParseTreeListener):
+
+    def __init__(self):
+        self.events = []
+
+    def enterEveryRule(self, ctx):
+        self.events.append("enter " + type(ctx).__name__)
+
+    def exitEveryRule(self, ctx):
+        self.events.append("exit " + type(ctx).__name__)
+
+    def visitTerminal(self, node):
+        self.events.append(node.getText())
+
+    def visitErrorNode(self, node):
+        self.events.append("error " + node.getText())
+
+
+class TestFlatTree(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1)-2; y; ; }\ndef g(x) { return 1+2*x/3; }\n"
+    ERRORS = [ "def f(x) { x = 3 4; }\n", "def f(x) { y = (3; }\n", "def f(x { x; }\n", "def f(x) { x = ; y }\n", "def" ]
+
+    def parse(self, text, flat):
+        parser = ExprParser(CommonTokenStream(ExprLexer(InputStream(text))))
+        parser.removeErrorListeners()
+        parser.setBuildFlatTree(flat)
+        tree = parser.prog()
+        return parser, parser.getFlatTree().getRoot() if flat else tree
+
+    def nodes(self, tree):
+        stack = [ tree ]
+        while len(stack) > 0:
+            node = stack.pop()
+            yield node
+            if isinstance(node, ParserRuleContext) and node.children is not None:
+                stack.extend(reversed(node.children))
+
+    def assertSameTree(self, text):
+        parser, tree = self.parse(text, False)
+        _, flat = self.parse(text, True)
+        self.assertEqual(tree.toStringTree(recog=parser), flat.toStringTree(recog=parser))
+        self.assertEqual(tree.getText(), flat.getText())
+        for a, b in zip(self.nodes(tree), self.nodes(flat)):
+            self.assertTrue(isinstance(b, type(a)))
+            self.assertEqual(a.getSourceInterval(), b.getSourceInterval())
+            if isinstance(a, ParserRuleContext):
+                self.assertEqual(a.invokingState, b.invokingState)
+                self.assertEqual(a.getChildCount(), b.getChildCount())
+                self.assertEqual(a.exception is None, b.exception is None)
+        self.assertEqual(len(list(self.nodes(tree))), len(list(self.nodes(flat))))
+
+    def testSameTree(self):
+        self.assertSameTree(self.INPUT)
+
+    def testErrors(self):
+        for text in self.ERRORS:
+            self.assertSameTree(text)
+
+    def testColumns(self):
+        parser, root = self.parse(self.INPUT, True)
+        tree = parser.getFlatTree()
+        self.assertEqual(-1, tree.getParent(0))
+        self.assertEqual(len(tree), tree.getSubtreeSize(0))
+        self.assertEqual(ExprParser.RULE_prog, tree.getRuleIndex(0))
+        for i in range(1, len(tree)):
+            parent = tree.getParent(i)
+            self.assertTrue(parent < i < parent + tree.getSubtreeSize(parent))
+            self.assertIn(i, tree.getChildren(parent))
+            if tree.isRule(i):
+                self.assertEqual(tree.getNode(i).getRuleIndex(), tree.getRuleIndex(i))
+            else:
+                self.assertEqual(1, tree.getSubtreeSize(i))
+                self.assertEqual(FlatTree.TERMINAL, tree.kinds[i])
+
+    def testViews(self):
+        parser, root = self.parse(self.INPUT, True)
+        self.assertEqual(["f", "g"], [ func.ID().getText() for func in root.func() ])
+        assign = root.func(0).body().stat(0)
+        self.assertIsInstance(assign, ExprParser.AssignContext)
+        self.assertEqual("3+4*(y-1)-2", assign.expr().getText())
+        self.assertIsInstance(assign.expr(), ExprParser.AddSubContext)
+        self.assertIsInstance(assign.expr().expr(0), ExprParser.AddSubContext)
+        self.assertEqual(root.func(0).body(), assign.parentCtx)
+        self.assertIs(parser, assign.parser)
+        self.assertEqual(4, assign.depth())
+        with self.assertRaises(AttributeError):
+            assign.start = None
+
+    def testWalk(self):
+        parser, tree = self.parse(self.INPUT, False)
+        _, flat = self.parse(self.INPUT, True)
+        expected = RuleRecorder()
+        ParseTreeWalker.DEFAULT.walk(expected, tree)
+        actual = RuleRecorder()
+        ParseTreeWalker.DEFAULT.walk(actual, flat)
+        self.assertEqual(expected.events, actual.events)
+
+    def testConjuredToken(self):
+        parser, root = self.parse("def f(x) { y = (3; }\n", True)
+        errors = [ n for n in self.nodes(root) if isinstance(n, ErrorNode) ]
+        self.assertEqual(["<missing ')'>"], [ e.getText() for e in errors ])
+        self.assertEqual(-1, errors[0].symbol.tokenIndex)
+
+    def testTurnOff(self):
+        parser = ExprParser(CommonTokenStream(ExprLexer(InputStream(self.INPUT))))
+        parser.setBuildFlatTree(True)
+        self.assertFalse(parser.buildParseTrees)
+        tree = parser.prog()
+        self.assertIsNone(tree.children)
+        parser.setBuildFlatTree(False)
+        self.assertIsNone(parser.getFlatTree())
+        parser.reset()
+        self.assertIsNotNone(parser.prog().children)
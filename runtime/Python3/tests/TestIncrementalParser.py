@@ -0,0 +1,73 @@
+import random
+import unittest
+from antlr4 import InputStream, CommonTokenStream
+from antlr4.IncrementalParser import IncrementalParser
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+class TestIncrementalParser(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1)-2; y; ; }\ndef g(x) { return 1+2*x/3; }\n"
+
+    def incremental(self, text):
+        incremental = IncrementalParser(ExprLexer, ExprParser, "prog", text)
+        incremental.parser.removeErrorListeners()
+        incremental.lexer.removeErrorListeners()
+        return incremental
+
+    def fullParse(self, text):
+        lexer = ExprLexer(InputStream(text))
+        lexer.removeErrorListeners()
+        parser = ExprParser(CommonTokenStream(lexer))
+        parser.removeErrorListeners()
+        return parser, parser.prog()
+
+    def assertSameParse(self, incremental, tree):
+        parser, expected = self.fullParse(incremental.getText())
+        parser.getTokenStream().fill()
+        self.assertEqual(expected.toStringTree(recog=parser), tree.toStringTree(recog=parser))
+        self.assertEqual([ (t.type, t.channel, t.tokenIndex, t.start, t.stop, t.line, t.column, t.text)
+                           for t in parser.getTokenStream().tokens ],
+                         [ (t.type, t.channel, t.tokenIndex, t.start, t.stop, t.line, t.column, t.text)
+                           for t in incremental.tokens.tokens ])
+        for ctx in self.contexts(tree):
+            for child in ctx.getChildren():
+                if hasattr(child, "parentCtx"):
+                    self.assertIs(ctx, child.parentCtx)
+
+    def contexts(self, tree):
+        stack = [ tree ]
+        while len(stack) > 0:
+            ctx = stack.pop()
+            yield ctx
+            if ctx.children is not None:
+                stack.extend(c for c in ctx.children if hasattr(c, "children"))
+
+    def testReuse(self):
+        incremental = self.incremental(self.INPUT * 20)
+        incremental.parse()
+        self.assertEqual(0, incremental.reuseCount)
+        i = incremental.getText().index("4*")
+        incremental.edit(i, i+1, "44")
+        tree = incremental.parse()
+        self.assertSameParse(incremental, tree)
+        # the other functions are reused, and most of the edited one
+        self.assertTrue(incremental.reuseCount >= 39)
+        # nothing changed
+        tree = incremental.parse()
+        self.assertEqual(1, incremental.reuseCount)
+        self.assertSameParse(incremental, tree)
+
+    def testRandomEdits(self):
+        rand = random.Random(7)
+        pieces = [ "", " ", "x", "1", "+", "*", "(", ")", ";", "\n", "def h(a) { a; }\n", "return", "y = 2;", "{", "}" ]
+        incremental = self.incremental(self.INPUT * 4)
+        incremental.parse()
+        for i in range(150):
+            for j in range(rand.randint(1, 2)):
+                text = incremental.getText()
+                start = rand.randint(0, len(text))
+                stop = min(len(text), start + rand.choice([0, 0, 1, 2, 5]))
+                incremental.edit(start, stop, rand.choice(pieces))
+            tree = incremental.parse()
+            self.assertSameParse(incremental, tree)
@@ -0,0 +1,43 @@
+import unittest
+from antlr4 import InputStream
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from expr.ExprLexer import ExprLexer
+
+
+# Lexes as if the text were in lower case.
+class LowerCaseStream(InputStream):
+
+    def LA(self, offset:int):
+        c = super().LA(offset)
+        return ord(chr(c).lower()) if c > 0 else c
+
+
+class TestLexerATNSimulator(unittest.TestCase):
+
+    def lex(self, text, fastPath=True, streamClass=InputStream):
+        lexer = ExprLexer(streamClass(text))
+        lexer._interp.fastPath = fastPath
+        lexer.removeErrorListeners()
+        return [ (t.type, t.text, t.line, t.column) for t in lexer.getAllTokens() ]
+
+    def testUnicodeEdgesCached(self):
+        text = "def f(x) { xé = 1; } é"
+        expected = self.lex(text)
+        states = [ s for s in ExprLexer.decisionsToDFA[0].states if s.sparseEdges is not None ]
+        self.assertTrue(any(0xe9 in s.sparseEdges for s in states))
+        self.assertTrue(all(min(s.sparseEdges) > LexerATNSimulator.MAX_DFA_EDGE for s in states))
+        self.assertEqual(expected, self.lex(text))
+
+    def testFastPath(self):
+        text = "def f(x) {\n  x = 12+y;\n  return x # 3; é\n}\n"
+        self.lex(text)
+        expected = self.lex(text, fastPath=False)
+        self.assertEqual(expected, self.lex(text))
+
+    def testOverriddenLA(self):
+        # the DFA knows the upper case words as identifiers, but this stream
+        # reads them in lower case
+        self.assertEqual([ (ExprLexer.ID, "DEF"), (ExprLexer.ID, "RETURN") ],
+                         [ t[:2] for t in self.lex("DEF RETURN") ])
+        self.assertEqual([ (ExprLexer.T__0, "DEF"), (ExprLexer.RETURN, "RETURN") ],
+                         [ t[:2] for t in self.lex("DEF RETURN", streamClass=LowerCaseStream) ])
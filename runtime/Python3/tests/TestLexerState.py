@@ -0,0 +1,106 @@
+import pickle
+import random
+import unittest
+from antlr4 import InputStream, CommonTokenStream, Token
+from antlr4.IncrementalInputStream import IncrementalInputStream
+from antlr4.Lexer import LexerState
+from antlr4.Relexer import Relexer
+from TestRelexer import StackLexer
+
+
+class TestLexerState(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1)-2; y; ; }\ndef g(x) {\n  return 1+2*x/3;\n}\n\n"
+
+    def lexer(self, text, lexerClass=StackLexer):
+        lexer = lexerClass(InputStream(text))
+        lexer.removeErrorListeners()
+        return lexer
+
+    def lexAll(self, lexer):
+        tokens = []
+        while True:
+            t = lexer.nextToken()
+            tokens.append(t)
+            if t.type == Token.EOF:
+                return tokens
+
+    def fields(self, tokens):
+        return [ (t.type, t.channel, t.start, t.stop, t.line, t.column, t.text) for t in tokens ]
+
+    def testSnapshotRestore(self):
+        lexer = self.lexer(self.INPUT)
+        for i in range(7):
+            lexer.nextToken()
+        state = lexer.snapshot()
+        self.assertEqual(1, state.line)
+        self.assertEqual((lexer.DEFAULT_MODE,) * 3, state.modeStack)
+        rest = self.fields(self.lexAll(lexer))
+        self.assertTrue(lexer.snapshot().hitEOF)
+        lexer.restore(state)
+        self.assertEqual(rest, self.fields(self.lexAll(lexer)))
+        # in another lexer on the same text, after a round trip
+        state = pickle.loads(pickle.dumps(state))
+        other = self.lexer(self.INPUT)
+        other.restore(state)
+        self.assertEqual(rest, self.fields(self.lexAll(other)))
+        self.assertEqual(state, LexerState(state.index, state.line, state.column, state.mode, list(state.modeStack)))
+
+    def testCheckpoints(self):
+        text = self.INPUT * 20
+        lexer = self.lexer(text)
+        self.assertIsNone(lexer.getCheckpoints())
+        lexer.setCheckpointInterval(3)
+        tokens = self.lexAll(lexer)
+        checkpoints = lexer.getCheckpoints()
+        self.assertEqual(0, checkpoints[0].index)
+        self.assertEqual(list(range(1, 101, 3)), [ c.line for c in checkpoints ])
+        for c in checkpoints:
+            other = self.lexer(text)
+            other.restore(c)
+            rest = self.lexAll(other)
+            self.assertEqual(self.fields([ t for t in tokens if t.start >= c.index or t.type == Token.EOF ]),
+                             self.fields(rest))
+        self.assertIs(checkpoints[2], lexer.getCheckpoint(9))
+        self.assertIs(checkpoints[3], lexer.getCheckpoint(10))
+        self.assertIsNone(lexer.getCheckpoint(0))
+        # lexing again from a checkpoint doesn't add any
+        lexer.restore(checkpoints[5])
+        self.lexAll(lexer)
+        self.assertEqual(34, len(lexer.getCheckpoints()))
+        lexer.discardCheckpoints(checkpoints[10].index - 1)
+        self.assertEqual(10, len(lexer.getCheckpoints()))
+        lexer.restore(checkpoints[5])
+        self.lexAll(lexer)
+        self.assertEqual(checkpoints, lexer.getCheckpoints())
+        lexer.reset()
+        self.assertEqual([], lexer.getCheckpoints())
+        lexer.setCheckpointInterval(0)
+        self.assertIsNone(lexer.getCheckpoints())
+        with self.assertRaises(ValueError):
+            lexer.setCheckpointInterval(-1)
+
+    def testRelexerMovesCheckpoints(self):
+        lexer = StackLexer(IncrementalInputStream(self.INPUT * 20))
+        lexer.removeErrorListeners()
+        lexer.setCheckpointInterval(4)
+        relexer = Relexer(lexer)
+        tokens = CommonTokenStream(relexer)
+        tokens.fill()
+        rand = random.Random(23)
+        for i in range(100):
+            text = relexer.inputStream.strdata
+            start = rand.randrange(len(text) + 1)
+            stop = min(len(text), start + rand.randrange(6))
+            relexer.edit(tokens, start, stop, rand.choice(["", "x", "1\n", "; ", "\n\n", "(", "ab+"]))
+            text = relexer.inputStream.strdata
+            checkpoints = lexer.getCheckpoints()
+            self.assertEqual(sorted(set(c.index for c in checkpoints)), [ c.index for c in checkpoints ])
+            for c in checkpoints[::5]:
+                other = self.lexer(text)
+                other.restore(c)
+                expected = [ t for t in tokens.tokens if t.start >= c.index or t.type == Token.EOF ]
+                self.assertEqual(self.fields(expected), self.fields(self.lexAll(other)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+from antlr4 import CommonTokenStream, FileStream
+from antlr4.MappedFileStream import MappedFileStream
+from expr.ExprLexer import ExprLexer
+
+
+class TestMappedFileStream(unittest.TestCase):
+    TEXT = "def f(x) {\n  x = 1+2;\n  é😀\n}\n"
+
+    def lex(self, stream):
+        lexer = ExprLexer(stream)
+        lexer.removeErrorListeners()
+        tokens = CommonTokenStream(lexer)
+        tokens.fill()
+        return [ str(t) for t in tokens.tokens ]
+
+    def testEncodings(self):
+        with tempfile.TemporaryDirectory() as dir:
+            for encoding, text in (("ascii", "def f(x) { x; }\n"), ("latin-1", "é"), ("utf-8", self.TEXT),
+                                   ("utf-32-le", self.TEXT), ("utf-16", self.TEXT), ("utf-8", "")):
+                fileName = os.path.join(dir, "input.txt")
+                with open(fileName, "wb") as file:
+                    file.write(text.encode(encoding))
+                with MappedFileStream(fileName, encoding) as stream:
+                    expected = FileStream(fileName, encoding)
+                    self.assertEqual(expected.data, list(stream.data))
+                    self.assertEqual(text, str(stream))
+                    self.assertEqual(self.lex(expected), self.lex(stream))
+
+    def testDecodeError(self):
+        with tempfile.TemporaryDirectory() as dir:
+            fileName = os.path.join(dir, "input.txt")
+            with open(fileName, "wb") as file:
+                file.write(b"ab\xe9")
+            self.assertRaises(UnicodeDecodeError, MappedFileStream, fileName)
+            with MappedFileStream(fileName, errors="replace") as stream:
+                self.assertEqual("ab�", str(stream))
@@ -0,0 +1,117 @@
+import unittest
+from antlr4 import InputStream, CommonTokenStream
+from antlr4.ParseBudget import ParseBudget
+from antlr4.error.Errors import ParseBudgetExceededException
+from antlr4.error.ErrorStrategy import BailErrorStrategy
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+# Cancels itself at the given check.
+class CancellingBudget(ParseBudget):
+
+    __slots__ = 'after'
+
+    def __init__(self, after:int, **kwargs):
+        self.after = after
+        super().__init__(**kwargs)
+
+    def checkpoint(self):
+        if self.checks == self.after:
+            self.cancel()
+
+
+class TestParseBudget(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1); y; ; }\ndef g(x) { return 1+2*x/3; }\n"
+
+    def parser(self, text, budget=None):
+        lexer = ExprLexer(InputStream(text))
+        parser = ExprParser(CommonTokenStream(lexer))
+        parser.removeErrorListeners()
+        # closure operations are only needed until the DFA knows the input
+        parser.isolateDFACache()
+        parser.setParseBudget(budget)
+        return parser
+
+    def exceeded(self, text, budget):
+        parser = self.parser(text, budget)
+        with self.assertRaises(ParseBudgetExceededException) as cm:
+            parser.prog()
+        self.assertIs(budget, cm.exception.budget)
+        return cm.exception.reason
+
+    def testWithinBudget(self):
+        parser = self.parser(self.INPUT)
+        expected = parser.prog().toStringTree(recog=parser)
+        budget = ParseBudget(timeout=60, maxTokens=100, maxClosureOperations=100000, maxLookahead=2, checkInterval=5)
+        parser = self.parser(self.INPUT, budget)
+        self.assertIs(budget, parser.getParseBudget())
+        self.assertEqual(expected, parser.prog().toStringTree(recog=parser))
+        self.assertEqual(parser.getTokenStream().index, budget.tokens)
+        self.assertTrue(budget.predictions > 0)
+        self.assertTrue(budget.closureOperations > 0)
+        self.assertTrue(budget.checks > 0)
+        self.assertTrue(budget.remaining() > 0)
+
+    def testMaxTokens(self):
+        budget = ParseBudget(maxTokens=10)
+        self.assertEqual(ParseBudget.TOKENS, self.exceeded(self.INPUT, budget))
+        self.assertEqual(11, budget.tokens)
+        # installing the budget again starts it over
+        budget.maxTokens = 1000
+        self.parser(self.INPUT, budget).prog()
+        self.assertTrue(budget.tokens < 1000)
+
+    def testMaxClosureOperations(self):
+        budget = ParseBudget(maxClosureOperations=20)
+        self.assertEqual(ParseBudget.CLOSURE_OPERATIONS, self.exceeded(self.INPUT, budget))
+        self.assertEqual(21, budget.closureOperations)
+
+    def testMaxLookahead(self):
+        # telling "x = 3" from "x;" takes a second token
+        self.assertEqual(ParseBudget.LOOKAHEAD, self.exceeded(self.INPUT, ParseBudget(maxLookahead=0)))
+        self.parser(self.INPUT, ParseBudget(maxLookahead=1)).prog()
+
+    def testDeadline(self):
+        budget = ParseBudget(timeout=0, checkInterval=1)
+        self.assertEqual(ParseBudget.DEADLINE, self.exceeded(self.INPUT, budget))
+
+    def testCancel(self):
+        budget = ParseBudget()
+        parser = self.parser(self.INPUT, budget)
+        budget.cancel()
+        with self.assertRaises(ParseBudgetExceededException) as cm:
+            parser.prog()
+        self.assertEqual(ParseBudget.CANCELLED, cm.exception.reason)
+        budget = CancellingBudget(3, checkInterval=2)
+        self.assertEqual(ParseBudget.CANCELLED, self.exceeded(self.INPUT * 5, budget))
+        self.assertEqual(3, budget.checks)
+
+    def testErrorRecovery(self):
+        # neither error recovery nor the fallback of a two-stage parse stop it
+        text = "def f(x) { = = = = = = = = = = = = = = = = = = = = ; }\n"
+        self.assertEqual(ParseBudget.TOKENS, self.exceeded(text, ParseBudget(maxTokens=12)))
+        parser = self.parser(self.INPUT, ParseBudget(maxTokens=10))
+        with self.assertRaises(ParseBudgetExceededException):
+            parser.parseWithFallback("prog")
+        parser = self.parser(self.INPUT, ParseBudget(maxTokens=10))
+        parser._errHandler = BailErrorStrategy()
+        with self.assertRaises(ParseBudgetExceededException):
+            parser.prog()
+
+    def testProfile(self):
+        budget = ParseBudget(maxTokens=10)
+        parser = self.parser(self.INPUT, budget)
+        parser.setProfile(True)
+        with self.assertRaises(ParseBudgetExceededException):
+            parser.prog()
+
+    def testInvalid(self):
+        with self.assertRaises(ValueError):
+            ParseBudget(maxTokens=-1)
+        with self.assertRaises(ValueError):
+            ParseBudget(checkInterval=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+import sys
+import unittest
+from antlr4 import InputStream, CommonTokenStream, ParseTreeListener, ParseTreeWalker, IterativeParseTreeWalker, \
+    ParseTreeVisitor, IterativeParseTreeVisitor
+from antlr4.tree.Trees import Trees
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+# the same grammar, generated with -visitor
+import exprvisitor.ExprParser
+from exprvisitor.ExprVisitor import ExprVisitor
+
+
+class EventRecorder(ParseTreeListener):
+
+    def __init__(self):
+        self.events = []
+
+    def enterEveryRule(self, ctx):
+        self.events.append("enter " + type(ctx).__name__)
+
+    def exitEveryRule(self, ctx):
+        self.events.append("exit " + type(ctx).__name__)
+
+    def visitTerminal(self, node):
+        self.events.append(node.getText())
+
+    def visitErrorNode(self, node):
+        self.events.append("error " + node.getText())
+
+
+class RecursiveWalker(ParseTreeWalker):
+
+    def walk(self, listener, t):
+        if t.getChildCount() == 0:
+            return super().walk(listener, t)
+        self.enterRule(listener, t)
+        for child in t.getChildren():
+            self.walk(listener, child)
+        self.exitRule(listener, t)
+
+
+# Counts the calls of walk.
+class CountingWalker(ParseTreeWalker):
+
+    def __init__(self):
+        self.walks = 0
+
+    def walk(self, listener, t):
+        self.walks += 1
+        super().walk(listener, t)
+
+
+class TokenCounter(ParseTreeVisitor):
+
+    def defaultResult(self):
+        return 0
+
+    def aggregateResult(self, aggregate, nextResult):
+        return aggregate + nextResult
+
+    def visitTerminal(self, node):
+        return 1
+
+    def visitErrorNode(self, node):
+        return 1
+
+
+class FirstTokens(TokenCounter):
+
+    def shouldVisitNextChild(self, node, currentResult):
+        return currentResult < 5
+
+
+class IterativeTokenCounter(IterativeParseTreeVisitor, ExprVisitor, TokenCounter):
+    pass
+
+
+class IterativeFirstTokens(IterativeParseTreeVisitor, ExprVisitor, FirstTokens):
+    pass
+
+
+class Calculator(IterativeParseTreeVisitor, ExprVisitor):
+
+    def __init__(self):
+        self.printed = []
+
+    def aggregateResult(self, aggregate, nextResult):
+        # the last result that is not None
+        return aggregate if nextResult is None else nextResult
+
+    def visitAssign(self, ctx):
+        try:
+            return (yield ctx.expr())
+        except NameError:
+            return "undefined"
+
+    def visitAddSub(self, ctx):
+        left = yield ctx.expr(0)
+        right = yield ctx.expr(1)
+        return left + right if ctx.getChild(1).getText() == "+" else left - right
+
+    def visitMulDiv(self, ctx):
+        left = yield ctx.expr(0)
+        right = yield ctx.expr(1)
+        return left * right if ctx.getChild(1).getText() == "*" else left // right
+
+    def visitParens(self, ctx):
+        return (yield ctx.expr())
+
+    def visitPrintExpr(self, ctx):
+        value = yield from self.visitChildren(ctx)
+        self.printed.append(value)
+        return value
+
+    def visitInt(self, ctx):
+        return int(ctx.getText())
+
+    def visitId(self, ctx):
+        raise NameError(ctx.getText())
+
+
+class TestParseTreeWalker(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1)-2; y; ; }\ndef g(x) { return 1+2*x/3 2; }\n"
+
+    def parse(self, text, parserClass=ExprParser):
+        parser = parserClass(CommonTokenStream(ExprLexer(InputStream(text))))
+        parser.removeErrorListeners()
+        return parser, parser.prog()
+
+    def deepInput(self, depth):
+        return "def f(x) { x = " + "1+" * depth + "1; }\n"
+
+    def testSameEvents(self):
+        parser, tree = self.parse(self.INPUT)
+        expected = EventRecorder()
+        RecursiveWalker().walk(expected, tree)
+        for walker in (ParseTreeWalker.DEFAULT, IterativeParseTreeWalker(), ParseTreeWalker()):
+            actual = EventRecorder()
+            walker.walk(actual, tree)
+            self.assertEqual(expected.events, actual.events)
+        self.assertIn("error 2", actual.events)
+        self.assertIsInstance(ParseTreeWalker.DEFAULT, IterativeParseTreeWalker)
+
+    def testWalkOverridden(self):
+        # a subclass of the recursive walker is still called for every node
+        parser, tree = self.parse(self.INPUT)
+        walker = CountingWalker()
+        walker.walk(EventRecorder(), tree)
+        self.assertEqual(len(Trees.descendants(tree)), walker.walks)
+
+    def testDeepTree(self):
+        depth = 3 * sys.getrecursionlimit()
+        parser, tree = self.parse(self.deepInput(depth))
+        listener = EventRecorder()
+        ParseTreeWalker.DEFAULT.walk(listener, tree)
+        self.assertEqual(depth, listener.events.count("enter AddSubContext"))
+        text = "x=" + "1+" * depth + "1;"
+        self.assertIn(text, tree.getText())
+        self.assertIn("(expr (expr (expr (expr (primary 1)) + (expr (primary 1))) +", tree.toStringTree(recog=parser))
+        self.assertEqual(len(Trees.descendants(tree)), len(set(map(id, Trees.descendants(tree)))))
+        self.assertEqual(depth + 1, len(Trees.findAllRuleNodes(tree, ExprParser.RULE_primary)))
+        self.assertEqual(depth + 1, len(Trees.findAllTokenNodes(tree, ExprParser.INT)))
+        self.assertEqual(len(Trees.findAllTokenNodes(tree, ExprParser.ADD)) + depth + 11, TokenCounter().visit(tree))
+
+    def testVisitor(self):
+        parser, tree = self.parse(self.INPUT)
+        self.assertEqual(len([ n for n in Trees.descendants(tree) if n.getChildCount() == 0 ]),
+                         TokenCounter().visit(tree))
+        self.assertEqual(5, FirstTokens().visit(tree))
+
+    def testIterativeVisitor(self):
+        parser, tree = self.parse(self.INPUT, exprvisitor.ExprParser.ExprParser)
+        self.assertEqual(len([ n for n in Trees.descendants(tree) if n.getChildCount() == 0 ]),
+                         IterativeTokenCounter().visit(tree))
+        self.assertEqual(5, IterativeFirstTokens().visit(tree))
+        parser, tree = self.parse("def f(x) { x = 3+4*(5-1)-2; y = 1+(x*2); }",
+                                  exprvisitor.ExprParser.ExprParser)
+        stats = Trees.findAllRuleNodes(tree, ExprParser.RULE_stat)
+        self.assertEqual(17, Calculator().visit(stats[0]))
+        # raised at the yield of the parenthesized expression, caught in visitAssign
+        self.assertEqual("undefined", Calculator().visit(stats[1]))
+        with self.assertRaises(NameError):
+            Calculator().visit(stats[1].expr())
+        parser, tree = self.parse("def f(x) { 2*(3+4); 5; }", exprvisitor.ExprParser.ExprParser)
+        calculator = Calculator()
+        self.assertEqual(5, calculator.visit(tree))
+        self.assertEqual([ 14, 5 ], calculator.printed)
+
+    def testIterativeVisitorDeepTree(self):
+        depth = 3 * sys.getrecursionlimit()
+        parser, tree = self.parse(self.deepInput(depth), exprvisitor.ExprParser.ExprParser)
+        expr = Trees.findAllRuleNodes(tree, ExprParser.RULE_expr)[0]
+        # the generated accept methods make the plain visitor recurse
+        with self.assertRaises(RecursionError):
+            TokenCounter().visit(tree)
+        self.assertEqual(depth + 1, Calculator().visit(expr))
+        self.assertEqual(2 * depth + 1, IterativeTokenCounter().visit(expr))
+
+    def testTrees(self):
+        parser, tree = self.parse(self.INPUT)
+        self.assertEqual("(prog (func def f ( (arg x) , (arg y) ) (body { (stat x = (expr (expr (expr (primary 3)) + "
+                         "(expr (expr (primary 4)) * (expr (primary ( (expr (expr (primary y)) - (expr (primary 1))) ))))"
+                         ") - (expr (primary 2))) ;) (stat (expr (primary y)) ;) (stat ;) })) (func def g ( (arg x) ) "
+                         "(body { (stat return (expr (expr (primary 1)) + (expr (expr (expr (primary 2)) * "
+                         "(expr (primary x))) / (expr (primary 3)))) 2 ;) })))",
+                         tree.toStringTree(recog=parser))
+        self.assertEqual([ "f", "g" ], [ f.ID().getText() for f in Trees.findAllRuleNodes(tree, ExprParser.RULE_func) ])
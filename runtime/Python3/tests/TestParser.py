@@ -0,0 +1,47 @@
+import unittest
+from antlr4 import InputStream, CommonTokenStream, PredictionMode
+from antlr4.error.ErrorListener import ErrorListener
+from antlr4.tree.Tree import ParseTreeListener
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+class CollectingErrorListener(ErrorListener):
+
+    def __init__(self):
+        self.errors = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.errors.append(msg)
+
+
+class TestParser(unittest.TestCase):
+    VALID = "def f(x,y) { x = 3+4*(y-1); y; ; }\n"
+    INVALID = "def f(x,y) { x = 3+; y; }\n"
+
+    def parser(self, text):
+        parser = ExprParser(CommonTokenStream(ExprLexer(InputStream(text))))
+        listener = CollectingErrorListener()
+        parser.removeErrorListeners()
+        parser.addErrorListener(listener)
+        return parser, listener
+
+    def testFallback(self):
+        for text, stage in ((self.VALID, PredictionMode.SLL), (self.INVALID, PredictionMode.LL)):
+            parser, listener = self.parser(text)
+            expected = parser.prog().toStringTree(recog=parser)
+            errors = listener.errors
+            parser, listener = self.parser(text)
+            tree = parser.parseWithFallback("prog")
+            self.assertEqual(expected, tree.toStringTree(recog=parser))
+            self.assertEqual(stage, parser.parseStage)
+            self.assertEqual(errors, listener.errors)
+            self.assertEqual(len(errors), parser.getNumberOfSyntaxErrors())
+            self.assertEqual(PredictionMode.LL, parser._interp.predictionMode)
+        self.assertRaises(Exception, parser.parseWithFallback, "nosuchrule")
+
+    def testResetWithParseListener(self):
+        parser, listener = self.parser(self.VALID)
+        parser.addParseListener(ParseTreeListener())
+        parser.reset()
+        self.assertEqual(1, len(parser.getParseListeners()))
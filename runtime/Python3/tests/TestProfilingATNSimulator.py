@@ -0,0 +1,45 @@
+import unittest
+from antlr4 import InputStream, CommonTokenStream, PredictionMode
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+from antlr4.atn.ProfilingATNSimulator import ProfilingATNSimulator
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+class TestProfilingATNSimulator(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1); y; ; }\ndef g(x) { return 1+2*x/3; }\n"
+
+    def parser(self, text):
+        parser = ExprParser(CommonTokenStream(ExprLexer(InputStream(text))))
+        parser.removeErrorListeners()
+        return parser
+
+    def testProfile(self):
+        parser = self.parser(self.INPUT)
+        expected = parser.prog().toStringTree(recog=parser)
+        parser = self.parser(self.INPUT)
+        parser._interp.predictionMode = PredictionMode.SLL
+        parser.setProfile(True)
+        self.assertIsInstance(parser._interp, ProfilingATNSimulator)
+        self.assertEqual(PredictionMode.SLL, parser._interp.predictionMode)
+        self.assertEqual(expected, parser.prog().toStringTree(recog=parser))
+        info = parser.getParseInfo()
+        decisions = [ d for d in info.getDecisionInfo() if d.invocations > 0 ]
+        self.assertTrue(len(decisions) > 0)
+        for d in decisions:
+            self.assertTrue(d.SLL_TotalLook >= d.invocations)
+            self.assertTrue(d.SLL_MinLook <= d.SLL_MaxLook)
+            self.assertEqual(d.SLL_MaxLook, d.SLL_MaxLookEvent.stopIndex - d.SLL_MaxLookEvent.startIndex + 1)
+            self.assertTrue(d.timeInPrediction > 0)
+        self.assertEqual(info.getTotalSLLLookaheadOps(), sum(d.SLL_TotalLook for d in decisions))
+        self.assertEqual([], info.getLLDecisions())
+        parser.setProfile(False)
+        self.assertIs(type(parser._interp), ParserATNSimulator)
+        self.assertIsNone(parser.getParseInfo())
+
+    def testErrors(self):
+        parser = self.parser("def f(x) { x = 3 4; }\n")
+        parser.setProfile(True)
+        parser.prog()
+        errors = [ e for d in parser.getParseInfo().getDecisionInfo() for e in d.errors ]
+        self.assertTrue(len(errors) > 0)
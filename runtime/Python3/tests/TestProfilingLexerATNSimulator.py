@@ -0,0 +1,46 @@
+import unittest
+from antlr4 import InputStream
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from antlr4.atn.ProfilingLexerATNSimulator import ProfilingLexerATNSimulator
+from expr.ExprLexer import ExprLexer
+
+
+class TestProfilingLexerATNSimulator(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1); y; ; }\ndef g(x) { return 1+2*x/3; }\n"
+
+    def tokens(self, lexer):
+        return [ (t.type, t.text, t.line, t.column) for t in lexer.getAllTokens() ]
+
+    def testProfile(self):
+        expected = self.tokens(ExprLexer(InputStream(self.INPUT)))
+        lexer = ExprLexer(InputStream(self.INPUT))
+        lexer.setProfile(True)
+        self.assertIsInstance(lexer._interp, ProfilingLexerATNSimulator)
+        self.assertEqual(expected, self.tokens(lexer))
+        info = lexer.getProfileInfo()
+        mode = info.getModeInfo()[0]
+        rules = info.getRuleInfo()
+        self.assertEqual(mode.matches, sum(r.tokens for r in rules))
+        self.assertTrue(mode.matches > len(expected)) # white space is skipped
+        self.assertTrue(mode.DFA_Chars + mode.ATN_Chars >= len(self.INPUT))
+        self.assertEqual(mode.ATN_Transitions, sum(r.ATN_Transitions for r in rules))
+        self.assertEqual(mode.DFA_Transitions, sum(r.DFA_Transitions for r in rules))
+        self.assertEqual(len([ t for t in expected if t[0]==ExprLexer.ID ]), rules[ExprLexer.ruleNames.index("ID")].tokens)
+        self.assertTrue(mode.timeInMatch > 0)
+        report = info.report()
+        self.assertIn("DEFAULT_MODE", report)
+        self.assertIn("ID", report)
+        lexer.setProfile(False)
+        self.assertIs(type(lexer._interp), LexerATNSimulator)
+        self.assertIsNone(lexer.getProfileInfo())
+
+    def testWarmDFA(self):
+        # a second pass over the same input finds every edge in the DFA
+        ExprLexer(InputStream(self.INPUT)).getAllTokens()
+        lexer = ExprLexer(InputStream(self.INPUT))
+        lexer.setProfile(True)
+        lexer.getAllTokens()
+        mode = lexer.getProfileInfo().getModeInfo()[0]
+        self.assertEqual(0, mode.ATN_Chars) # EOF edges are never cached
+        self.assertEqual(0, mode.startStateComputations)
+        self.assertTrue(mode.DFA_Chars >= len(self.INPUT))
@@ -0,0 +1,104 @@
+import random
+import unittest
+from antlr4 import InputStream, CommonTokenStream, Token
+from antlr4.IncrementalInputStream import IncrementalInputStream
+from antlr4.Relexer import Relexer
+from expr.ExprLexer import ExprLexer
+
+
+# Keeps a mode stack as deep as the identifiers since the last ';', and
+# puts each token on the channel of that depth.
+class StackLexer(ExprLexer):
+
+    def nextToken(self):
+        t = super().nextToken()
+        if t.type == self.ID:
+            self.pushMode(self.DEFAULT_MODE)
+        elif t.text == ';':
+            while len(self._modeStack) > 0:
+                self.popMode()
+        t.channel = len(self._modeStack)
+        return t
+
+
+class TestRelexer(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1)-2; y; ; }\ndef g(x) { return 1+2*x/3; }\n"
+
+    def relex(self, text, lexerClass=ExprLexer):
+        lexer = lexerClass(IncrementalInputStream(text))
+        lexer.removeErrorListeners()
+        relexer = Relexer(lexer)
+        tokens = CommonTokenStream(relexer)
+        tokens.fill()
+        return relexer, tokens
+
+    def lex(self, text, lexerClass=ExprLexer):
+        lexer = lexerClass(InputStream(text))
+        lexer.removeErrorListeners()
+        tokens = CommonTokenStream(lexer)
+        tokens.fill()
+        return tokens
+
+    def fields(self, tokens):
+        return [ (t.type, t.channel, t.tokenIndex, t.start, t.stop, t.line, t.column, t.text) for t in tokens.tokens ]
+
+    def testEdit(self):
+        relexer, tokens = self.relex("ab cd\nef")
+        cd = tokens.tokens[1]
+        ef = tokens.tokens[2]
+        # extends the first token
+        self.assertEqual((0, 1, 0), relexer.edit(tokens, 2, 2, "x"))
+        self.assertEqual("abx", tokens.tokens[0].text)
+        self.assertIs(cd, tokens.tokens[1])
+        self.assertEqual((4, 4), (cd.start, cd.column))
+        self.assertEqual((2, 0), (ef.line, ef.column))
+        # joins two lines
+        self.assertEqual((1, 2, -1), relexer.edit(tokens, 4, 8, "z"))
+        self.assertEqual(["abx", "zf", "<EOF>"], [ t.text for t in tokens.tokens ])
+        self.assertEqual(1, tokens.tokens[-1].line)
+        self.assertEqual([0, 1, 2], [ t.tokenIndex for t in tokens.tokens ])
+
+    def testRelexesLittle(self):
+        relexer, tokens = self.relex(self.INPUT * 100)
+        i = relexer.inputStream.strdata.index("4*", 3000)
+        first, stop, added = relexer.edit(tokens, i, i+1, "12")
+        # the token before looked at the edited character too
+        self.assertEqual((2, 0), (stop - first, added))
+        self.assertEqual(["+", "12"], [ t.text for t in tokens.tokens[first:stop] ])
+        self.assertEqual(self.fields(self.lex(relexer.inputStream.strdata)), self.fields(tokens))
+
+    def testSplice(self):
+        tokens = self.lex("a b c d")
+        b, d = tokens.tokens[1], tokens.tokens[3]
+        tokens.consume()
+        tokens.splice(1, 3, [ tokens.tokens[2] ])
+        self.assertEqual(["a", "c", "d", "<EOF>"], [ t.text for t in tokens.tokens ])
+        self.assertEqual([0, 1, 2, 3], [ t.tokenIndex for t in tokens.tokens ])
+        self.assertEqual("a", tokens.LT(1).text)
+        with self.assertRaises(ValueError):
+            tokens.splice(2, 1, [])
+        tokens.splice(4, 4, [])
+        self.assertTrue(tokens.fetchedEOF)
+
+    def testModeStack(self):
+        text = "def f(x) { x = 1 + y; return z; }\n" * 3
+        relexer, tokens = self.relex(text, StackLexer)
+        self.assertEqual(self.fields(self.lex(text, StackLexer)), self.fields(tokens))
+        # the stack of the identifiers before the edit is restored
+        i = text.index("y;")
+        relexer.edit(tokens, i+1, i+2, "")
+        relexer.edit(tokens, i, i, "q ")
+        self.assertEqual(self.fields(self.lex(relexer.inputStream.strdata, StackLexer)), self.fields(tokens))
+
+    def testRandomEdits(self):
+        rand = random.Random(11)
+        pieces = [ "", " ", "x", "1", "+", "ab", "\n", "def h(a) { a; }\n", "return", ";", "9 q", "\n\n" ]
+        for lexerClass in (ExprLexer, StackLexer):
+            relexer, tokens = self.relex(self.INPUT * 4, lexerClass)
+            for i in range(300):
+                text = relexer.inputStream.strdata
+                start = rand.randint(0, len(text))
+                stop = min(len(text), start + rand.choice([0, 0, 1, 2, 5, 30]))
+                relexer.edit(tokens, start, stop, rand.choice(pieces))
+                self.assertEqual(self.fields(self.lex(relexer.inputStream.strdata, lexerClass)), self.fields(tokens))
+                self.assertEqual(Token.EOF, tokens.tokens[-1].type)
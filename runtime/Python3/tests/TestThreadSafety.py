@@ -0,0 +1,120 @@
+import random
+import sys
+import threading
+import unittest
+from antlr4 import InputStream, CommonTokenStream, DFA, PredictionContextCache
+from antlr4.atn.ATNDeserializationOptions import ATNDeserializationOptions
+from antlr4.atn.ATNDeserializer import ATNDeserializer
+from expr import ExprLexer as ExprLexerModule, ExprParser as ExprParserModule
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+def lazyATN(serializedATN):
+    options = ATNDeserializationOptions()
+    options.lazy = True
+    return ATNDeserializer(options).deserialize(serializedATN)
+
+
+# recognizers over ATNs whose transitions are built as the threads need them
+class LazyExprLexer(ExprLexer):
+    atn = lazyATN(ExprLexerModule.serializedATN())
+    decisionsToDFA = [ DFA(ds, i) for i, ds in enumerate(atn.decisionToState) ]
+
+
+class LazyExprParser(ExprParser):
+    atn = lazyATN(ExprParserModule.serializedATN())
+    decisionsToDFA = [ DFA(ds, i) for i, ds in enumerate(atn.decisionToState) ]
+    sharedContextCache = PredictionContextCache()
+
+
+class TestThreadSafety(unittest.TestCase):
+    THREADS = 8
+
+    @classmethod
+    def setUpClass(cls):
+        cls.switchInterval = sys.getswitchinterval()
+
+    def setUp(self):
+        # switch threads as often as possible
+        sys.setswitchinterval(1e-6)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switchInterval)
+
+    def inputs(self, seed):
+        rand = random.Random(seed)
+        def expr(depth):
+            if depth == 0 or rand.random() < 0.3:
+                return rand.choice(["x", "y", "12", "3"])
+            if rand.random() < 0.2:
+                return "(" + expr(depth-1) + ")"
+            return expr(depth-1) + rand.choice("+-*/") + expr(depth-1)
+        def stat():
+            r = rand.random()
+            if r < 0.3:
+                return rand.choice("xy") + " = " + expr(4) + ";"
+            if r < 0.5:
+                return "return " + expr(4) + ";"
+            if r < 0.6:
+                return ";"
+            return expr(4) + ";"
+        return [ "def f(x,y) { " + " ".join(stat() for j in range(0, 5)) + " }\n" for i in range(0, 10) ]
+
+    def parse(self, parserClass, lexerClass, text):
+        lexer = lexerClass(InputStream(text))
+        lexer.removeErrorListeners()
+        parser = parserClass(CommonTokenStream(lexer))
+        parser.removeErrorListeners()
+        tree = parser.prog()
+        return tree.toStringTree(recog=parser), parser.getNumberOfSyntaxErrors()
+
+    def hammer(self, parserClass, lexerClass):
+        inputs = [ self.inputs(i) for i in range(0, self.THREADS) ]
+        # single threaded with the eager ATN first; the caches are cleared
+        # before the threads run
+        expected = [ [ self.parse(ExprParser, ExprLexer, text) for text in texts ] for texts in inputs ]
+        parserClass.clearDFACache()
+        lexerClass.clearDFACache()
+        results = [ None ] * self.THREADS
+        errors = []
+        barrier = threading.Barrier(self.THREADS)
+        def run(i):
+            try:
+                barrier.wait()
+                results[i] = [ self.parse(parserClass, lexerClass, text) for text in inputs[i] ]
+            except BaseException as e:
+                errors.append(e)
+        threads = [ threading.Thread(target=run, args=(i,)) for i in range(0, self.THREADS) ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual([], errors)
+        self.assertEqual(expected, results)
+        for dfa in parserClass.decisionsToDFA + lexerClass.decisionsToDFA:
+            self.assertEqual(list(range(0, len(dfa.states))), sorted(s.stateNumber for s in dfa.states))
+
+    def testSharedDFA(self):
+        self.hammer(ExprParser, ExprLexer)
+
+    def testLazyATN(self):
+        self.assertIsNotNone(LazyExprParser.atn.lazyEdges)
+        self.hammer(LazyExprParser, LazyExprLexer)
+
+    def testPredictionContextCache(self):
+        self.parse(ExprParser, ExprLexer, self.inputs(0)[0])
+        contexts = list(ExprParser.sharedContextCache.cache)
+        cache = PredictionContextCache()
+        results = [ None ] * self.THREADS
+        def run(i):
+            # equal but distinct copies race for the same slot
+            results[i] = [ cache.add(ctx) for ctx in contexts ]
+        threads = [ threading.Thread(target=run, args=(i,)) for i in range(0, self.THREADS) ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for r in results:
+            self.assertTrue(all(a is b for a, b in zip(results[0], r)))
+        self.assertEqual(len(contexts), len(cache))
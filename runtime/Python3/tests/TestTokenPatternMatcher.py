@@ -0,0 +1,46 @@
+import unittest
+from antlr4 import InputStream, CommonTokenStream, Token
+from antlr4.TokenPatternMatcher import TokenPatternMatcher
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+class TestTokenPatternMatcher(unittest.TestCase):
+    INPUT = "def f(x) { x = 1+2+3; ; ; y = 4 }\ndef g() { return 1+2; }"
+
+    def match(self, matcher, tokens=None):
+        if tokens is None:
+            tokens = CommonTokenStream(ExprLexer(InputStream(self.INPUT)))
+        return [ (m.rule, tokens.getText(m.start, m.stop)) for m in matcher.match(tokens) ]
+
+    def testMatch(self):
+        for recognizer in (ExprLexer, ExprParser):
+            matcher = TokenPatternMatcher(recognizer)
+            matcher.addRule("sum", "INT ('+' INT)+")
+            matcher.addRule("blank", "';' ';'")
+            matcher.addRule("assign", "ID/[xy]/ '=' INT")
+            matcher.addRule("last", "~(';'|'}') '}'")
+            matcher.addRule("tail", "'return' .* '}' EOF")
+            self.assertEqual([ ("assign", "x=1"), ("sum", "1+2+3"), ("blank", ";;"), ("assign", "y=4"),
+                               ("last", "4}"), ("tail", "return1+2;}"), ("sum", "1+2") ],
+                             self.match(matcher))
+
+    def testChannels(self):
+        tokens = CommonTokenStream(ExprLexer(InputStream("x = 1 + 2;")))
+        tokens.fill()
+        tokens.get(3).channel = Token.HIDDEN_CHANNEL
+        matcher = TokenPatternMatcher(ExprParser)
+        matcher.addRule("default", "INT INT")
+        matcher.addRule("all", "INT . INT", channels=None)
+        self.assertEqual([ ("default", "1+2"), ("all", "1+2") ], self.match(matcher, tokens))
+
+    def testErrors(self):
+        matcher = TokenPatternMatcher(ExprParser)
+        for pattern in ("INT (", "FOO", "ID /x", ")", "ID/[/"):
+            self.assertRaises(Exception, matcher.addRule, "bad", pattern)
+        # a pattern that matches no tokens is refused, and the matcher stays usable
+        matcher.addRule("sum", "INT '+' INT")
+        for pattern in ("INT?", "INT*", "(ID | INT?) ';'?"):
+            self.assertRaises(Exception, matcher.addRule, "empty", pattern)
+        self.assertEqual([ "sum" ], matcher.ruleNames)
+        self.assertEqual([ ("sum", "1+2"), ("sum", "1+2") ], self.match(matcher))
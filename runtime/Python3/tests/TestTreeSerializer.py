@@ -0,0 +1,110 @@
+import unittest
+from antlr4 import InputStream, CommonTokenStream, ParserRuleContext, ErrorNode, RecognitionException
+from antlr4.error.Errors import IllegalStateException
+from antlr4.tree.TreeSerializer import TreeSerializer
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+class TestTreeSerializer(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1); y; ; }\ndef g(x) { return 1+2*x/3; }\n"
+
+    def parse(self, text):
+        parser = ExprParser(CommonTokenStream(ExprLexer(InputStream(text))))
+        parser.removeErrorListeners()
+        return parser, parser.prog()
+
+    def nodes(self, tree):
+        stack = [ tree ]
+        while len(stack) > 0:
+            node = stack.pop()
+            yield node
+            if isinstance(node, ParserRuleContext) and node.children is not None:
+                stack.extend(reversed(node.children))
+
+    def testRoundTrip(self):
+        parser, tree = self.parse(self.INPUT)
+        data = TreeSerializer().serialize(tree)
+        copy = TreeSerializer().deserialize(data, parser)
+        self.assertEqual(tree.toStringTree(recog=parser), copy.toStringTree(recog=parser))
+        self.assertEqual(tree.getText(), copy.getText())
+        for a, b in zip(self.nodes(tree), self.nodes(copy)):
+            self.assertIs(type(a), type(b))
+            if isinstance(a, ParserRuleContext):
+                self.assertEqual(a.invokingState, b.invokingState)
+                self.assertEqual((a.start.tokenIndex, a.start.line, a.start.column, a.start.text),
+                                 (b.start.tokenIndex, b.start.line, b.start.column, b.start.text))
+                self.assertEqual(a.stop.tokenIndex, b.stop.tokenIndex)
+                self.assertIs(parser, b.parser)
+                for child in b.getChildren():
+                    self.assertIs(b, child.parentCtx)
+        # the typed accessors of the generated classes work on the copy
+        self.assertEqual(["f", "g"], [ func.ID().getText() for func in copy.func() ])
+
+    def testClasses(self):
+        parser, tree = self.parse(self.INPUT)
+        data = TreeSerializer().serialize(tree)
+        # the same length, so the string table stays valid
+        forged = data.replace(b"expr.ExprParser", b"expr.ExprLexer_")
+        self.assertNotEqual(data, forged)
+        with self.assertRaises(ImportError):
+            TreeSerializer().deserialize(forged)
+        serializer = TreeSerializer()
+        self.assertIs(ExprParser.ProgContext, serializer.getClass("expr.ExprParser", "ExprParser.ProgContext"))
+        for moduleName, qualName in (("expr.ExprParser", "ExprParser"), ("os", "system"), ("builtins", "object")):
+            with self.assertRaises(IllegalStateException):
+                serializer.getClass(moduleName, qualName)
+
+    def testSize(self):
+        parser, tree = self.parse(self.INPUT * 20)
+        data = TreeSerializer().serialize(tree)
+        # mostly a byte per number
+        self.assertTrue(len(data) < 10 * len(list(self.nodes(tree))))
+
+    def testErrors(self):
+        parser, tree = self.parse("def f(x) { x = 3 4; }\n")
+        copy = TreeSerializer().deserialize(TreeSerializer().serialize(tree))
+        self.assertEqual(tree.toStringTree(recog=parser), copy.toStringTree(recog=parser))
+        self.assertEqual([ isinstance(n, ErrorNode) for n in self.nodes(tree) ],
+                         [ isinstance(n, ErrorNode) for n in self.nodes(copy) ])
+        failed = [ n for n in self.nodes(tree) if isinstance(n, ParserRuleContext) and n.exception is not None ]
+        copied = [ n for n in self.nodes(copy) if isinstance(n, ParserRuleContext) and n.exception is not None ]
+        self.assertEqual(len(failed), len(copied))
+
+    def testException(self):
+        parser, tree = self.parse("def f(x) { x; }\n")
+        body = tree.func(0).body()
+        body.exception = Exception()
+        tree.exception = RecognitionException(message="no viable alternative")
+        copy = TreeSerializer().deserialize(TreeSerializer().serialize(tree))
+        self.assertIsInstance(copy.exception, RecognitionException)
+        self.assertEqual("no viable alternative", copy.exception.message)
+        self.assertEqual("Exception", copy.func(0).body().exception.message)
+        self.assertIsNone(copy.func(0).exception)
+
+    def testFields(self):
+        parser, tree = self.parse("def f(x) { return 1*2; }\n")
+        muldiv = next(n for n in self.nodes(tree) if isinstance(n, ExprParser.MulDivContext))
+        muldiv.op = muldiv.getChild(1).symbol
+        muldiv.left = muldiv.expr(0)
+        muldiv.values = [ 1, "two", None, True, muldiv.expr(1), ParserRuleContext() ]
+        copy = TreeSerializer().deserialize(TreeSerializer().serialize(tree))
+        copied = next(n for n in self.nodes(copy) if isinstance(n, ExprParser.MulDivContext))
+        self.assertEqual("*", copied.op.text)
+        self.assertIs(copied.getChild(1).symbol, copied.op)
+        self.assertIs(copied.expr(0), copied.left)
+        self.assertEqual([ 1, "two", None, True, copied.expr(1), None ], copied.values)
+
+    def testDeepTree(self):
+        root = ParserRuleContext()
+        ctx = root
+        for i in range(0, 10000):
+            child = ParserRuleContext(ctx)
+            ctx.addChild(child)
+            ctx = child
+        copy = TreeSerializer().deserialize(TreeSerializer().serialize(root))
+        depth = 0
+        while copy.children is not None:
+            copy = copy.children[0]
+            depth += 1
+        self.assertEqual(10000, depth)
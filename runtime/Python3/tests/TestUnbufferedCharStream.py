@@ -0,0 +1,52 @@
+import io
+import unittest
+from antlr4 import InputStream, Token
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.UnbufferedCharStream import UnbufferedCharStream
+from antlr4.error.Errors import IllegalStateException, UnsupportedOperationException
+from expr.ExprLexer import ExprLexer
+
+
+class TestUnbufferedCharStream(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1); y; ; }\ndef g(x) { return 1+2*x/3; }\n"
+
+    def lex(self, stream):
+        lexer = ExprLexer(stream)
+        lexer._factory = CommonTokenFactory(copyText=True)
+        return [ str(t) for t in lexer.getAllTokens() ]
+
+    def testStream(self):
+        stream = UnbufferedCharStream(io.StringIO("abcdef"), 2)
+        self.assertEqual(ord("a"), stream.LA(1))
+        self.assertEqual(ord("c"), stream.LA(3))
+        m = stream.mark()
+        stream.consume()
+        stream.consume()
+        self.assertEqual(2, stream.index)
+        self.assertEqual(ord("b"), stream.LA(-1))
+        self.assertEqual("abc", stream.getText(0, 2))
+        stream.seek(0)
+        self.assertEqual(ord("a"), stream.LA(1))
+        stream.seek(4)
+        stream.release(m)
+        self.assertRaises(UnsupportedOperationException, stream.seek, 0)
+        self.assertEqual("ef", stream.getText(4, 10))
+        stream.consume()
+        stream.consume()
+        self.assertEqual(Token.EOF, stream.LA(1))
+        self.assertRaises(IllegalStateException, stream.consume)
+
+    def testLex(self):
+        expected = self.lex(InputStream(self.INPUT))
+        for bufferSize in (1, 256):
+            self.assertEqual(expected, self.lex(UnbufferedCharStream(io.StringIO(self.INPUT), bufferSize)))
+            self.assertEqual(expected, self.lex(UnbufferedCharStream(io.BytesIO(self.INPUT.encode()), bufferSize)))
+
+    def testBoundedBuffer(self):
+        stream = UnbufferedCharStream(io.StringIO(self.INPUT * 100), 64)
+        lexer = ExprLexer(stream)
+        lexer._factory = CommonTokenFactory(copyText=True)
+        longest = 0
+        while lexer.nextToken().type != Token.EOF:
+            longest = max(longest, len(stream.data))
+        self.assertLess(longest, 200)
@@ -0,0 +1,54 @@
+import io
+import unittest
+from antlr4 import InputStream, CommonTokenStream, Token
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.UnbufferedCharStream import UnbufferedCharStream
+from antlr4.UnbufferedTokenStream import UnbufferedTokenStream
+from antlr4.error.Errors import IllegalStateException, UnsupportedOperationException
+from expr.ExprLexer import ExprLexer
+from expr.ExprParser import ExprParser
+
+
+class TestUnbufferedTokenStream(unittest.TestCase):
+    INPUT = "def f(x,y) { x = 3+4*(y-1); y; ; }\ndef g(x) { return 1+2*x/3; }\n"
+
+    def testStream(self):
+        stream = UnbufferedTokenStream(ExprLexer(InputStream("x = 1;")))
+        self.assertEqual(ExprLexer.ID, stream.LA(1))
+        self.assertEqual(ExprLexer.INT, stream.LA(3))
+        m = stream.mark()
+        stream.consume()
+        stream.consume()
+        self.assertEqual(2, stream.index)
+        self.assertEqual("x=1", stream.getText(0, 2))
+        stream.seek(0)
+        self.assertEqual("x", stream.LT(1).text)
+        stream.seek(3)
+        stream.release(m)
+        self.assertEqual(ExprLexer.INT, stream.LA(-1))
+        self.assertRaises(UnsupportedOperationException, stream.seek, 0)
+        stream.consume()
+        self.assertEqual(Token.EOF, stream.LA(1))
+        self.assertRaises(IllegalStateException, stream.consume)
+
+    def testParse(self):
+        parser = ExprParser(CommonTokenStream(ExprLexer(InputStream(self.INPUT))))
+        expected = parser.prog().toStringTree(recog=parser)
+        lexer = ExprLexer(UnbufferedCharStream(io.StringIO(self.INPUT)))
+        lexer._factory = CommonTokenFactory(copyText=True)
+        parser = ExprParser(UnbufferedTokenStream(lexer))
+        self.assertEqual(expected, parser.prog().toStringTree(recog=parser))
+
+    def testBoundedBuffer(self):
+        stream = UnbufferedTokenStream(ExprLexer(InputStream(self.INPUT * 100)))
+        parser = ExprParser(stream)
+        parser.buildParseTrees = False
+        longest = [0]
+        fill = stream.fill
+        def trackingFill(n):
+            longest[0] = max(longest[0], len(stream.tokens) + n)
+            return fill(n)
+        stream.fill = trackingFill
+        parser.prog()
+        self.assertEqual(Token.EOF, stream.LA(1))
+        self.assertLess(longest[0], 50)
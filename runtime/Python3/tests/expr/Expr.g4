@@ -1,5 +1,6 @@
 // Taken from "tool-testsuite/test/org/antlr/v4/test/tool/TestXPath.java"
 // Builds ExprLexer.py and ExprParser.py
+// With -visitor, builds ../exprvisitor/ExprParser.py and ExprVisitor.py
 
 grammar Expr;
 prog:   func+ ;
@@ -0,0 +1,83 @@
+# Generated from Expr.g4 by ANTLR 4.11.2-SNAPSHOT
+from antlr4 import *
+if "." in __name__:
+    from .ExprParser import ExprParser
+else:
+    from ExprParser import ExprParser
+
+# This class defines a complete generic visitor for a parse tree produced by ExprParser.
+
+class ExprVisitor(ParseTreeVisitor):
+
+    # Visit a parse tree produced by ExprParser#prog.
+    def visitProg(self, ctx:ExprParser.ProgContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by ExprParser#func.
+    def visitFunc(self, ctx:ExprParser.FuncContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by ExprParser#body.
+    def visitBody(self, ctx:ExprParser.BodyContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by ExprParser#arg.
+    def visitArg(self, ctx:ExprParser.ArgContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by ExprParser#ret.
+    def visitRet(self, ctx:ExprParser.RetContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by ExprParser#blank.
+    def visitBlank(self, ctx:ExprParser.BlankContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by ExprParser#printExpr.
+    def visitPrintExpr(self, ctx:ExprParser.PrintExprContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by ExprParser#assign.
+    def visitAssign(self, ctx:ExprParser.AssignContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by ExprParser#prim.
+    def visitPrim(self, ctx:ExprParser.PrimContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by ExprParser#MulDiv.
+    def visitMulDiv(self, ctx:ExprParser.MulDivContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by ExprParser#AddSub.
+    def visitAddSub(self, ctx:ExprParser.AddSubContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by ExprParser#parens.
+    def visitParens(self, ctx:ExprParser.ParensContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by ExprParser#id.
+    def visitId(self, ctx:ExprParser.IdContext):
+        return self.visitChildren(ctx)
+
+
+    # Visit a parse tree produced by ExprParser#int.
+    def visitInt(self, ctx:ExprParser.IntContext):
+        return self.visitChildren(ctx)
+
+
+
+del ExprParser
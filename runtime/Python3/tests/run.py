@@ -8,5 +8,29 @@ from TestFileStream import TestFileStream
 from TestInputStream import TestInputStream
 from TestIntervalSet import TestIntervalSet
 from TestRecognizer import TestRecognizer
+from TestDFASnapshot import TestDFASnapshot
+from TestATNSnapshot import TestATNSnapshot
+from TestATNDeserializer import TestATNDeserializer
+from TestLexerATNSimulator import TestLexerATNSimulator
+from TestTokenPatternMatcher import TestTokenPatternMatcher
+from TestCompactTokenStream import TestCompactTokenStream
+from TestMappedFileStream import TestMappedFileStream
+from TestUnbufferedCharStream import TestUnbufferedCharStream
+from TestUnbufferedTokenStream import TestUnbufferedTokenStream
+from TestParser import TestParser
+from TestProfilingATNSimulator import TestProfilingATNSimulator
+from TestProfilingLexerATNSimulator import TestProfilingLexerATNSimulator
+from TestDFABudget import TestDFABudget
+from TestDFACache import TestDFACache
+from TestThreadSafety import TestThreadSafety
+from TestBatchParser import TestBatchParser
+from TestTreeSerializer import TestTreeSerializer
+from TestFlatTree import TestFlatTree
+from TestParseTreeWalker import TestParseTreeWalker
+from TestRelexer import TestRelexer
+from TestIncrementalParser import TestIncrementalParser
+from TestLexerState import TestLexerState
+from TestParseBudget import TestParseBudget
+from TestAsyncParser import TestAsyncParser
 import unittest
 unittest.main()